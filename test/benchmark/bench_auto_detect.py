@@ -0,0 +1,40 @@
+"""
+Track the wall time of statistics._auto_detect as the number of numeric and categorical
+columns grows, for the comparison of means alone and with the chi-squared tests of all the
+pairs of categorical columns. Each categorical column is grouped once for all the numeric
+columns, and encoded once for all the pairs.
+
+Run from the repository root with `python -m test.benchmark.bench_auto_detect`.
+"""
+import contextlib
+import io
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+from tickcounter import statistics
+
+def make_data(n_rows, n_num, n_cat, n_groups=5, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {f"num {i}": rng.normal(size=n_rows) for i in range(n_num)}
+    data.update({f"cat {i}": rng.integers(0, n_groups, size=n_rows).astype(str) for i in range(n_cat)})
+    return pd.DataFrame(data)
+
+def measure(n_rows, n_num, n_cat, pairs=True):
+    data = make_data(n_rows, n_num, n_cat)
+    num_col = [f"num {i}" for i in range(n_num)]
+    cat_col = [f"cat {i}" for i in range(n_cat)]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ignore_list = None if pairs else set(itertools.combinations(cat_col, 2))
+        statistics._auto_detect(data, num_col, cat_col, ignore_list=ignore_list)
+    return time.perf_counter() - start
+
+def main(n_rows=200000, sizes=((5, 5), (10, 10), (20, 10), (10, 40))):
+    print(f"{'num':>4} {'cat':>4} {'means (s)':>10} {'all (s)':>8}")
+    for n_num, n_cat in sizes:
+        print(f"{n_num:>4} {n_cat:>4} {measure(n_rows, n_num, n_cat, pairs=False):>10.3f} {measure(n_rows, n_num, n_cat):>8.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Benchmark Encoder.transform against the column by column replace it replaced.
+
+Run from the repository root with `python -m test.benchmark.bench_encoder`.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from tickcounter.questionnaire import Encoder
+
+def make_likert(n_rows, n_cols, seed=0):
+    rng = np.random.default_rng(seed)
+    choices = np.array(["Strong Agree", "Agree", "Neither", "Disagree", "Strong Disagree", np.nan], dtype=object)
+    return pd.DataFrame(rng.choice(choices, size=(n_rows, n_cols)), columns=[f"Q{i}" for i in range(n_cols)])
+
+def replace_transform(encoder, data):
+    result = data.copy()
+    for i in result.columns:
+        result[i] = result[i].replace(encoder.encoding)
+        if encoder.default is not None:
+            result[i] = result[i].fillna(encoder.default)
+    return result
+
+def timeit(f, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(shapes=((10000, 50), (100000, 100), (200000, 300))):
+    encoder = Encoder({"Strong Agree": 5, "Agree": 4, "Neither": 3, "Disagree": 2, "Strong Disagree": 1}, default=3)
+    print(f"{'rows':>8} {'cols':>5} {'replace (s)':>12} {'lookup (s)':>11} {'speedup':>8}")
+    for n_rows, n_cols in shapes:
+        data = make_likert(n_rows, n_cols)
+        columns = list(data.columns)
+        pd.testing.assert_frame_equal(encoder.transform(data, columns=columns), replace_transform(encoder, data))
+        old = timeit(replace_transform, encoder, data)
+        new = timeit(lambda d: encoder.transform(d, columns=columns), data)
+        print(f"{n_rows:>8} {n_cols:>5} {old:>12.3f} {new:>11.3f} {old / new:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
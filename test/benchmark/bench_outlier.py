@@ -0,0 +1,31 @@
+"""
+Track the wall time of statistics._locate_outlier for each method as the number of rows and
+columns grows. The outlier mask is computed once, and the Outlier_field labels are only
+built for the returned rows.
+
+Run from the repository root with `python -m test.benchmark.bench_outlier`.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from tickcounter import statistics
+
+def make_data(n_rows, n_col, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({f"col {i}": rng.standard_t(3, size=n_rows) for i in range(n_col)})
+
+def measure(data, method):
+    start = time.perf_counter()
+    statistics._locate_outlier(data, list(data.columns), method)
+    return time.perf_counter() - start
+
+def main(sizes=((100000, 10), (1000000, 10), (1000000, 50))):
+    methods = ['iqr', 'zscore', 'mad']
+    print(f"{'rows':>8} {'cols':>5} " + " ".join(f"{i + ' (s)':>10}" for i in methods))
+    for n_rows, n_col in sizes:
+        data = make_data(n_rows, n_col)
+        print(f"{n_rows:>8} {n_col:>5} " + " ".join(f"{measure(data, i):>10.3f}" for i in methods))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""
+Compare the wall time of Questionnaire scoring run serially and on thread and process pools.
+
+Run from the repository root with `python -m test.benchmark.bench_parallel`.
+"""
+import os
+import time
+
+from test.benchmark.bench_questionnaire import make_questionnaire
+
+def measure(n_rows, n_scorings, **kwargs):
+    questionnaire = make_questionnaire(n_rows, n_scorings, **kwargs)
+    start = time.perf_counter()
+    questionnaire.score()
+    return time.perf_counter() - start
+
+def main(n_rows=100000, n_scorings=32):
+    n_jobs = min(os.cpu_count(), n_scorings)
+    serial = measure(n_rows, n_scorings)
+    print(f"{'backend':>8} {'n_jobs':>6} {'time (s)':>9} {'speedup':>8}")
+    print(f"{'serial':>8} {1:>6} {serial:>9.3f} {1:>8.2f}")
+    for backend in ['thread', 'process']:
+        elapsed = measure(n_rows, n_scorings, n_jobs=n_jobs, backend=backend)
+        print(f"{backend:>8} {n_jobs:>6} {elapsed:>9.3f} {serial / elapsed:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Track wall time and peak memory of Questionnaire scoring and labeling as the number of
+scorings grows. Both should grow roughly linearly with the number of scorings.
+
+Run from the repository root with `python -m test.benchmark.bench_questionnaire`.
+"""
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from tickcounter.questionnaire import Encoder, Scoring, IntervalLabel, Questionnaire
+
+def make_questionnaire(n_rows, n_scorings, n_items=10, n_labels=12, seed=0, **kwargs):
+    rng = np.random.default_rng(seed)
+    choices = np.array(["Strong Agree", "Agree", "Neither", "Disagree", "Strong Disagree"], dtype=object)
+    columns = [f"Q{i}" for i in range(n_scorings * n_items)]
+    data = pd.DataFrame(rng.choice(choices, size=(n_rows, len(columns))), columns=columns)
+    encoder = Encoder({"Strong Agree": 5, "Agree": 4, "Neither": 3, "Disagree": 2, "Strong Disagree": 1}, default=3)
+    width = 4 * n_items // n_labels + 1
+    labels = [IntervalLabel({f"Band {j}": [n_items + j * width, n_items + (j + 1) * width - 1]}, name=f"{j}") for j in range(n_labels)]
+    scoring = [Scoring(encoding={encoder: columns[i * n_items:(i + 1) * n_items]}, labeling=labels, name=f"Scale {i}")
+               for i in range(n_scorings)]
+    return Questionnaire(data, scoring, **kwargs)
+
+def measure(n_rows, n_scorings):
+    questionnaire = make_questionnaire(n_rows, n_scorings)
+    tracemalloc.start()
+    start = time.perf_counter()
+    questionnaire.label()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+def main(n_rows=20000, scorings=(5, 10, 20, 40)):
+    print(f"{'scorings':>8} {'time (s)':>9} {'peak (MB)':>10} {'s/scoring':>10} {'MB/scoring':>11}")
+    for n_scorings in scorings:
+        elapsed, peak = measure(n_rows, n_scorings)
+        print(f"{n_scorings:>8} {elapsed:>9.3f} {peak / 2 ** 20:>10.1f} {elapsed / n_scorings:>10.4f} {peak / 2 ** 20 / n_scorings:>11.2f}")
+
+if __name__ == "__main__":
+    main()
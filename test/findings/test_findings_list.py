@@ -0,0 +1,118 @@
+import unittest
+import contextlib
+import gc
+import io
+import os
+import pickle
+import tempfile
+import weakref
+
+import pandas as pd
+import numpy as np
+from tickcounter.findings import FindingsList, TTestFindings, AnovaFindings, DependenceFindings
+from tickcounter.statistics import _auto_detect
+from tickcounter.survey import Survey
+from tickcounter.questionnaire import Description
+from matplotlib import pyplot as plt
+
+class TestFindingsList(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestFindingsList, cls).setUpClass()
+        rng = np.random.default_rng(0)
+        n = 2000
+        cls.df = pd.DataFrame({f"num {i}": rng.normal(size=n) for i in range(3)})
+        cls.df['cat 0'] = rng.choice(['a', 'b'], size=n, p=[0.7, 0.3])
+        cls.df['cat 1'] = np.where(cls.df['num 1'] > 1, 'high', rng.choice(['low', 'mid'], size=n))
+        cls.df['cat 2'] = np.where(cls.df['cat 1'] == 'high', 1, rng.choice([1, 2], size=n))
+        cls.df['num 0'] += (cls.df['cat 0'] == 'a') * 0.5
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.findings = _auto_detect(cls.df, ['num 0', 'num 1', 'num 2'], ['cat 0', 'cat 1', 'cat 2'], correction='holm')
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def assert_same(self, result, expected):
+        self.assertEqual([type(i) for i in result.findings_list], [type(i) for i in expected.findings_list])
+        self.assertEqual(list(result.describe()), list(expected.describe()))
+        pd.testing.assert_frame_equal(result.to_frame(), expected.to_frame())
+
+    def test_no_data(self):
+        kinds = {type(i) for i in self.findings.findings_list}
+        self.assertEqual(kinds, {TTestFindings, AnovaFindings, DependenceFindings})
+        for i in self.findings.findings_list:
+            self.assertIsNone(i.data)
+
+        # The means are the same as computed from the data.
+        expected = self.findings.to_frame()
+        attached = FindingsList.from_frame(expected).attach(self.df)
+        for i in attached.findings_list:
+            i.summary = None
+        self.assertEqual(list(attached.describe()), list(self.findings.describe()))
+
+    def test_to_frame(self):
+        frame = self.findings.to_frame()
+        self.assertEqual(len(frame), len(self.findings))
+        row = frame[(frame['findings'] == 'TTestFindings') & (frame['col_1'] == 'cat 0')].iloc[0]
+        self.assertEqual((row['col_1'], row['col_2']), ('cat 0', 'num 0'))
+        summary = self.df.groupby('cat 0')['num 0'].agg(['count', 'mean'])
+        self.assertEqual([i[0] for i in row['summary']], list(summary.index))
+        np.testing.assert_allclose([i[2] for i in row['summary']], summary['mean'])
+        self.assertTrue((frame['adjusted_pvalue'] >= frame['pvalue']).all())
+        self.assert_same(FindingsList.from_frame(frame), self.findings)
+
+    def test_filter_sort(self):
+        frame = self.findings.to_frame()
+        result = self.findings.filter(lambda x: x['findings'] == 'DependenceFindings')
+        self.assertEqual(len(result), (frame['findings'] == 'DependenceFindings').sum())
+        result = self.findings.filter(frame['col_1'] == 'cat 1')
+        self.assertTrue(all(i == 'cat 1' for i in result.to_frame()['col_1']))
+
+        result = self.findings.sort('statistic', ascending=False).to_frame()
+        self.assertEqual(list(result['statistic']), sorted(frame['statistic'], reverse=True))
+
+    def test_csv(self):
+        path = os.path.join(self.dir.name, "findings.csv")
+        self.findings.to_csv(path)
+        result = FindingsList.read_csv(path)
+        self.assert_same(result, self.findings)
+        self.assertEqual(list(result.findings_list[-1].groups_2), list(self.findings.findings_list[-1].groups_2))
+
+    def test_pickle(self):
+        attached = FindingsList(list(self.findings.findings_list)).attach(self.df)
+        result = pickle.loads(pickle.dumps(attached))
+        self.assertLess(len(pickle.dumps(attached)), self.df.memory_usage().sum() / 10)
+        self.assertIsNone(result.findings_list[0].data)
+        self.assertEqual(list(result.describe()), list(self.findings.describe()))
+        with self.assertRaises(ValueError):
+            result.findings_list[0].illustrate()
+
+    def test_survey_data(self):
+        # The findings of Survey.auto_detect can be illustrated without passing the data.
+        survey = Survey(self.df, num_col=['num 0', 'num 1', 'num 2'], cat_col=['cat 0', 'cat 1', 'cat 2'],
+                        description=Description({}))
+        with contextlib.redirect_stdout(io.StringIO()):
+            findings = survey.auto_detect()
+        self.assertTrue(all(i.data is self.df for i in findings.findings_list))
+        findings.findings_list[0].illustrate()
+        plt.close('all')
+        self.assertIsNone(pickle.loads(pickle.dumps(findings)).findings_list[0].data)
+        self.assertIs(survey.compare_mean('num 0', 'cat 0').data, self.df)
+
+        # The findings do not keep the data alive.
+        data = self.df.copy()
+        survey = Survey(data, num_col=['num 0'], cat_col=['cat 0'])
+        findings = survey.compare_mean('num 0', 'cat 0')
+        ref = weakref.ref(data)
+        del survey, data
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertIsNone(findings.data)
+        with self.assertRaises(ValueError):
+            findings.illustrate()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -99,6 +99,24 @@ class TestEncoder(unittest.TestCase):
         # Test when mode and return_rule are used together.
         pass
     
+    def test_transform_matches_replace(self):
+        # The lookup table should give the same values and dtypes as replace followed by fillna.
+        df_new = pd.DataFrame({
+            'full': ["Agree", "Neither", "Agree", "Disagree"],
+            'missing': ["Agree", np.nan, "Strong Agree", np.nan],
+            'unknown': ["Agree", "Maybe", np.nan, "Disagree"],
+            'empty': pd.Series([np.nan] * 4, dtype=object),
+            'number': [1.0, 2.0, np.nan, 4.0],
+        })
+        for encoder in [TestEncoder.encoder_1, TestEncoder.encoder_2, TestEncoder.encoder_3]:
+            result = encoder.transform(df_new, columns=list(df_new.columns))
+            for col in df_new.columns:
+                expected = df_new[col].replace(encoder.encoding)
+                if encoder.default is not None:
+                    expected = expected.fillna(encoder.default)
+                assert_series_equal(result[col], expected)
+                assert_series_equal(encoder.transform(df_new[col]), expected)
+
     def test_invert(self):
         # TODO: Might need to rewrite this test
         TestEncoder.encoder_1.invert()
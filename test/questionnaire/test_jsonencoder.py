@@ -0,0 +1,84 @@
+import os
+import json
+import yaml
+import unittest
+import tempfile
+
+import pandas as pd
+import numpy as np
+from tickcounter.questionnaire import Encoder, MultiEncoder, JSONEncoder, EncodingPlan
+from pandas.testing import assert_frame_equal
+
+class TestJSONEncoder(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestJSONEncoder, cls).setUpClass()
+        cls.original = pd.read_csv("test/test_data/mental_health/data.csv")
+        cls.scale_1 = {"No": -1, "Yes": 1, "Don't know": 0, "Some of them": 0, "Not sure": 0, "Maybe": 0}
+        cls.scale_4 = {"Never": 1, "Rarely": 2, "Sometimes": 3, "Often": 4}
+        cls.col_1 = ['self_employed', 'family_history', 'treatment', 'remote_work', 'tech_company', 'benefits']
+
+    def setUp(self):
+        self.df = TestJSONEncoder.original.copy()
+        self.spec = {col: {'encoding': TestJSONEncoder.scale_1, 'neutral': 0, 'default': 0} for col in TestJSONEncoder.col_1}
+        self.spec['work_interfere'] = {'encoding': TestJSONEncoder.scale_4, 'neutral': 3}
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def expected(self, data):
+        e1 = Encoder(TestJSONEncoder.scale_1, neutral=0, default=0)
+        e4 = Encoder(TestJSONEncoder.scale_4, neutral=3)
+        rule_map = {**{col: e1 for col in TestJSONEncoder.col_1}, 'work_interfere': e4}
+        return MultiEncoder([e1, e4]).transform(data, rule_map=rule_map)
+
+    def test_transform(self):
+        encoder = JSONEncoder(self.spec)
+        # Identical encodings share one Encoder.
+        self.assertEqual(len(encoder.rules), 2)
+        self.assertIsInstance(encoder.plan, EncodingPlan)
+        self.assertEqual(encoder.plan.columns, [*TestJSONEncoder.col_1, 'work_interfere'])
+        assert_frame_equal(encoder.transform(self.df), self.expected(self.df))
+
+        # Columns of the spec missing from data, or ignored, are left out of the plan.
+        data = self.df[['Age', 'treatment', 'work_interfere']]
+        result, rule = encoder.transform(data, ignore_list=['work_interfere'], return_rule=True)
+        assert_frame_equal(result['treatment'].to_frame(), self.expected(self.df)[['treatment']])
+        self.assertEqual(list(rule.dropna().index), ['treatment'])
+        self.assertEqual(encoder.count_neutral(self.df).sum(), MultiEncoder(list(encoder.rules.values())).count_neutral(self.df, rule_map=encoder.plan).sum())
+
+    def test_file(self):
+        json_path = os.path.join(self.dir.name, 'encoding.json')
+        yaml_path = os.path.join(self.dir.name, 'encoding.yaml')
+        with open(json_path, 'w') as f:
+            json.dump(self.spec, f)
+        with open(yaml_path, 'w') as f:
+            yaml.safe_dump(self.spec, f)
+        for path in [json_path, yaml_path]:
+            assert_frame_equal(JSONEncoder(path).transform(self.df), self.expected(self.df))
+
+        # Codes written as strings by generate_json_encoding.
+        spec = {col: {'encoding': {k: str(v) for k, v in entry['encoding'].items()},
+                      **{k: str(v) for k, v in entry.items() if k != 'encoding'}} for col, entry in self.spec.items()}
+        assert_frame_equal(JSONEncoder(spec, dtype=int).transform(self.df), self.expected(self.df))
+
+    def test_many_columns(self):
+        spec = {f"q{i}": {'encoding': TestJSONEncoder.scale_4, 'neutral': 3} for i in range(5000)}
+        encoder = JSONEncoder(spec)
+        self.assertEqual(len(encoder.rules), 1)
+        data = pd.DataFrame({f"q{i}": ['Never', 'Often', np.nan] for i in range(5000)})
+        result = encoder.transform(data)
+        self.assertEqual(result.shape, (3, 5000))
+        self.assertEqual(result['q4999'].iloc[:2].tolist(), [1, 4])
+        self.assertTrue(np.isnan(result['q4999'].iloc[2]))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            JSONEncoder({'a': {'values': {'x': 1}}})
+        with self.assertRaises(ValueError):
+            JSONEncoder({'a': {'encoding': {'x': 1}, 'neutrall': 1}})
+        with self.assertRaises(ValueError):
+            JSONEncoder({})
+        with self.assertRaises(ValueError):
+            JSONEncoder(os.path.join(self.dir.name, 'encoding.txt'))
@@ -0,0 +1,38 @@
+import unittest
+
+import pandas as pd
+import numpy as np
+from tickcounter.questionnaire import IntervalLabel
+from pandas.testing import assert_series_equal
+
+class TestIntervalLabel(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({'score': [0, 5, 17, 17.5, 18, 30, 31, np.nan, -1]}, index=list('abcdefghi'))
+
+    def test_label(self):
+        # Same labels as a loop of between over the intervals, in any order of the rule.
+        rule = {'High': [18, 30], 'Low': [0, 17]}
+        result = IntervalLabel(rule).label(self.df, 'score')
+        expected = pd.Series(index=self.df.index, dtype=object)
+        for label, interval in rule.items():
+            expected[self.df['score'].between(*interval)] = label
+        assert_series_equal(result.astype(object), expected)
+        self.assertEqual(list(result.cat.categories), ['Low', 'High'])
+        self.assertTrue(result.cat.ordered)
+
+    def test_reuse(self):
+        # The compiled intervals give the same labels chunk by chunk.
+        label = IntervalLabel({'Low': [0, 17], 'Mid': [17.5, 17.5], 'High': [18, 30]})
+        expected = label.label(self.df, 'score')
+        result = pd.concat([label.label(self.df.iloc[:4], 'score'), label.label(self.df.iloc[4:], 'score')])
+        assert_series_equal(result, expected)
+        self.assertEqual(expected['d'], 'Mid')
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            IntervalLabel({'Low': [0, 18], 'High': [18, 30]})
+        with self.assertRaises(ValueError):
+            IntervalLabel({'Low': [10, 0]})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -63,7 +63,34 @@ class TestMultiEncoder(unittest.TestCase):
         assert_frame_equal(result, expected, check_dtype=False)
     
     def test_transform_rule_map(self):
-        pass
+        rule_map = {col: TestMultiEncoder.e1.name for col in TestMultiEncoder.col_1}
+        rule_map['leave'] = TestMultiEncoder.e3.name
+        rule_map['work_interfere'] = TestMultiEncoder.e4
+        result, rule = TestMultiEncoder.me1.transform(self.df, rule_map=rule_map, return_rule=True)
+        assert_frame_equal(self.df, TestMultiEncoder.original)
+
+        expected = self.df.copy()
+        expected[TestMultiEncoder.col_1] = expected[TestMultiEncoder.col_1].replace(TestMultiEncoder.scale_1)
+        expected[TestMultiEncoder.col_1] = expected[TestMultiEncoder.col_1].fillna(0)
+        expected[TestMultiEncoder.col_3] = expected[TestMultiEncoder.col_3].replace(TestMultiEncoder.scale_3)
+        expected[TestMultiEncoder.col_3] = expected[TestMultiEncoder.col_3].fillna(0)
+        expected[TestMultiEncoder.col_4] = expected[TestMultiEncoder.col_4].replace(TestMultiEncoder.scale_4)
+        expected_rule = pd.Series(index=self.df.columns, dtype=str)
+        expected_rule[TestMultiEncoder.col_1] = TestMultiEncoder.e1.name
+        expected_rule[TestMultiEncoder.col_3] = TestMultiEncoder.e3.name
+        expected_rule[TestMultiEncoder.col_4] = TestMultiEncoder.e4.name
+        assert_frame_equal(result, expected, check_dtype=False)
+        assert_series_equal(rule, expected_rule)
+
+        # A compiled plan gives the same result, and the returned rule can be compiled again.
+        plan = TestMultiEncoder.me1.compile(rule)
+        assert_frame_equal(plan.transform(self.df), result)
+        assert_frame_equal(TestMultiEncoder.me1.transform(self.df, rule_map=plan), result)
+
+        with self.assertRaises(ValueError):
+            TestMultiEncoder.me1.transform(self.df, rule_map={'self_employed': 'unknown encoder'})
+        with self.assertRaises(ValueError):
+            TestMultiEncoder.me1.transform(self.df, rule_map={'unknown column': TestMultiEncoder.e1.name})
     
     def test_transform_ignore_list(self):
         ignore_list = ['self_employed', 'family_history', 'benefits', 'work_interfere']
@@ -114,6 +141,24 @@ class TestMultiEncoder(unittest.TestCase):
         assert_frame_equal(result_2, expected_2, check_dtype=False)
         assert_series_equal(rule, expected_rule)
 
+    def test_transform_cache(self):
+        me = MultiEncoder([TestMultiEncoder.e1, TestMultiEncoder.e2, TestMultiEncoder.e3, TestMultiEncoder.e4], cache=True)
+        result_1, rule_1 = me.transform(self.df, return_rule=True)
+        expected, expected_rule = TestMultiEncoder.me1.transform(self.df, return_rule=True)
+        assert_frame_equal(result_1, expected)
+        assert_series_equal(rule_1, expected_rule, check_names=False)
+
+        # A frame with the same columns reuses the detected rules without checking the values again.
+        df_new = self.df.copy()
+        df_new.loc[0, 'leave'] = 'Unknown'
+        result_2, rule_2 = me.transform(df_new, return_rule=True)
+        assert_series_equal(rule_2, expected_rule, check_names=False)
+        self.assertEqual(result_2.loc[0, 'leave'], 'Unknown')
+
+        me.clear_cache()
+        result_3, rule_3 = me.transform(df_new, return_rule=True)
+        self.assertTrue(pd.isna(rule_3['leave']))
+
     def test_transform_mix(self):
         # Test when column and ignore list are used together.
         # Test when column, ignore list and return rules are used together
@@ -160,6 +205,19 @@ class TestMultiEncoder(unittest.TestCase):
         assert_series_equal(result_2, expected_2, check_dtype=False)
         self.assertIsNone(result_3, None)
 
+    def test_tally(self):
+        columns = ["self_employed", "leave", "work_interfere"]
+        result = TestMultiEncoder.me1.tally(self.df[columns])
+        assert_frame_equal(self.df, TestMultiEncoder.original)
+
+        encoded = TestMultiEncoder.me1.transform(self.df[columns])
+        expected = pd.DataFrame({
+            'Neutral count': (encoded['self_employed'] == 0).astype(int) + (encoded['work_interfere'] == 3).astype(int),
+            'Default count': self.df['self_employed'].isna().astype(int) + self.df['leave'].isna().astype(int),
+            'Missing count': encoded.isna().sum(axis=1),
+        })
+        assert_frame_equal(result, expected, check_dtype=False)
+
     def test_count_neutral_param(self):
         pass
 
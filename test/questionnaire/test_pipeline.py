@@ -0,0 +1,77 @@
+import os
+import pickle
+import unittest
+import tempfile
+
+import pandas as pd
+import numpy as np
+from tickcounter.questionnaire import Encoder, Scoring, Label, IntervalLabel, QuartileLabel, Questionnaire, CompiledPipeline
+from pandas.testing import assert_frame_equal
+
+class TestCompiledPipeline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestCompiledPipeline, cls).setUpClass()
+        cls.original = pd.read_csv("test/test_data/time_management/data.csv")
+        cls.question_col = [str(i) for i in range(6, 18)]
+        cls.e1 = Encoder({
+            "Strong Agree": 5,
+            "Agree": 4,
+            "Neither": 3,
+            "Disagree": 2,
+            "Strong Disagree": 1
+        }, neutral=3, default=3, name="Agreeness")
+        cls.e2 = Encoder(template=TestCompiledPipeline.e1, invert=True, name="Disagreeness")
+        cls.l1 = IntervalLabel({'Low': [0, 17], 'High': [18, 30]}, name="Interval")
+        cls.l2 = QuartileLabel(4, ['Q1', 'Q2', 'Q3', 'Q4'], name="Quartile")
+        cls.l3 = QuartileLabel(2, ['Low', 'High'], name="Frozen", bins=np.array([0, 20, 60]))
+
+    def setUp(self):
+        self.df = TestCompiledPipeline.original.copy()
+        self.s1 = Scoring(encoding={TestCompiledPipeline.e1: TestCompiledPipeline.question_col[0:6]},
+                          labeling=[TestCompiledPipeline.l1, TestCompiledPipeline.l3], name='First')
+        self.s2 = Scoring(encoding={TestCompiledPipeline.e1: TestCompiledPipeline.question_col[6:9],
+                                    TestCompiledPipeline.e2: TestCompiledPipeline.question_col[9:12]},
+                          labeling=[TestCompiledPipeline.l1, TestCompiledPipeline.l2], name='Second',
+                          weights={'15': 2}, method='mean')
+        self.descrip = {'Age': {'description': 'Age group', 'values': {1: '18-20', 2: '21-25'}}}
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'pipeline.tcp')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_save_load(self):
+        expected = Questionnaire(self.df, [self.s1, self.s2]).processed
+        pipeline = CompiledPipeline([self.s1, self.s2], description=self.descrip)
+        assert_frame_equal(pipeline.process(self.df), expected)
+
+        pipeline.save(self.path)
+        for mmap in [True, False]:
+            loaded = CompiledPipeline.load(self.path, mmap=mmap)
+            assert_frame_equal(loaded.process(self.df), expected)
+            self.assertEqual(loaded.description.descrip, self.descrip)
+            self.assertEqual([i.name for i in loaded.scoring], ['First', 'Second'])
+            # Encoders shared by the scorings are loaded once.
+            self.assertIs(list(loaded.scoring[0].encoding)[0], list(loaded.scoring[1].encoding)[0])
+
+        loaded = CompiledPipeline.load(self.path)
+        self.assertIsInstance(loaded.arrays['matrix data'].base, np.memmap)
+        assert_frame_equal(pickle.loads(pickle.dumps(loaded)).process(self.df), expected)
+
+    def test_no_encoding(self):
+        encoded = TestCompiledPipeline.e1.transform(self.df[TestCompiledPipeline.question_col])
+        scoring = Scoring([], columns=TestCompiledPipeline.question_col[0:4], name='Items', reverse=['6'], scale=(1, 5),
+                          min_answered=0.5)
+        CompiledPipeline(scoring).save(self.path)
+        assert_frame_equal(CompiledPipeline.load(self.path).score(encoded), scoring.score(encoded).to_frame())
+
+    def test_invalid(self):
+        scoring = Scoring([Label(lambda data, score_col: data[score_col] > 10)], columns=['6'])
+        with self.assertRaises(ValueError):
+            CompiledPipeline(scoring)
+
+        with open(self.path, 'wb') as f:
+            f.write(b'not a pipeline')
+        with self.assertRaises(ValueError):
+            CompiledPipeline.load(self.path)
@@ -0,0 +1,213 @@
+import gc
+import unittest
+import tracemalloc
+import weakref
+from unittest import mock
+
+import pandas as pd
+import numpy as np
+from scipy import stats
+from tickcounter.questionnaire import Encoder, Scoring, Label, IntervalLabel, QuartileLabel, Questionnaire
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+class TestQuestionnaire(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestQuestionnaire, cls).setUpClass()
+        cls.original = pd.read_csv("test/test_data/time_management/data.csv")
+        cls.question_col = [str(i) for i in range(6, 18)]
+        cls.e1 = Encoder({
+            "Strong Agree": 5,
+            "Agree": 4,
+            "Neither": 3,
+            "Disagree": 2,
+            "Strong Disagree": 1
+        }, neutral=3, default=3, name="Agreeness")
+        cls.e2 = Encoder(template=TestQuestionnaire.e1, invert=True, name="Disagreeness")
+        cls.l1 = IntervalLabel({'Low': [0, 17], 'High': [18, 30]}, name="Interval")
+        cls.l2 = QuartileLabel(4, ['Q1', 'Q2', 'Q3', 'Q4'], name="Quartile")
+
+    def setUp(self):
+        self.df = TestQuestionnaire.original.copy()
+        self.s1 = Scoring(encoding={TestQuestionnaire.e1: TestQuestionnaire.question_col[0:6]},
+                          labeling=[TestQuestionnaire.l1], name='First')
+        self.s2 = Scoring(encoding={TestQuestionnaire.e1: TestQuestionnaire.question_col[6:9],
+                                    TestQuestionnaire.e2: TestQuestionnaire.question_col[9:12]},
+                          labeling=[TestQuestionnaire.l1, TestQuestionnaire.l2], name='Second')
+
+    def assert_same_result(self, result, expected):
+        for i in ['transformed', 'scored', 'labeled', 'processed', 'processed_transformed']:
+            assert_frame_equal(getattr(result, i), getattr(expected, i))
+
+    def test_processed(self):
+        q = Questionnaire(self.df, [self.s1, self.s2])
+        expected = pd.concat([self.df, self.s1.score(self.df), self.s2.score(self.df)], axis=1)
+        expected = pd.concat([expected, self.s1.label(expected, self.s1.score_col), self.s2.label(expected, self.s2.score_col)], axis=1)
+        assert_frame_equal(q.processed, expected)
+        self.assertEqual(list(q.score_col), [self.s1.score_col, self.s2.score_col])
+        self.assertEqual(list(q.label_col), self.s1.label_col + self.s2.label_col)
+
+    def test_no_label(self):
+        s3 = Scoring(encoding={TestQuestionnaire.e1: TestQuestionnaire.question_col[0:6]}, labeling=[], name='Third')
+        q = Questionnaire(self.df, [s3])
+        assert_frame_equal(q.processed, pd.concat([self.df, s3.score(self.df)], axis=1))
+        self.assertEqual(q.labeled.shape, (len(self.df), 0))
+
+        q = Questionnaire(self.df, [])
+        assert_frame_equal(q.processed, self.df)
+        self.assertEqual(q.scored.shape, (len(self.df), 0))
+
+    def test_auto_detect_data(self):
+        # The findings illustrate the processed data of the questionnaire, without keeping it alive.
+        q = Questionnaire(self.df, [self.s1, self.s2])
+        findings = q.auto_detect('Age', min_sample=5, p_value=1, eta=0, cohen_es=0, phi_es=0)
+        self.assertGreater(len(findings), 0)
+        self.assertTrue(all(i.data is q.processed for i in findings.findings_list))
+        ref = weakref.ref(q.processed)
+        del q
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertTrue(all(i.data is None for i in findings.findings_list))
+
+    def test_t_test_group(self):
+        q = Questionnaire(self.df, [self.s1, self.s2])
+        data = pd.concat([self.df[['Age']], q.transform()], axis=1)
+        result = q.t_test_group('6', 'Age')
+        key = [i for i in result if set(i.split(' vs ')) == {'18-20', '21-25'}][0]
+        group_1, group_2 = key.split(' vs ')
+        expected = stats.ttest_ind(data.loc[data['Age'] == group_1, '6'], data.loc[data['Age'] == group_2, '6'])
+        self.assertAlmostEqual(result[key].statistic, expected.statistic)
+        self.assertAlmostEqual(result[key].pvalue, expected.pvalue)
+
+    def test_add_remove_scoring(self):
+        q = Questionnaire(self.df, [self.s1])
+        q.processed
+        cached = q._cache[('score', 'First')]
+        q.add_scoring(self.s2)
+        self.assert_same_result(q, Questionnaire(self.df, [self.s1, self.s2]))
+        # The score of the first scoring is not computed again.
+        self.assertIs(q._cache[('score', 'First')], cached)
+
+        q.remove_scoring('First')
+        self.assert_same_result(q, Questionnaire(self.df, [self.s2]))
+        self.assertNotIn(('score', 'First'), q._cache)
+        with self.assertRaises(ValueError):
+            q.add_scoring(self.s2)
+
+    def test_set_label(self):
+        q = Questionnaire(self.df, [self.s1, self.s2])
+        q.processed
+        cached = q._cache[('label', 'Second', 'Quartile')]
+        l3 = IntervalLabel({'Low': [0, 15], 'High': [16, 30]}, name="Interval")
+        q.set_label('Second', l3)
+        self.assertIs(q._cache[('label', 'Second', 'Quartile')], cached)
+
+        s2 = Scoring(encoding=self.s2.encoding, labeling=[l3, TestQuestionnaire.l2], name='Second')
+        self.assert_same_result(q, Questionnaire(self.df, [self.s1, s2]))
+
+    def test_drop(self):
+        q = Questionnaire(self.df, [self.s1, self.s2])
+        q.processed
+        cached = q._cache[('label', 'First', 'Interval')]
+        q.drop([0, 5, 10])
+        self.assertIsNot(q._cache[('label', 'First', 'Interval')], cached)
+        self.assertNotIn(('label', 'Second', 'Quartile'), q._cache)
+        self.assert_same_result(q, Questionnaire(self.df.drop([0, 5, 10]), [self.s1, self.s2]))
+        assert_frame_equal(self.df, TestQuestionnaire.original)
+
+    def test_append(self):
+        q = Questionnaire(self.df.iloc[:100], [self.s1, self.s2])
+        q.processed
+        cached = q._cache[('label', 'First', 'Interval')]
+        q.append(self.df.iloc[100:])
+        self.assertNotIn(('label', 'Second', 'Quartile'), q._cache)
+        self.assertIn(('label', 'First', 'Interval'), q._cache)
+        self.assertIsNot(q._cache[('label', 'First', 'Interval')], cached)
+        self.assert_same_result(q, Questionnaire(self.df, [self.s1, self.s2]))
+
+        with self.assertRaises(ValueError):
+            q.append(self.df.iloc[:10])
+
+    def test_no_copy(self):
+        q = Questionnaire(self.df, [self.s1, self.s2], copy=False)
+        self.assertIs(q.data, self.df)
+        self.assert_same_result(q, Questionnaire(self.df, [self.s1, self.s2]))
+        # Dropping rows does not modify the borrowed DataFrame.
+        q.drop([0, 5, 10])
+        assert_frame_equal(self.df, TestQuestionnaire.original)
+
+    def test_no_copy_memory(self):
+        df = pd.concat([self.df] * 200, ignore_index=True)
+        q = Questionnaire(df, [self.s1, self.s2], copy=False)
+        tracemalloc.start()
+        q.processed_transformed
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        size = lambda x: x.memory_usage(index=False).sum()
+        derived = size(q.transformed) + size(q.scored) + size(q.labeled)
+        self.assertLess(peak, size(df) + derived)
+
+    def test_many_scorings(self):
+        # The results of the scorings are concatenated once, whatever their number, and the peak
+        # memory grows linearly with it (see test/benchmark/bench_questionnaire.py for the time).
+        def measure(n_scorings):
+            columns = [f"{i} {col}" for i in range(n_scorings) for col in TestQuestionnaire.question_col]
+            df = pd.DataFrame(np.tile(self.df[TestQuestionnaire.question_col].to_numpy(), (5, n_scorings)), columns=columns)
+            scoring = [Scoring(encoding={TestQuestionnaire.e1: columns[i * 12:(i + 1) * 12]}, name=f"Scale {i}",
+                               labeling=[IntervalLabel({'Low': [0, 35], 'High': [36, 60]}, name=f"{j}") for j in range(4)])
+                       for i in range(n_scorings)]
+            q = Questionnaire(df, scoring, copy=False)
+            with mock.patch('pandas.concat', wraps=pd.concat) as concat:
+                tracemalloc.start()
+                q.label()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            return concat.call_count, peak
+
+        (concat_8, peak_8), (concat_32, peak_32) = measure(8), measure(32)
+        self.assertEqual(concat_32, concat_8)
+        self.assertLess(peak_32, 4 * peak_8)
+
+    def test_parallel(self):
+        expected = Questionnaire(self.df, [self.s1, self.s2])
+        for backend in ['thread', 'process']:
+            q = Questionnaire(self.df, [self.s1, self.s2], n_jobs=2, backend=backend)
+            self.assert_same_result(q, expected)
+            self.assertIn(('score', 'Second'), q._cache)
+
+        with self.assertRaises(ValueError):
+            Questionnaire(self.df, [self.s1, self.s2], n_jobs=2, backend='gpu').processed
+
+    def test_diff_item(self):
+        q = Questionnaire(self.df, [self.s1, self.s2])
+        data = pd.concat([self.df[['Age']], q.transform()], axis=1)
+        group_mean = data.groupby('Age')[q.item_col].mean().T
+        result = q.diff_item('Age')
+        assert_series_equal(result['18-20 - 21-25'], group_mean['18-20'] - group_mean['21-25'], check_names=False)
+
+        result = q.pairwise_item('Age', method='t-test', groups=['18-20', '21-25'])
+        self.assertEqual(list(result.index.get_level_values('num_col').unique()), list(q.item_col))
+        self.assertAlmostEqual(result.loc[(q.item_col[0], '18-20', '21-25'), 'diff'], group_mean.loc[q.item_col[0], '18-20'] - group_mean.loc[q.item_col[0], '21-25'])
+
+    def test_weight(self):
+        # Weighted labels are those of the data with each row repeated as many times as its weight.
+        self.df['weight'] = np.arange(len(self.df)) % 3
+        expanded = self.df.loc[self.df.index.repeat(self.df['weight'])]
+        result = Questionnaire(self.df, [self.s1, self.s2], weight_col='weight').label()
+        expected = Questionnaire(expanded, [self.s1, self.s2]).label()
+        expected = expected[~expected.index.duplicated()]
+        assert_frame_equal(result.loc[expected.index], expected)
+
+        # Label functions cannot use the weights, the rows are labeled without them.
+        s3 = Scoring(encoding={TestQuestionnaire.e1: TestQuestionnaire.question_col[0:6]},
+                     labeling=[Label(lambda data, score_col: data[score_col] > 20, name='Custom')], name='Third')
+        with self.assertWarns(UserWarning):
+            result = Questionnaire(self.df, [s3], weight_col='weight').labeled
+        assert_series_equal(result['Third - Label Custom'], Questionnaire(self.df, [s3]).labeled['Third - Label Custom'])
+
+    def tearDown(self):
+        pass
+
+if __name__ == "__main__":
+    unittest.main()
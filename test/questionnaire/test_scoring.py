@@ -136,8 +136,9 @@ class TestScoring(unittest.TestCase):
         expected_1 = pd.DataFrame([expected_1]).T
         expected_2 = pd.DataFrame([expected_2]).T
 
-        assert_frame_equal(result_1, expected_1, check_dtype=False)
-        assert_frame_equal(result_2, expected_2, check_dtype=False)
+        # IntervalLabel returns categoricals, compared here by their values.
+        assert_frame_equal(result_1.astype(object), expected_1, check_dtype=False)
+        assert_frame_equal(result_2.astype(object), expected_2, check_dtype=False)
     
     def test_label_no_rule(self):
         result = TestScoring.s6.label(self.df)
@@ -149,7 +150,7 @@ class TestScoring(unittest.TestCase):
         label_ss[score.between(*TestScoring.high)] = "High"
         label_ss.rename(TestScoring.s6.label_col[0], inplace=True)
         expected = pd.DataFrame([label_ss]).T
-        assert_frame_equal(result, expected, check_dtype=False)
+        assert_frame_equal(result.astype(object), expected, check_dtype=False)
     
     def test_label_multiple_label(self):
         # Test Scoring object with multiple label
@@ -0,0 +1,100 @@
+import unittest
+
+import pandas as pd
+import numpy as np
+from tickcounter.questionnaire import Encoder, Scoring, ScoringMatrix
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+class TestScoringMatrix(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestScoringMatrix, cls).setUpClass()
+        cls.original = pd.read_csv("test/test_data/time_management/data.csv")
+        cls.question_col = [str(i) for i in range(6, 18)]
+        cls.e1 = Encoder({
+            "Strong Agree": 5,
+            "Agree": 4,
+            "Neither": 3,
+            "Disagree": 2,
+            "Strong Disagree": 1
+        }, neutral=3, default=3, name="Agreeness")
+        cls.e2 = Encoder(template=TestScoringMatrix.e1, invert=True, name="Disagreeness")
+
+    def setUp(self):
+        self.df = TestScoringMatrix.original.copy()
+        self.encoded = TestScoringMatrix.e1.transform(self.df[TestScoringMatrix.question_col])
+        # Some missing answers, so that the missing item handling applies.
+        self.encoded.iloc[::7, 0] = np.nan
+        self.encoded.iloc[::5, 1:3] = np.nan
+
+    def test_same_as_sum(self):
+        # Overlapping scorings share their items, and give the same scores as the sum of the encoded items.
+        s1 = Scoring([], encoding={TestScoringMatrix.e1: TestScoringMatrix.question_col[0:6]}, name='First')
+        s2 = Scoring([], encoding={TestScoringMatrix.e1: TestScoringMatrix.question_col[3:9],
+                                   TestScoringMatrix.e2: TestScoringMatrix.question_col[9:12]}, name='Second')
+        matrix = ScoringMatrix([s1, s2])
+        self.assertEqual(len(matrix.keys), 12)
+        result = matrix.score(self.df)
+        expected = pd.concat([s.encode(self.df).sum(axis=1).rename(s.score_col) for s in [s1, s2]], axis=1)
+        assert_frame_equal(result, expected)
+        assert_series_equal(s2.score(self.df), expected['Second score'])
+
+    def test_weights_reverse(self):
+        columns = TestScoringMatrix.question_col[0:4]
+        scoring = Scoring([], columns=columns, name='Weighted', weights={'6': 2, '7': 0.5}, reverse=['8'], scale=(1, 5))
+        result = scoring.score(self.encoded)
+        data = self.encoded[columns].copy()
+        data['8'] = 6 - data['8']
+        expected = (data * pd.Series({'6': 2, '7': 0.5, '8': 1, '9': 1})).sum(axis=1)
+        assert_series_equal(result, expected.rename('Weighted score'))
+
+        with self.assertRaises(ValueError):
+            Scoring([], columns=columns, reverse=['8'])
+
+    def test_missing(self):
+        columns = TestScoringMatrix.question_col[0:4]
+        data = self.encoded[columns]
+        answered = data.notna().sum(axis=1)
+
+        result = Scoring([], columns=columns, name='Mean', method='mean').score(self.encoded)
+        assert_series_equal(result, data.mean(axis=1).rename('Mean score'))
+
+        result = Scoring([], columns=columns, name='Prorated', prorate=True).score(self.encoded)
+        assert_series_equal(result, (data.sum(axis=1) * 4 / answered).rename('Prorated score'))
+
+        result = Scoring([], columns=columns, name='Min', min_answered=3).score(self.encoded)
+        expected = data.sum(axis=1).where(answered >= 3)
+        assert_series_equal(result, expected.rename('Min score'))
+        # A fraction of the items, rounded up.
+        result = Scoring([], columns=columns, name='Min', min_answered=0.6).score(self.encoded)
+        assert_series_equal(result, expected.rename('Min score'))
+
+        with self.assertRaises(ValueError):
+            Scoring([], columns=columns, method='median')
+
+    def test_chunks(self):
+        # Scored a chunk of rows at a time, with the same result.
+        scoring = Scoring([], encoding={TestScoringMatrix.e1: TestScoringMatrix.question_col}, name='All')
+        df = pd.concat([self.df] * 100, ignore_index=True)
+        matrix = ScoringMatrix(scoring)
+        result = matrix.score(df)
+        assert_frame_equal(result, matrix.score_block(matrix.encode(df), df.index))
+        # Integer scores when every item is encoded as integers.
+        result = matrix.score(df.fillna('Neither'))
+        self.assertEqual(result['All score'].dtype, np.int64)
+        assert_series_equal(result['All score'], scoring.encode(df.fillna('Neither')).sum(axis=1).rename('All score'))
+
+    def test_unencoded(self):
+        # An item with a value outside its encoding is left unencoded, and scored as missing.
+        encoder = Encoder({"Agree": 2, "Disagree": 1})
+        df = pd.DataFrame({'a': ['Agree', 'Disagree', 'Agree'], 'b': ['Agree', 'Maybe', 'Disagree'],
+                           'c': ['Disagree', 'Disagree', 'Agree']})
+        scoring = Scoring([], encoding={encoder: ['a', 'b', 'c']}, name='Stray')
+        with self.assertWarnsRegex(UserWarning, r"b \(\['Maybe'\]\)"):
+            result = scoring.score(df)
+        assert_series_equal(result, pd.Series([3, 2, 4], name='Stray score'))
+
+        encoded = df.assign(a=[2, 1, 2], c=[1, 1, 2])
+        with self.assertWarns(UserWarning):
+            result = Scoring([], columns=['a', 'b', 'c'], name='Stray').score(encoded)
+        assert_series_equal(result, pd.Series([3, 2, 4], name='Stray score'))
@@ -0,0 +1,119 @@
+import unittest
+
+import pandas as pd
+import numpy as np
+from tickcounter.questionnaire import Encoder, Scoring, Label, IntervalLabel, QuartileLabel, Questionnaire, ScoreStream, ValueCountSketch, KLLSketch
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+class TestScoreStream(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestScoreStream, cls).setUpClass()
+        cls.original = pd.read_csv("test/test_data/time_management/data.csv")
+        cls.question_col = [str(i) for i in range(6, 18)]
+        cls.e1 = Encoder({
+            "Strong Agree": 5,
+            "Agree": 4,
+            "Neither": 3,
+            "Disagree": 2,
+            "Strong Disagree": 1
+        }, neutral=3, default=3, name="Agreeness")
+        cls.e2 = Encoder(template=TestScoreStream.e1, invert=True, name="Disagreeness")
+        cls.l1 = IntervalLabel({'Low': [0, 17], 'High': [18, 30]}, name="Interval")
+        cls.l2 = QuartileLabel(4, ['Q1', 'Q2', 'Q3', 'Q4'], name="Quartile")
+
+    def setUp(self):
+        self.df = TestScoreStream.original.copy()
+        self.s1 = Scoring(encoding={TestScoreStream.e1: TestScoreStream.question_col[0:6]},
+                          labeling=[TestScoreStream.l1], name='First')
+        self.s2 = Scoring(encoding={TestScoreStream.e1: TestScoreStream.question_col[6:9],
+                                    TestScoreStream.e2: TestScoreStream.question_col[9:12]},
+                          labeling=[TestScoreStream.l1, TestScoreStream.l2], name='Second')
+
+    def chunks(self, size=7):
+        return (self.df.iloc[i:i + size] for i in range(0, len(self.df), size))
+
+    def test_transform(self):
+        stream = ScoreStream([self.s1, self.s2])
+        result = pd.concat(stream.transform(self.chunks()))
+        expected = Questionnaire(self.df, [self.s1, self.s2]).processed
+        expected = expected.drop(columns=["Second - Label Quartile"])
+        assert_frame_equal(result, expected)
+
+    def test_label(self):
+        stream = ScoreStream([self.s1, self.s2])
+        for _ in stream.transform(self.chunks()):
+            pass
+        result = pd.concat(stream.label(self.chunks(5)))
+        expected = Questionnaire(self.df, [self.s1, self.s2]).processed
+        assert_frame_equal(result, expected)
+
+    def test_population_label(self):
+        # Label functions of the whole population cannot be frozen from the sketches.
+        label = Label(lambda data, score_col: data[score_col] > data[score_col].median(), name='Median')
+        scoring = Scoring(encoding={TestScoreStream.e1: TestScoreStream.question_col[0:6]}, labeling=[label], name='Third')
+        with self.assertRaises(ValueError):
+            ScoreStream([self.s1, scoring])
+
+    def test_merge(self):
+        stream_1 = ScoreStream([self.s1, self.s2], keep_data=False)
+        stream_2 = ScoreStream([self.s1, self.s2], keep_data=False)
+        half = len(self.df) // 2
+        result = pd.concat([*stream_1.transform([self.df.iloc[:half]]), *stream_2.transform([self.df.iloc[half:]])])
+        stream_1.merge(stream_2)
+
+        expected = result[["First score", "Second score"]].describe().T
+        assert_frame_equal(stream_1.describe(), expected)
+
+    def test_sketch_quantile(self):
+        rng = np.random.default_rng(0)
+        values = rng.integers(0, 20, size=101).astype(float)
+        q = np.linspace(0, 1, 7)
+        sketch = ValueCountSketch().update(values[:50]).merge(ValueCountSketch().update(values[50:]))
+        self.assertTrue(np.array_equal(sketch.quantile(q), np.quantile(values, q)))
+
+        # A warning when the exact sketch grows past its bound.
+        stream = ScoreStream([self.s2], max_values=5)
+        with self.assertWarns(UserWarning):
+            for _ in stream.transform(self.chunks()):
+                pass
+
+    def test_kll_sketch(self):
+        # The ranks of the quantiles are within epsilon, for a sketch much smaller than the data.
+        rng = np.random.default_rng(0)
+        values = rng.lognormal(size=200000)
+        q = np.linspace(0, 1, 11)
+        parts = [KLLSketch(0.01, seed=i).update(j) for i, j in enumerate(np.array_split(values, 4))]
+        sketch = parts[0].merge(parts[1]).merge(parts[2].merge(parts[3]))
+        self.assertEqual(sketch.count, len(values))
+        self.assertLess(sum(len(i) for i in sketch.levels), 1000)
+        ranks = np.searchsorted(np.sort(values), sketch.quantile(q)) / len(values)
+        self.assertLess(np.abs(ranks - q).max(), sketch.epsilon)
+        self.assertEqual(sketch.quantile(0), values.min())
+        self.assertEqual(sketch.quantile(1), values.max())
+
+        weights = rng.integers(0, 4, size=1000)
+        sketch = KLLSketch(k=10000).update(values[:1000], weights)
+        self.assertTrue(np.allclose(sketch.quantile(q), np.quantile(np.repeat(values[:1000], weights), q)))
+        with self.assertRaises(ValueError):
+            KLLSketch().update(values[:3], [0.5, 1, 1])
+
+    def test_label_error(self):
+        # Approximate cut points give the same labels as exact ones, up to the rows near a cut point.
+        df = pd.DataFrame({'score': np.random.default_rng(1).normal(size=50000)})
+        label = QuartileLabel(4, ['Q1', 'Q2', 'Q3', 'Q4'], name="Quartile", error=0.005)
+        result = label.label(df, 'score')
+        expected = pd.qcut(df['score'], 4, labels=['Q1', 'Q2', 'Q3', 'Q4'])
+        self.assertEqual(result.isna().sum(), 0)
+        self.assertGreater((result == expected).mean(), 0.98)
+
+        stream = ScoreStream([self.s2], error=0.01)
+        for _ in stream.transform(self.chunks()):
+            pass
+        self.assertIsInstance(stream.sketches['Second'], KLLSketch)
+        result = pd.concat(stream.label(self.chunks(5)))
+        expected = Questionnaire(self.df, [self.s2]).processed
+        assert_frame_equal(result, expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import contextlib
+import io
+
+import pandas as pd
+import numpy as np
+from tickcounter.statistics import _adjust_pvalues, _auto_detect
+
+class TestAdjustPvalues(unittest.TestCase):
+    def test_methods(self):
+        pvalues = [0.01, 0.04, 0.03, 0.005]
+        np.testing.assert_allclose(_adjust_pvalues(pvalues), pvalues)
+        np.testing.assert_allclose(_adjust_pvalues(pvalues, 'bonferroni'), [0.04, 0.16, 0.12, 0.02])
+        np.testing.assert_allclose(_adjust_pvalues(pvalues, 'holm'), [0.03, 0.06, 0.06, 0.02])
+        np.testing.assert_allclose(_adjust_pvalues(pvalues, 'fdr_bh'), [0.02, 0.04, 0.04, 0.02])
+
+    def test_missing(self):
+        np.testing.assert_allclose(_adjust_pvalues([0.2, np.nan], 'bonferroni'), [0.4, 1])
+        np.testing.assert_allclose(_adjust_pvalues([0.2, np.nan], 'fdr_bh'), [0.4, 1])
+        self.assertEqual(len(_adjust_pvalues([], 'holm')), 0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            _adjust_pvalues([0.1, 0.2], 'sidak')
+
+class TestAutoDetectCorrection(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestAutoDetectCorrection, cls).setUpClass()
+        rng = np.random.default_rng(1)
+        n = 1000
+        cls.df = pd.DataFrame({f"num {i}": rng.normal(size=n) for i in range(5)})
+        for i in range(4):
+            cls.df[f"cat {i}"] = rng.choice(['a', 'b', 'c'], size=n)
+        cls.df['num 0'] += (cls.df['cat 0'] == 'a') * 0.4
+        cls.df['num 1'] += (cls.df['cat 1'] == 'a') * 0.25
+        cls.num_col = [f"num {i}" for i in range(5)]
+        cls.cat_col = [f"cat {i}" for i in range(4)]
+        # Every pair is tested: 5 * 4 comparisons of means and 6 pairs of cat_col.
+        cls.n_tests = 26
+
+    def auto_detect(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            findings = _auto_detect(self.df, self.num_col, self.cat_col, **kwargs)
+        return findings.findings_list
+
+    def test_bonferroni(self):
+        kwargs = dict(cohen_es=0, eta=0, phi_es=0)
+        result = self.auto_detect(correction='bonferroni', **kwargs)
+        expected = self.auto_detect(p_value=0.05 / self.n_tests, **kwargs)
+        self.assertEqual([i.describe_short() for i in result], [i.describe_short() for i in expected])
+        self.assertGreater(len(result), 0)
+        for i in result:
+            self.assertAlmostEqual(i.test_result.adjusted_pvalue, min(i.test_result.pvalue * self.n_tests, 1))
+        self.assertLess(len(result), len(self.auto_detect(**kwargs)))
+
+    def test_fdr(self):
+        kwargs = dict(cohen_es=0, eta=0, phi_es=0)
+        uncorrected = self.auto_detect(**kwargs)
+        result = self.auto_detect(correction='fdr_bh', **kwargs)
+        self.assertLessEqual(len(result), len(uncorrected))
+        for i in result:
+            self.assertGreaterEqual(i.test_result.adjusted_pvalue, i.test_result.pvalue)
+            self.assertLessEqual(i.test_result.adjusted_pvalue, 0.05)
+
+    def test_prescreen(self):
+        # Comparisons below the effect size are not tested, which can only make the correction stricter.
+        result = self.auto_detect(eta=0.02, correction='holm')
+        self.assertEqual([(i.num_col, i.group_col) for i in result], [('num 0', 'cat 0')])
+        self.assertIsNone(self.auto_detect(eta=0.02)[0].test_result.adjusted_pvalue)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+import pandas as pd
+import numpy as np
+from scipy.stats import chi2_contingency
+from tickcounter.statistics import ContingencyTables, _compare_group, _chi_squared_dependence
+
+class TestContingencyTables(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestContingencyTables, cls).setUpClass()
+        rng = np.random.default_rng(0)
+        n = 1000
+        cls.df = pd.DataFrame({
+            'a': rng.choice(['x', 'y', 'z', 'rare'], size=n, p=[0.5, 0.3, 0.19, 0.01]),
+            'b': rng.choice(['p', 'q'], size=n, p=[0.6, 0.4]),
+            'c': rng.choice([1, 2, 3, 4], size=n),
+        })
+        cls.df.loc[rng.random(n) < 0.05, 'c'] = np.nan
+        # Make b depend on a.
+        cls.df.loc[(cls.df['a'] == 'x') & (rng.random(n) < 0.3), 'b'] = 'q'
+
+    def expected(self, col_1, col_2, min_sample):
+        groups_1 = self.df[col_1].value_counts()
+        groups_2 = self.df[col_2].value_counts()
+        df = self.df[self.df[col_1].isin(groups_1[groups_1 >= min_sample].index) & 
+                     self.df[col_2].isin(groups_2[groups_2 >= min_sample].index)]
+        return chi2_contingency(pd.crosstab(df[col_1], df[col_2])), len(df)
+
+    def test_table(self):
+        tables = ContingencyTables(self.df, ['a', 'c'])
+        expected = pd.crosstab(self.df['a'], self.df['c'])
+        result = tables.table('a', 'c')
+        self.assertEqual(list(result.index), list(self.df['a'].value_counts().index))
+        np.testing.assert_array_equal(result.loc[expected.index, expected.columns], expected)
+
+    def test_chi_squared(self):
+        tables = ContingencyTables(self.df, ['a', 'b', 'c'])
+        pairs = [('a', 'b'), ('a', 'c'), ('b', 'c')]
+        result = tables.chi_squared(pairs, min_sample=20)
+        for pair in pairs:
+            (statistic, pvalue, dof, _), n = self.expected(*pair, min_sample=20)
+            self.assertAlmostEqual(result.loc[pair, 'statistic'], statistic)
+            self.assertAlmostEqual(result.loc[pair, 'pvalue'], pvalue)
+            self.assertEqual(result.loc[pair, 'dof'], dof)
+            self.assertEqual(result.loc[pair, 'n'], n)
+            self.assertAlmostEqual(result.loc[pair, 'phi'], np.sqrt(statistic / n))
+
+    def test_compare_group(self):
+        findings = _compare_group(self.df, 'a', 'b', min_sample=20, phi_es=0.1)
+        self.assertEqual(list(findings.groups_1), ['x', 'y', 'z'])
+        (statistic, pvalue, dof, expected), n = self.expected('a', 'b', min_sample=20)
+        self.assertAlmostEqual(findings.test_result.pvalue, pvalue)
+        np.testing.assert_allclose(findings.test_result.expected, expected)
+        self.assertIsNone(_compare_group(self.df, 'a', 'c', min_sample=20))
+
+        with self.assertRaises(ValueError):
+            _chi_squared_dependence(self.df, 'a', 'b', None, None, min_sample=450)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import contextlib
+import io
+import pickle
+
+import pandas as pd
+import numpy as np
+from scipy.stats import ttest_ind, f_oneway
+from tickcounter.statistics import StatsCube, GroupStats, ContingencyTables, _auto_detect, _chi_squared_dependence
+
+class TestStatsCube(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestStatsCube, cls).setUpClass()
+        rng = np.random.default_rng(0)
+        n = 3000
+        cls.df = pd.DataFrame({f"num {i}": rng.normal(size=n) for i in range(3)})
+        cls.df['cat 0'] = rng.choice(['a', 'b'], size=n, p=[0.7, 0.3])
+        cls.df['cat 1'] = np.where(cls.df['num 1'] > 1, 'high', rng.choice(['low', 'mid'], size=n))
+        cls.df['cat 2'] = np.where(cls.df['cat 1'] == 'high', 'u', rng.choice(['u', 'v', 'w'], size=n))
+        cls.df['num 0'] += (cls.df['cat 0'] == 'a') * 0.5
+        cls.df.loc[rng.random(n) < 0.02, 'cat 2'] = np.nan
+        # A group only seen in the second partition.
+        cls.df.loc[2500:2520, 'cat 1'] = 'late'
+        cls.num_col = ['num 0', 'num 1', 'num 2']
+        cls.cat_col = ['cat 0', 'cat 1', 'cat 2']
+        cls.parts = [cls.df.iloc[:1000], cls.df.iloc[1000:2000], cls.df.iloc[2000:]]
+
+    def merged(self):
+        cubes = [StatsCube(i, self.num_col, self.cat_col) for i in self.parts]
+        return cubes[0].merge(cubes[1]).merge(cubes[2])
+
+    def test_merge_group_stats(self):
+        expected = GroupStats(self.df, 'cat 1', self.num_col)
+        result = self.merged().group_stats['cat 1']
+        self.assertEqual(sorted(result.size.index), sorted(expected.size.index))
+        self.assertEqual(list(result.size), list(expected.size))
+        for i in ['count', 'sum', 'nansum', 'ss']:
+            pd.testing.assert_frame_equal(getattr(result, i).sort_index(), getattr(expected, i).sort_index(), check_dtype=False)
+
+    def test_merge_tables(self):
+        cube = self.merged()
+        expected = ContingencyTables(self.df, self.cat_col)
+        pd.testing.assert_frame_equal(cube.tables.table('cat 1', 'cat 2').sort_index().sort_index(axis=1),
+                                      expected.table('cat 1', 'cat 2').sort_index().sort_index(axis=1))
+        pd.testing.assert_frame_equal(cube.crosstab('cat 2', 'cat 1'), pd.crosstab(self.df['cat 2'], self.df['cat 1']))
+
+    def test_tests(self):
+        cube = pickle.loads(pickle.dumps(self.merged()))
+        a, b = [self.df[self.df['cat 0'] == i]['num 0'] for i in ['a', 'b']]
+        result, effect_size = cube.t_test('num 0', 'cat 0', 'a', 'b')
+        self.assertAlmostEqual(result.pvalue, ttest_ind(a, b).pvalue)
+        result, effect_size = cube.anova('num 1', 'cat 1', ['low', 'mid', 'high'])
+        expected = f_oneway(*[self.df[self.df['cat 1'] == i]['num 1'] for i in ['low', 'mid', 'high']])
+        self.assertAlmostEqual(result.statistic, expected.statistic)
+
+        result, phi = cube.chi_squared_dependence('cat 1', 'cat 2', min_sample=30)
+        expected, expected_phi = _chi_squared_dependence(self.df, 'cat 1', 'cat 2', None, None, 30)
+        self.assertAlmostEqual(result.statistic, expected.statistic)
+        self.assertAlmostEqual(phi, expected_phi)
+        np.testing.assert_allclose(cube.summary('num 0', 'cat 0')['mean'], self.df.groupby('cat 0')['num 0'].mean())
+
+    def test_auto_detect(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            expected = _auto_detect(self.df, self.num_col, self.cat_col)
+        with contextlib.redirect_stdout(io.StringIO()) as result_output:
+            result = self.merged().auto_detect()
+        self.assertEqual(list(result.describe()), list(expected.describe()))
+        self.assertEqual(result_output.getvalue(), output.getvalue())
+        self.assertGreater(len(result), 0)
+
+    def test_invalid(self):
+        cube = StatsCube(self.df, self.num_col, self.cat_col)
+        with self.assertRaises(ValueError):
+            cube.merge(StatsCube(self.df, self.num_col[:2], self.cat_col))
+
+if __name__ == '__main__':
+    unittest.main()
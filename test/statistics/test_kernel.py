@@ -0,0 +1,74 @@
+import unittest
+
+import pandas as pd
+import numpy as np
+from scipy.stats import ttest_ind, f_oneway
+from tickcounter.statistics import GroupStats, _compute_cohen_es, _compute_eta_squared, _auto_detect
+
+class TestGroupStats(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestGroupStats, cls).setUpClass()
+        rng = np.random.default_rng(0)
+        n = 500
+        cls.df = pd.DataFrame({
+            'x': rng.normal(size=n),
+            'y': rng.exponential(size=n) * 100,
+            'group': rng.choice(['a', 'b', 'c', 'd'], size=n, p=[0.4, 0.3, 0.2, 0.1]),
+        })
+        cls.df['x'] += (cls.df['group'] == 'a') * 0.5
+
+    def sample(self, num_col, group):
+        return self.df[self.df['group'] == group][num_col]
+
+    def test_groups(self):
+        group_stats = GroupStats(self.df, 'group', ['x', 'y'])
+        self.assertEqual(list(group_stats.size.index), list(self.df['group'].value_counts().index))
+        groups, ignored = group_stats.filter_sparse_group(100)
+        self.assertEqual(list(groups), ['a', 'b'])
+        self.assertEqual(list(ignored), ['c', 'd'])
+
+        expected = self.df.groupby('group')[['x', 'y']]
+        np.testing.assert_allclose(group_stats.mean.sort_index(), expected.mean())
+        np.testing.assert_allclose(group_stats.var().sort_index(), expected.var())
+        np.testing.assert_allclose(group_stats.sumsq.sort_index(), (self.df[['x', 'y']] ** 2).groupby(self.df['group']).sum())
+
+    def test_t_test(self):
+        group_stats = GroupStats(self.df, 'group', ['x', 'y'])
+        for num_col in ['x', 'y']:
+            for equal_var in [True, False]:
+                result, effect_size = group_stats.t_test(num_col, 'a', 'c', equal_var=equal_var)
+                expected = ttest_ind(self.sample(num_col, 'a'), self.sample(num_col, 'c'), equal_var=equal_var)
+                self.assertAlmostEqual(result.statistic, expected.statistic)
+                self.assertAlmostEqual(result.pvalue, expected.pvalue)
+                self.assertAlmostEqual(effect_size, _compute_cohen_es(self.sample(num_col, 'a'), self.sample(num_col, 'c')))
+
+    def test_anova(self):
+        group_stats = GroupStats(self.df, 'group', ['x', 'y'])
+        groups = ['a', 'b', 'd']
+        for num_col in ['x', 'y']:
+            result, effect_size = group_stats.anova(num_col, groups)
+            samples = [self.sample(num_col, i) for i in groups]
+            expected = f_oneway(*samples)
+            self.assertAlmostEqual(result.statistic, expected.statistic)
+            self.assertAlmostEqual(result.pvalue, expected.pvalue)
+            self.assertAlmostEqual(effect_size, _compute_eta_squared(*samples))
+
+    def test_missing(self):
+        df = self.df.copy()
+        df.loc[df.index[df['group'] == 'b'][0], 'x'] = np.nan
+        group_stats = GroupStats(df, 'group', ['x', 'y'])
+        self.assertTrue(np.isnan(group_stats.t_test('x', 'a', 'b')[0].pvalue))
+        self.assertTrue(np.isnan(group_stats.anova('x', ['a', 'b', 'c'])[0].pvalue))
+        self.assertFalse(np.isnan(group_stats.t_test('x', 'a', 'c')[0].pvalue))
+        self.assertFalse(np.isnan(group_stats.t_test('y', 'a', 'b')[0].pvalue))
+
+    def test_auto_detect(self):
+        findings = _auto_detect(self.df, ['x', 'y'], ['group'], eta=0.02, min_sample=60).findings_list
+        self.assertEqual(len(findings), 1)
+        self.assertEqual((findings[0].num_col, list(findings[0].groups)), ('x', ['a', 'b', 'c']))
+        expected = f_oneway(*[self.sample('x', i) for i in ['a', 'b', 'c']])
+        self.assertAlmostEqual(findings[0].test_result.pvalue, expected.pvalue)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+import pandas as pd
+import numpy as np
+from scipy import stats
+from tickcounter.statistics import _locate_outlier, _locate_outlier_iqr, _locate_outlier_zscore
+
+class TestOutlier(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestOutlier, cls).setUpClass()
+        rng = np.random.default_rng(0)
+        n = 1000
+        cls.df = pd.DataFrame({f"x{i}": rng.standard_t(3, size=n) for i in range(3)})
+        cls.df['group'] = rng.choice(['a', 'b'], size=n)
+        cls.columns = ['x0', 'x1', 'x2']
+
+    def expected_field(self, mask):
+        return mask.apply(lambda x: ''.join(col for col, i in zip(self.columns, x) if i), axis=1)
+
+    def test_iqr(self):
+        for multiplier in [1.5, 3]:
+            outliers, outlier_range = _locate_outlier_iqr(self.df, self.columns, iqr_multiplier=multiplier)
+            q1, q3 = self.df[self.columns].quantile(0.25), self.df[self.columns].quantile(0.75)
+            mask = (self.df[self.columns] > q3 + multiplier * (q3 - q1)) | (self.df[self.columns] < q1 - multiplier * (q3 - q1))
+            expected = self.df[mask.any(axis=1)]
+            pd.testing.assert_frame_equal(outliers[self.df.columns], expected)
+            pd.testing.assert_series_equal(outliers['Outlier_field'], self.expected_field(mask[mask.any(axis=1)]), check_names=False)
+            np.testing.assert_allclose(outlier_range['Lower bound'], q1 - multiplier * (q3 - q1))
+
+    def test_zscore(self):
+        outliers, outlier_range = _locate_outlier_zscore(self.df, self.columns, 2)
+        mask = pd.DataFrame(np.abs(stats.zscore(self.df[self.columns])) > 2, index=self.df.index, columns=self.columns)
+        pd.testing.assert_frame_equal(outliers[self.df.columns], self.df[mask.any(axis=1)])
+        pd.testing.assert_series_equal(outliers['Outlier_field'], self.expected_field(mask[mask.any(axis=1)]), check_names=False)
+
+        # Bounds are on both sides of the mean.
+        mean, std = self.df[self.columns].mean(), self.df[self.columns].std(ddof=0)
+        np.testing.assert_allclose(outlier_range['Lower_bound'], mean - 2 * std)
+        np.testing.assert_allclose(outlier_range['Upper_bound'], mean + 2 * std)
+        inside = self.df[self.columns].ge(outlier_range['Lower_bound']) & self.df[self.columns].le(outlier_range['Upper_bound'])
+        self.assertTrue((inside == ~mask).all().all())
+
+        # Rows with one value that is not an outlier, or with no outlier at all.
+        result = _locate_outlier_zscore(self.df, self.columns, 2, exclude=True)
+        pd.testing.assert_frame_equal(result, self.df[~mask.all(axis=1)])
+        result = _locate_outlier_zscore(self.df, self.columns, 2, any=False, exclude=True)
+        pd.testing.assert_frame_equal(result, self.df[~mask.any(axis=1)])
+        self.assertLess(len(result), len(self.df))
+        result, outlier_range = _locate_outlier_zscore(self.df, self.columns, 1, any=False)
+        mask = pd.DataFrame(np.abs(stats.zscore(self.df[self.columns])) > 1, index=self.df.index, columns=self.columns)
+        self.assertEqual(list(result.index), list(self.df.index[mask.all(axis=1)]))
+        self.assertTrue((result['Outlier_field'] == 'x0x1x2').all())
+
+    def test_mad(self):
+        outliers, outlier_range = _locate_outlier(self.df, self.columns, 'mad', mad_threshold=3.5)
+        median = self.df[self.columns].median()
+        mad = (self.df[self.columns] - median).abs().median()
+        mask = (0.6745 * (self.df[self.columns] - median) / mad).abs() > 3.5
+        pd.testing.assert_frame_equal(outliers[self.df.columns], self.df[mask.any(axis=1)])
+        np.testing.assert_allclose(outlier_range['Upper_bound'], median + 3.5 * mad / 0.6745)
+
+    def test_missing(self):
+        df = self.df.copy()
+        df.loc[:10, 'x0'] = np.nan
+        for method in ['iqr', 'zscore', 'mad']:
+            outliers, outlier_range = _locate_outlier(df, self.columns, method)
+            self.assertFalse(outlier_range.isna().any().any())
+            self.assertFalse((outliers['Outlier_field'].str.contains('x0') & outliers['x0'].isna()).any())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            _locate_outlier(self.df, self.columns, 'std')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import itertools
+
+import pandas as pd
+import numpy as np
+from scipy import stats
+from tickcounter.statistics import GroupStats, _diff_group, _diff, _t_test_group
+from tickcounter.statistics import kernel
+
+class TestPairwise(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestPairwise, cls).setUpClass()
+        rng = np.random.default_rng(0)
+        n = 400
+        cls.df = pd.DataFrame({
+            'x': rng.normal(size=n),
+            'y': rng.exponential(size=n) * 10,
+            'group': rng.choice(['a', 'b', 'c', 'd'], size=n, p=[0.4, 0.3, 0.2, 0.1]),
+        })
+        cls.df['x'] += (cls.df['group'] == 'a') * 0.5
+        cls.group_stats = GroupStats(cls.df, 'group', ['x', 'y'])
+        cls.groups = list(cls.group_stats.size.index)
+
+    def samples(self, num_col):
+        return [self.df[self.df['group'] == i][num_col] for i in self.groups]
+
+    def test_t_test(self):
+        for equal_var in [True, False]:
+            result = self.group_stats.pairwise(equal_var=equal_var)
+            self.assertEqual(len(result), 2 * 6)
+            for num_col in ['x', 'y']:
+                samples = self.samples(num_col)
+                for i, j in itertools.combinations(range(4), 2):
+                    row = result.loc[(num_col, self.groups[i], self.groups[j])]
+                    expected = stats.ttest_ind(samples[i], samples[j], equal_var=equal_var)
+                    self.assertAlmostEqual(row['statistic'], expected.statistic)
+                    self.assertAlmostEqual(row['pvalue'], expected.pvalue)
+                    self.assertAlmostEqual(row['diff'], samples[i].mean() - samples[j].mean())
+
+    @unittest.skipIf(kernel.studentized_range is None, "requires scipy >= 1.7")
+    def test_tukey(self):
+        result = self.group_stats.pairwise(method='tukey')
+        for num_col in ['x', 'y']:
+            expected = stats.tukey_hsd(*self.samples(num_col))
+            for i, j in itertools.combinations(range(4), 2):
+                row = result.loc[(num_col, self.groups[i], self.groups[j])]
+                self.assertAlmostEqual(row['diff'], expected.statistic[i, j])
+                self.assertAlmostEqual(row['pvalue'], expected.pvalue[i, j], places=6)
+
+    @unittest.skipIf(kernel.studentized_range is None, "requires scipy >= 1.7")
+    def test_games_howell(self):
+        result = self.group_stats.pairwise('y', method='games-howell')
+        samples = self.samples('y')
+        for i, j in itertools.combinations(range(4), 2):
+            a, b = samples[i], samples[j]
+            vn_a, vn_b = a.var() / len(a), b.var() / len(b)
+            q = abs(a.mean() - b.mean()) / np.sqrt((vn_a + vn_b) / 2)
+            dof = (vn_a + vn_b) ** 2 / (vn_a ** 2 / (len(a) - 1) + vn_b ** 2 / (len(b) - 1))
+            row = result.loc[('y', self.groups[i], self.groups[j])]
+            self.assertAlmostEqual(row['statistic'], q)
+            self.assertAlmostEqual(row['dof'], dof)
+            self.assertAlmostEqual(row['pvalue'], stats.studentized_range.sf(q, 4, dof))
+
+    @unittest.skipIf(kernel.studentized_range is None, "requires scipy >= 1.7")
+    def test_studentized_range_interpolation(self):
+        q = np.linspace(0, 7, kernel._SF_GRID + 40)
+        result = kernel._studentized_range_sf(q, 5, 200)
+        sample = q[::20]
+        np.testing.assert_allclose(result[::20], stats.studentized_range.sf(sample, 5, 200), rtol=1e-6)
+        self.assertTrue(np.isnan(kernel._studentized_range_sf([np.nan, 1], 5, 200)[0]))
+
+        # Far in the tail the pvalues are bounded by the last accurate value.
+        q = np.linspace(0, 60, kernel._SF_GRID + 40)
+        result = kernel._studentized_range_sf(q, 5, 200)
+        self.assertTrue((np.diff(result) <= 0).all())
+        self.assertLessEqual(result[-1], 1e-11)
+        np.testing.assert_allclose(result[:40:10], stats.studentized_range.sf(q[:40:10], 5, 200), rtol=1e-5)
+
+    def test_diff_group(self):
+        result = _diff_group(self.df, 'group', ['x', 'y'])
+        group_mean = self.df.groupby('group')[['x', 'y']].mean().T
+        self.assertEqual(list(result.columns), [f"{i} - {j}" for i, j in itertools.combinations(group_mean.columns, 2)])
+        for i, j in itertools.combinations(group_mean.columns, 2):
+            np.testing.assert_allclose(result[f"{i} - {j}"], group_mean[i] - group_mean[j])
+
+    def test_diff(self):
+        result = _diff(self.df, 'x', 'y')
+        np.testing.assert_allclose(result['x - y'], self.df['x'] - self.df['y'])
+
+    def test_t_test_group(self):
+        result = _t_test_group(self.df, 'group', 'x')
+        self.assertEqual(list(result), [f"{i} vs {j}" for i, j in itertools.combinations(self.groups, 2)])
+        samples = self.samples('x')
+        expected = stats.ttest_ind(samples[0], samples[3], equal_var=False)
+        self.assertAlmostEqual(_t_test_group(self.df, 'group', 'x', equal_var=False)[f"{self.groups[0]} vs {self.groups[3]}"].pvalue, expected.pvalue)
+
+        result = _t_test_group(self.df, 'group', ['x', 'y'])
+        self.assertAlmostEqual(result[f"{self.groups[0]} vs {self.groups[1]}"].statistic[0],
+                               stats.ttest_ind(samples[0], samples[1]).statistic)
+        self.assertEqual(result[f"{self.groups[0]} vs {self.groups[1]}"].statistic.shape, (2,))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            self.group_stats.pairwise(method='scheffe')
+
+if __name__ == '__main__':
+    unittest.main()
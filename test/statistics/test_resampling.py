@@ -0,0 +1,85 @@
+import unittest
+import contextlib
+import io
+
+import pandas as pd
+import numpy as np
+from tickcounter.statistics import Resampler, GroupStats, ContingencyTables, _auto_detect, _compare_mean, _compare_group
+
+class TestResampler(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestResampler, cls).setUpClass()
+        rng = np.random.default_rng(5)
+        n = 1500
+        cls.df = pd.DataFrame({'num 0': rng.normal(size=n), 'num 1': rng.normal(size=n)})
+        cls.df['cat 0'] = rng.choice(['a', 'b', 'c'], size=n)
+        cls.df['cat 1'] = np.where(rng.random(n) < 0.3, cls.df['cat 0'], rng.choice(['a', 'b', 'c'], size=n))
+        cls.df.loc[cls.df['cat 0'] == 'a', 'num 0'] += 0.4
+        cls.group_stats = GroupStats(cls.df, 'cat 0', ['num 0', 'num 1'])
+
+    def test_mean_test(self):
+        # On normal data, the resampled pvalues are close to the parametric ones.
+        for method in ['permutation', 'bootstrap']:
+            resampler = Resampler(method, n_resamples=2000, seed=0)
+            for groups in [['a', 'b'], ['a', 'b', 'c'], ['b', 'c']]:
+                test_result, effect_size = (self.group_stats.t_test('num 1', *groups) if len(groups) == 2
+                                            else self.group_stats.anova('num 1', groups))
+                result = resampler.mean_test(self.df, 'num 1', 'cat 0', groups, test_result)
+                self.assertEqual(result.name, f"{test_result.name} ({method})")
+                self.assertEqual(result.statistic, test_result.statistic)
+                self.assertLess(abs(result.pvalue - test_result.pvalue), 0.05)
+                lower, upper = result.confidence_interval
+                self.assertTrue(lower <= effect_size <= upper)
+
+    def test_significant(self):
+        result = Resampler(n_resamples=999, seed=0).mean_test(self.df, 'num 0', 'cat 0', ['a', 'b'])
+        self.assertEqual(result.pvalue, 1 / 1000)
+
+    def test_chi_squared_test(self):
+        tables = ContingencyTables(self.df, ['cat 0', 'cat 1'])
+        groups = ['a', 'b', 'c']
+        test_result, phi = tables.test_result('cat 0', 'cat 1', groups, groups)
+        for method in ['permutation', 'bootstrap']:
+            result = Resampler(method, n_resamples=999, seed=0).chi_squared_test(self.df, 'cat 0', 'cat 1', groups, groups, test_result)
+            self.assertEqual(result.pvalue, 1 / 1000)
+            self.assertEqual(result.dof, test_result.dof)
+
+    def test_seed(self):
+        # The same seed gives the same pvalues, whatever the workers.
+        expected = Resampler(n_resamples=500, seed=1).mean_test(self.df, 'num 1', 'cat 0', ['a', 'b'])
+        for kwargs in [dict(), dict(n_jobs=2), dict(n_jobs=2, backend='process')]:
+            result = Resampler(n_resamples=500, seed=1, **kwargs).mean_test(self.df, 'num 1', 'cat 0', ['a', 'b'])
+            self.assertEqual(result.pvalue, expected.pvalue)
+            self.assertEqual(result.confidence_interval, expected.confidence_interval)
+
+    def test_compare(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            findings = _compare_mean(self.df, 'num 0', 'cat 0', min_sample=0, eta=0.01, method='permutation')
+        self.assertEqual(findings.test_result.name, 'anova (permutation)')
+        findings = _compare_group(self.df, 'cat 0', 'cat 1', min_sample=0, method=Resampler('bootstrap', n_resamples=99, seed=0))
+        self.assertEqual(findings.test_result.name, 'chi2 contigency (bootstrap)')
+        with self.assertRaises(ValueError):
+            _compare_mean(self.df, 'num 0', 'cat 0', method='jackknife')
+        with self.assertRaises(ValueError):
+            _compare_mean(self.df.assign(weight=1), 'num 0', 'cat 0', weight_col='weight', method='permutation')
+
+    def test_auto_detect(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = _auto_detect(self.df, ['num 0', 'num 1'], ['cat 0', 'cat 1'], eta=0.01).to_frame()
+            result = _auto_detect(self.df, ['num 0', 'num 1'], ['cat 0', 'cat 1'], eta=0.01, method=Resampler(n_resamples=999, seed=0),
+                                  correction='holm').to_frame()
+        self.assertEqual(list(expected['findings']), ['AnovaFindings', 'DependenceFindings'])
+        self.assertEqual(list(result['col_1']), list(expected['col_1']))
+        self.assertEqual(list(result['col_2']), list(expected['col_2']))
+        self.assertTrue(result['test'].str.endswith('(permutation)').all())
+        self.assertIsNotNone(result['confidence_interval'][0])
+        self.assertIsNone(result['confidence_interval'][1])
+
+        # A method given by name gives the same findings with the same seed.
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = [_auto_detect(self.df, ['num 0'], ['cat 0', 'cat 1'], eta=0.01, method='bootstrap', seed=2).to_frame() for _ in range(2)]
+        pd.testing.assert_frame_equal(result[0], result[1])
+
+if __name__ == "__main__":
+    unittest.main()
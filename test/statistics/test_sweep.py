@@ -0,0 +1,76 @@
+import unittest
+import contextlib
+import io
+import os
+import pickle
+import tempfile
+
+import pandas as pd
+import numpy as np
+from tickcounter.statistics import _auto_detect
+
+class TestSweep(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestSweep, cls).setUpClass()
+        rng = np.random.default_rng(0)
+        n = 2000
+        cls.df = pd.DataFrame({f"num {i}": rng.normal(size=n) for i in range(4)})
+        cls.df['cat 0'] = rng.choice(['a', 'b'], size=n, p=[0.7, 0.3])
+        cls.df['cat 1'] = rng.choice(['x', 'y', 'z', 'rare'], size=n, p=[0.4, 0.3, 0.295, 0.005])
+        cls.df['cat 2'] = np.where(cls.df['num 1'] > 1, 'high', rng.choice(['low', 'mid'], size=n))
+        cls.df['cat 3'] = np.where(cls.df['cat 2'] == 'high', 'u', rng.choice(['u', 'v'], size=n))
+        cls.df['num 0'] += (cls.df['cat 0'] == 'a') * 0.5
+        cls.num_col = [f"num {i}" for i in range(4)]
+        cls.cat_col = [f"cat {i}" for i in range(4)]
+        cls.ignore_list = {('num 3', 'cat 1'), ('cat 0', 'cat 1')}
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.checkpoint = os.path.join(self.dir.name, "checkpoint.pkl")
+
+    def auto_detect(self, **kwargs):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            findings = _auto_detect(self.df, self.num_col, self.cat_col, ignore_list=self.ignore_list, **kwargs)
+        summary = [(type(i).__name__, i.describe_short(), i.test_result.statistic, i.test_result.pvalue) for i in findings.findings_list]
+        return summary, output.getvalue()
+
+    def assert_same(self, result, expected):
+        self.assertEqual(result[1], expected[1])
+        self.assertEqual([i[:2] for i in result[0]], [i[:2] for i in expected[0]])
+        np.testing.assert_allclose([i[2:] for i in result[0]], [i[2:] for i in expected[0]])
+
+    def test_backend(self):
+        expected = self.auto_detect()
+        self.assertEqual(len(expected[0]), 4)
+        for backend in ['thread', 'process']:
+            self.assert_same(self.auto_detect(n_jobs=2, backend=backend), expected)
+
+    def test_checkpoint(self):
+        expected = self.auto_detect()
+        self.assert_same(self.auto_detect(checkpoint=self.checkpoint), expected)
+
+        # Keep the first completed unit and half of the second one, as if the sweep was interrupted.
+        with open(self.checkpoint, 'rb') as f:
+            records = [pickle.load(f) for _ in range(3)]
+        with open(self.checkpoint, 'wb') as f:
+            pickle.dump(records[0], f)
+            pickle.dump(records[1], f)
+            f.write(pickle.dumps(records[2])[:20])
+        self.assert_same(self.auto_detect(checkpoint=self.checkpoint, n_jobs=2), expected)
+
+        with self.assertRaises(ValueError):
+            _auto_detect(self.df, self.num_col, self.cat_col[:2], checkpoint=self.checkpoint)
+
+        # Same shape and columns, different values.
+        changed = self.df.copy()
+        changed[self.num_col[0]] = changed[self.num_col[0]][::-1].to_numpy()
+        with self.assertRaises(ValueError):
+            _auto_detect(changed, self.num_col, self.cat_col, ignore_list=self.ignore_list, checkpoint=self.checkpoint)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+if __name__ == "__main__":
+    unittest.main()
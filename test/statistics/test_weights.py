@@ -0,0 +1,78 @@
+import unittest
+import contextlib
+import io
+
+import pandas as pd
+import numpy as np
+from tickcounter.statistics import GroupStats, ContingencyTables, StatsCube, _auto_detect, _t_test, _anova, _chi_squared, _compute_cohen_es, _compute_eta_squared
+
+class TestWeights(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(TestWeights, cls).setUpClass()
+        rng = np.random.default_rng(3)
+        n = 800
+        cls.df = pd.DataFrame({f"num {i}": rng.normal(size=n) for i in range(3)})
+        cls.df['cat 0'] = rng.choice(['a', 'b'], size=n, p=[0.6, 0.4])
+        cls.df['cat 1'] = np.where(cls.df['num 1'] > 0.8, 'high', rng.choice(['low', 'mid'], size=n))
+        cls.df['cat 2'] = np.where(cls.df['cat 1'] == 'high', 'u', rng.choice(['u', 'v', 'w'], size=n))
+        cls.df['num 0'] += (cls.df['cat 0'] == 'a') * 0.3
+        cls.df.loc[rng.random(n) < 0.02, 'num 2'] = np.nan
+        cls.df.loc[rng.random(n) < 0.02, 'cat 2'] = np.nan
+        cls.df['weight'] = rng.integers(0, 4, size=n)
+        # Each row repeated as many times as its weight, which the weighted results should match.
+        cls.expanded = cls.df.loc[cls.df.index.repeat(cls.df['weight'])].reset_index(drop=True)
+        cls.num_col = ['num 0', 'num 1', 'num 2']
+        cls.cat_col = ['cat 0', 'cat 1', 'cat 2']
+
+    def test_group_stats(self):
+        result = GroupStats(self.df, 'cat 1', self.num_col, weight_col='weight')
+        expected = GroupStats(self.expanded, 'cat 1', self.num_col)
+        pd.testing.assert_series_equal(result.size, expected.size, check_dtype=False)
+        for i in ['count', 'sum', 'nansum', 'ss']:
+            pd.testing.assert_frame_equal(getattr(result, i), getattr(expected, i), check_dtype=False)
+
+    def test_table(self):
+        result = ContingencyTables(self.df, ['cat 1', 'cat 2'], weight_col='weight').table('cat 1', 'cat 2')
+        expected = ContingencyTables(self.expanded, ['cat 1', 'cat 2']).table('cat 1', 'cat 2')
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_tests(self):
+        result, effect_size = _t_test(self.df, 'num 0', 'cat 0', 'a', 'b', weight_col='weight')
+        expected, expected_size = _t_test(self.expanded, 'num 0', 'cat 0', 'a', 'b')
+        self.assertAlmostEqual(result.pvalue, expected.pvalue)
+        self.assertAlmostEqual(effect_size, expected_size)
+
+        result, effect_size = _anova(self.df, 'num 1', 'cat 2', ['u', 'v', 'w'], weight_col='weight')
+        expected, expected_size = _anova(self.expanded, 'num 1', 'cat 2', ['u', 'v', 'w'])
+        self.assertAlmostEqual(result.pvalue, expected.pvalue)
+        self.assertAlmostEqual(effect_size, expected_size)
+
+        result, effect_size = _chi_squared(self.df, 'cat 1', weight_col='weight')
+        expected, expected_size = _chi_squared(self.expanded, 'cat 1')
+        self.assertAlmostEqual(result.pvalue, expected.pvalue)
+        self.assertAlmostEqual(effect_size, expected_size)
+
+    def test_effect_sizes(self):
+        samples = [self.df.loc[self.df['cat 2'] == i] for i in ['u', 'v', 'w']]
+        expanded = [self.expanded.loc[self.expanded['cat 2'] == i, 'num 1'] for i in ['u', 'v', 'w']]
+        result = _compute_eta_squared(*[i['num 1'] for i in samples], weights=[i['weight'] for i in samples])
+        self.assertAlmostEqual(result, _compute_eta_squared(*expanded))
+        result = _compute_cohen_es(samples[0]['num 1'], samples[1]['num 1'], samples[0]['weight'], samples[1]['weight'])
+        self.assertAlmostEqual(result, _compute_cohen_es(expanded[0], expanded[1]))
+
+    def auto_detect(self, data, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            findings = _auto_detect(data, self.num_col, self.cat_col, min_sample=50, **kwargs)
+        return findings.to_frame()[['col_1', 'col_2', 'pvalue']]
+
+    def test_auto_detect(self):
+        expected = self.auto_detect(self.expanded)
+        self.assertGreater(len(expected), 0)
+        for kwargs in [dict(), dict(n_jobs=2)]:
+            result = self.auto_detect(self.df, weight_col='weight', **kwargs)
+            pd.testing.assert_frame_equal(result, expected)
+
+    def test_stats_cube(self):
+        cube = StatsCube(self.df, self.num_col, self.cat_col, weight_col='weight')
+        pd.testing.assert_frame_equal(cube.crosstab('cat 0', 'cat 1'), pd.crosstab(self.expanded['cat 0'], self.expanded['cat 1']), check_dtype=False)
@@ -1,3 +1,5 @@
+import pandas as pd
+
 from .findings import Findings
 from ..util import allow_values
 from tickcounter import plot
@@ -5,17 +7,19 @@ import seaborn as sns
 import numpy as np
 
 class AnovaFindings(Findings):
-    def __init__(self, data, group_col, num_col, groups, test_result, descrip=None):
+    def __init__(self, data, group_col, num_col, groups, test_result, descrip=None, summary=None):
+        # summary holds the count and mean of num_col in each group, computed from data if None.
         self.data = data
         self.group_col = group_col
         self.num_col = num_col
         self.groups = groups
         self.test_result = test_result
         self.descrip = descrip
+        self.summary = summary
     
     def describe(self, descrip_value=False):
-        group_mean = self.data.groupby(self.group_col)[self.num_col].mean()
-        descrip_mean = [(i, f"{j:.2f}") for i,j in group_mean.iteritems()]
+        group_mean = self._get_summary(self.group_col, self.num_col)['mean']
+        descrip_mean = [(i, f"{j:.2f}") for i,j in group_mean.items()]
         group_val = self.descrip.translate(self.group_col, list(self.groups)) if descrip_value else list(self.groups)
         descrip = f"Value of {self.num_col} is dependent on {self.group_col} (with groups {group_val}) at " \
                   f"ANOVA pvalue of {self.test_result.pvalue:.2f},. Respective group means are " \
@@ -25,8 +29,8 @@ class AnovaFindings(Findings):
     def describe_short(self):
         return f"{self.num_col} (num) and {self.group_col} (cat) are not independent."
 
-    def illustrate(self, ax=None, descrip_title=False, descrip_value=False, descrip_legend=False, **kwargs):
-        data = allow_values(self.data, self.group_col, self.groups)
+    def illustrate(self, ax=None, descrip_title=False, descrip_value=False, descrip_legend=False, data=None, **kwargs):
+        data = allow_values(self._get_data(data), self.group_col, self.groups)
         if ax is None:
             ax = sns.barplot(data=data, x=self.group_col, y=self.num_col, estimator=np.mean, **kwargs)
             ax.set_title(self.describe_short())
@@ -42,3 +46,18 @@ class AnovaFindings(Findings):
                                 descrip_legend=descrip_legend)
         
         return ax
+
+    def _record(self):
+        return dict(col_1=self.group_col,
+                    col_2=self.num_col,
+                    groups_1=list(self.groups),
+                    summary=self._summary_record(self.summary))
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(data=None,
+                   group_col=record['col_1'],
+                   num_col=record['col_2'],
+                   groups=pd.Index(record['groups_1']),
+                   test_result=cls._test_result(record),
+                   summary=cls._summary_from_record(record['summary']))
@@ -1,4 +1,5 @@
 from .findings import Findings
+from ..util import allow_values
 from tickcounter import plot
 import seaborn as sns
 import numpy as np
@@ -19,12 +20,12 @@ class ChiSquaredFindings(Findings):
         else:
             self._describe_expected()
     
-    def illustrate(self, ax=None):
+    def illustrate(self, ax=None, data=None):
         if self.test_result.expected is None:
-            self._illustrate_equal(ax)
+            self._illustrate_equal(ax, data)
         
         else:
-            self._illustrate_expected(ax)
+            self._illustrate_expected(ax, data)
     
     def _describe_short_equal(self):
         return f"{self.groups} are not equal in proportion"
@@ -38,14 +39,25 @@ class ChiSquaredFindings(Findings):
     def _describe_expected(self):
         return f"Column {self.col} with categories {self.groups} are not equal to the expected proportion - {self.test_result.expected}, at pvalue of {self.test_result.pvalue:.2f} ({self.test_result.name})"
     
-    def _illustrate_equal(self, ax=None):
-        data = allow_values(self.data, self.col, self.groups)
+    def _illustrate_equal(self, ax=None, data=None):
+        data = allow_values(self._get_data(data), self.col, self.groups)
         if ax is None:
             sns.countplot(data=data, x=self.col)
         else:
             sns.countplot(data=data, x=self.col, ax=ax)
     
-    def _illustrate_expected(self, ax=None):
-        data = allow_values(self.data, self.col, self.groups)
+    def _illustrate_expected(self, ax=None, data=None):
+        data = allow_values(self._get_data(data), self.col, self.groups)
         # TODO: Still has no idea how to illustrate expected proportions
         pass
+
+    def _record(self):
+        return dict(col_1=self.col,
+                    groups_1=list(self.groups))
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(data=None,
+                   col=record['col_1'],
+                   groups=record['groups_1'],
+                   test_result=cls._test_result(record))
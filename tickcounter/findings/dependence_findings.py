@@ -1,3 +1,5 @@
+import pandas as pd
+
 from .findings import Findings
 from ..util import allow_values
 from tickcounter import plot
@@ -24,8 +26,8 @@ class DependenceFindings(Findings):
     def describe_short(self):
         return f"{self.col_1} (cat) and {self.col_2} (cat) are not independent"
     
-    def illustrate(self, ax=None, descrip_title=False, descrip_value=False, descrip_legend=False, **kwargs):
-        data = allow_values(self.data, self.col_1, self.groups_1)
+    def illustrate(self, ax=None, descrip_title=False, descrip_value=False, descrip_legend=False, data=None, **kwargs):
+        data = allow_values(self._get_data(data), self.col_1, self.groups_1)
         data = allow_values(data, self.col_2, self.groups_2)
         if ax is None:
             ax = sns.countplot(data=data, x=self.col_1, hue=self.col_2)
@@ -39,4 +41,19 @@ class DependenceFindings(Findings):
                                 descrip_value=descrip_value,
                                 descrip_title=descrip_title,
                                 descrip_legend=descrip_legend)
-        return ax
\ No newline at end of file
+        return ax
+
+    def _record(self):
+        return dict(col_1=self.col_1,
+                    col_2=self.col_2,
+                    groups_1=list(self.groups_1),
+                    groups_2=list(self.groups_2))
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(data=None,
+                   col_1=record['col_1'],
+                   col_2=record['col_2'],
+                   groups_1=pd.Index(record['groups_1']),
+                   groups_2=pd.Index(record['groups_2']),
+                   test_result=cls._test_result(record))
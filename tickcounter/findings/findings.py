@@ -1,8 +1,22 @@
 from abc import ABC, abstractmethod
+import weakref
+import pandas as pd
+
+from .test_result import TestResult
+
+def _group_summary(data, group_col, num_col):
+    # Count and mean of num_col in every group, as stored in the summary of the findings.
+    grouped = data.groupby(group_col)[num_col]
+    return pd.DataFrame({'count': grouped.count(), 'mean': grouped.mean()})
 
 class Findings(object):
     """
     Store information about the findings to be used for findings_list object
+
+    The findings only keep the summary statistics they need to be described. The data is only
+    needed to illustrate them, it can be given to illustrate or attached with attach. The
+    findings only keep a weak reference to the attached data, so they never keep it alive, and
+    it is never pickled.
     """
     @abstractmethod  
     def describe(self):
@@ -14,4 +28,76 @@ class Findings(object):
 
     @abstractmethod
     def illustrate(self, ax):
-        pass
\ No newline at end of file
+        pass
+
+    @property
+    def data(self):
+        ref = self.__dict__.get('_data')
+        return None if ref is None else ref()
+
+    @data.setter
+    def data(self, data):
+        self._data = None if data is None else weakref.ref(data)
+
+    def attach(self, data):
+        self.data = data
+        return self
+
+    def _get_data(self, data=None):
+        data = self.data if data is None else data
+        if data is None:
+            raise ValueError(f"{type(self).__name__} has no data to illustrate, pass data or attach it first, and keep it alive")
+        return data
+
+    def _get_summary(self, group_col, num_col):
+        if self.summary is None:
+            return _group_summary(self._get_data(), group_col, num_col)
+        return self.summary
+
+    @abstractmethod
+    def _record(self):
+        # Columns specific to each kind of findings, see to_record.
+        pass
+
+    def to_record(self):
+        """
+        Return the findings as a dict of plain values, one row of FindingsList.to_frame.
+        """
+        record = dict(findings=type(self).__name__, col_1=None, col_2=None, groups_1=None, groups_2=None, summary=None)
+        record.update(self._record())
+        expected = self.test_result.expected
+        record.update(test=self.test_result.name,
+                      statistic=self.test_result.statistic,
+                      pvalue=self.test_result.pvalue,
+                      adjusted_pvalue=self.test_result.adjusted_pvalue,
+                      confidence_interval=self.test_result.confidence_interval,
+                      dof=self.test_result.dof,
+                      expected=None if expected is None else pd.DataFrame(expected).to_numpy().tolist())
+        return record
+
+    @staticmethod
+    def _test_result(record):
+        return TestResult(name=record['test'],
+                          statistic=record['statistic'],
+                          pvalue=record['pvalue'],
+                          dof=record['dof'],
+                          expected=record['expected'],
+                          adjusted_pvalue=record['adjusted_pvalue'],
+                          confidence_interval=None if record.get('confidence_interval') is None else tuple(record['confidence_interval']))
+
+    @staticmethod
+    def _summary_record(summary):
+        if summary is None:
+            return None
+        return [[group, int(count), float(mean)] for group, count, mean in zip(summary.index, summary['count'], summary['mean'])]
+
+    @staticmethod
+    def _summary_from_record(record):
+        if record is None:
+            return None
+        return pd.DataFrame([i[1:] for i in record], index=[i[0] for i in record], columns=['count', 'mean'])
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_data'] = None
+        return state
@@ -1,14 +1,37 @@
 from matplotlib import pyplot as plt
 import pandas as pd
+import numpy as np
+import json
 
 from tickcounter import plot
+from .t_test_findings import TTestFindings
+from .anova_findings import AnovaFindings
+from .dependence_findings import DependenceFindings
+from .chi_squared_findings import ChiSquaredFindings
+
+_FINDINGS = {i.__name__: i for i in [TTestFindings, AnovaFindings, DependenceFindings, ChiSquaredFindings]}
+_COLUMNS = ['findings', 'col_1', 'col_2', 'groups_1', 'groups_2', 'test', 'statistic', 'pvalue', 'adjusted_pvalue', 'confidence_interval', 'dof', 'expected', 'summary']
+# Columns holding lists, written to files as JSON.
+_JSON_COLUMNS = ['groups_1', 'groups_2', 'confidence_interval', 'dof', 'expected', 'summary']
+
+def _to_json(value):
+    return json.dumps(value, default=lambda x: x.tolist() if isinstance(x, (np.ndarray, np.generic)) else list(x))
+
+def _from_json(value):
+    return json.loads(value) if isinstance(value, str) else None
 
 class FindingsList(object):
     """
     Store interesting findings.
+
+    The findings can be viewed as a table with one row per findings (see to_frame), which can be
+    filtered, sorted, and saved to CSV or parquet files then read back without the data.
     """
     def __init__(self, findings_list):
         self.findings_list = findings_list
+
+    def __len__(self):
+        return len(self.findings_list)
     
     def describe(self, descrip_value=False):
         # Return a series object
@@ -20,12 +43,73 @@ class FindingsList(object):
         return descrip_ss
 
     @plot.plotter
-    def illustrate(self, n_col=1, descrip_value=False, descrip_title=False, descrip_legend=False):
+    def illustrate(self, n_col=1, descrip_value=False, descrip_title=False, descrip_legend=False, data=None):
         for i, findings in enumerate(self.findings_list):
             ax = plt.subplot(len(self.findings_list), n_col, i + 1)
             ax.set_title(findings.describe_short())
-            findings.illustrate(ax=ax, descrip_value=descrip_value, descrip_title=descrip_title, descrip_legend=descrip_legend)
+            findings.illustrate(ax=ax, descrip_value=descrip_value, descrip_title=descrip_title, descrip_legend=descrip_legend, data=data)
     
     def set_descrip(self, descrip):
         for i in self.findings_list:
             i.descrip = descrip
+
+    def attach(self, data):
+        # Data used to illustrate the findings, as long as it is alive.
+        for i in self.findings_list:
+            i.attach(data)
+        return self
+
+    def to_frame(self):
+        """
+        Return a DataFrame with one row per findings: the kind of findings, the columns and
+        groups compared, the test result and the summary statistics of the groups.
+        """
+        return pd.DataFrame([i.to_record() for i in self.findings_list], columns=_COLUMNS)
+
+    @classmethod
+    def from_frame(cls, frame):
+        findings_list = []
+        for record in frame.to_dict(orient='records'):
+            record = {i: (None if not isinstance(j, (list, tuple, str)) and pd.isna(j) else j) for i, j in record.items()}
+            findings_list.append(_FINDINGS[record['findings']].from_record(record))
+        return cls(findings_list)
+
+    def filter(self, mask):
+        """
+        Return the findings where mask is True. mask is a boolean array aligned with
+        to_frame(), or a function returning one from it.
+        """
+        mask = mask(self.to_frame()) if callable(mask) else mask
+        return FindingsList([i for i, j in zip(self.findings_list, np.asarray(mask, dtype=bool)) if j])
+
+    def sort(self, by='pvalue', ascending=True):
+        order = self.to_frame().sort_values(by, ascending=ascending, kind='mergesort').index
+        return FindingsList([self.findings_list[i] for i in order])
+
+    def _to_file_frame(self):
+        frame = self.to_frame()
+        for col in _JSON_COLUMNS:
+            frame[col] = [None if i is None else _to_json(i) for i in frame[col]]
+        return frame
+
+    @classmethod
+    def _from_file_frame(cls, frame):
+        for col in _JSON_COLUMNS:
+            frame[col] = [_from_json(i) for i in frame[col]]
+        # JSON has no tuple, the dof of an ANOVA is saved as a list.
+        frame['dof'] = [tuple(i) if isinstance(i, list) else i for i in frame['dof']]
+        return cls.from_frame(frame)
+
+    def to_csv(self, path, **kwargs):
+        self._to_file_frame().to_csv(path, index=False, **kwargs)
+
+    @classmethod
+    def read_csv(cls, path, **kwargs):
+        return cls._from_file_frame(pd.read_csv(path, **kwargs))
+
+    def to_parquet(self, path, **kwargs):
+        self._to_file_frame().to_parquet(path, index=False, **kwargs)
+
+    @classmethod
+    def read_parquet(cls, path, **kwargs):
+        return cls._from_file_frame(pd.read_parquet(path, **kwargs))
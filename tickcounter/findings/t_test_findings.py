@@ -1,3 +1,5 @@
+import pandas as pd
+
 from .findings import Findings
 from ..util import allow_values
 from tickcounter import plot
@@ -6,7 +8,8 @@ import numpy as np
 from textwrap import dedent
 
 class TTestFindings(Findings):
-    def __init__(self, data, group_col, num_col, group_1, group_2, test_result, descrip=None):
+    def __init__(self, data, group_col, num_col, group_1, group_2, test_result, descrip=None, summary=None):
+        # summary holds the count and mean of num_col in each group, computed from data if None.
         self.data = data
         self.group_col = group_col
         self.num_col = num_col
@@ -14,10 +17,12 @@ class TTestFindings(Findings):
         self.group_2 = group_2
         self.test_result = test_result
         self.descrip = descrip
+        self.summary = summary
 
     def describe(self, descrip_value=False):
-        group_1_mean = self.data[self.data[self.group_col] == self.group_1][self.num_col].mean()
-        group_2_mean = self.data[self.data[self.group_col] == self.group_2][self.num_col].mean()
+        group_mean = self._get_summary(self.group_col, self.num_col)['mean']
+        group_1_mean = group_mean[self.group_1]
+        group_2_mean = group_mean[self.group_2]
         group_1_val = self.descrip.translate(self.group_col, [self.group_1])[0] if descrip_value else self.group_1
         group_2_val = self.descrip.translate(self.group_col, [self.group_2])[0] if descrip_value else self.group_2
         return f"In column {self.group_col}, the mean of {self.num_col} for {group_1_val} " \
@@ -27,9 +32,9 @@ class TTestFindings(Findings):
     def describe_short(self):
         return f"{self.num_col} (num) and {self.group_col} (cat) are not independent"
     
-    def illustrate(self, ax=None, descrip_title=False, descrip_value=False, descrip_legend=False, **kwargs):
+    def illustrate(self, ax=None, descrip_title=False, descrip_value=False, descrip_legend=False, data=None, **kwargs):
         #TODO: Support horizontal orient
-        data = allow_values(self.data, self.group_col, [self.group_1, self.group_2])
+        data = allow_values(self._get_data(data), self.group_col, [self.group_1, self.group_2])
         if ax is None:
             ax = sns.barplot(data=data, x=self.group_col, y=self.num_col, estimator=np.mean, **kwargs)
             ax.set_title(self.describe_short())
@@ -44,4 +49,20 @@ class TTestFindings(Findings):
                                 descrip_title=descrip_title,
                                 descrip_legend=descrip_legend)
 
-        return ax
\ No newline at end of file
+        return ax
+
+    def _record(self):
+        return dict(col_1=self.group_col,
+                    col_2=self.num_col,
+                    groups_1=[self.group_1, self.group_2],
+                    summary=self._summary_record(self.summary))
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(data=None,
+                   group_col=record['col_1'],
+                   num_col=record['col_2'],
+                   group_1=record['groups_1'][0],
+                   group_2=record['groups_1'][1],
+                   test_result=cls._test_result(record),
+                   summary=cls._summary_from_record(record['summary']))
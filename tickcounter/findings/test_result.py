@@ -1,7 +1,11 @@
 class TestResult(object):
-    def __init__(self, name, statistic, pvalue, dof=None, expected=None):
+    def __init__(self, name, statistic, pvalue, dof=None, expected=None, adjusted_pvalue=None, confidence_interval=None):
         self.name = name
         self.statistic = statistic
         self.pvalue = pvalue
         self.dof = dof
-        self.expected = expected
\ No newline at end of file
+        self.expected = expected
+        # pvalue corrected for multiple testing, when the test is part of a family of tests.
+        self.adjusted_pvalue = adjusted_pvalue
+        # (lower, upper) bounds of the effect size, for the tests computing them by resampling.
+        self.confidence_interval = confidence_interval
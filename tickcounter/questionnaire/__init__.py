@@ -1,23 +1,34 @@
 from .description import Description
 from .encoder import Encoder
+from .encoding_plan import EncodingPlan
 from .jsonencoder import JSONEncoder
 from .multiencoder import MultiEncoder
 from .questionnaire import Questionnaire
 from .scoring import Scoring
+from .scoring_matrix import ScoringMatrix
 from .label import Label
 from .generate_json_encoding import generate_json_encoding
 from .interval_label import IntervalLabel
 from .quartile_label import QuartileLabel
+from .sketch import ValueCountSketch, KLLSketch
+from .stream import ScoreStream
+from .pipeline import CompiledPipeline
 
 __all__ = [
     "Description",
     "Encoder",
+    "EncodingPlan",
     "JSONEncoder",
     "MultiEncoder",
     "Questionnaire",
     "Scoring",
+    "ScoringMatrix",
     "Label",
     "generate_json_encoding",
     "IntervalLabel",
     "QuartileLabel",
+    "ValueCountSketch",
+    "KLLSketch",
+    "ScoreStream",
+    "CompiledPipeline",
 ]
\ No newline at end of file
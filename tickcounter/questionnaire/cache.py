@@ -0,0 +1,55 @@
+class DependencyCache(object):
+    """
+    Cache of computed values with explicit dependencies between entries.
+
+    Each entry is stored under a hashable key together with the keys it was computed from.
+    Invalidating a key removes it and, recursively, every entry depending on it, while
+    unrelated entries are kept.
+    """
+    def __init__(self):
+        self._values = dict()
+        self._depends_on = dict()
+        self._dependents = dict()
+
+    def get(self, key, compute, depends_on=()):
+        """
+        Return the value cached under key, calling compute() to fill it in if it is missing.
+        """
+        if key not in self._values:
+            self.set(key, compute(), depends_on)
+        return self._values[key]
+
+    def set(self, key, value, depends_on=()):
+        # Setting a key replaces its value, so whatever was computed from the old value goes away.
+        self.invalidate(key)
+        self._values[key] = value
+        self._depends_on[key] = tuple(depends_on)
+        for i in depends_on:
+            self._dependents.setdefault(i, set()).add(key)
+
+    def update(self, key, value):
+        # Replace the value of key in place, keeping its dependencies and its dependents.
+        self._values[key] = value
+
+    def invalidate(self, key):
+        for i in list(self._dependents.pop(key, ())):
+            self.invalidate(i)
+
+        for i in self._depends_on.pop(key, ()):
+            if i in self._dependents:
+                self._dependents[i].discard(key)
+        self._values.pop(key, None)
+
+    def clear(self):
+        self._values = dict()
+        self._depends_on = dict()
+        self._dependents = dict()
+
+    def keys(self):
+        return list(self._values.keys())
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __getitem__(self, key):
+        return self._values[key]
@@ -1,7 +1,55 @@
+import numpy as np
 import pandas as pd
 import warnings
 from ..util import generate_name
 
+def _compile_encoding(encoding):
+    """
+    Compile an encoding dictionary into a lookup table.
+
+    Returns a tuple of (targets, values), where targets is a pandas Index of the
+    dictionary keys and values is a NumPy array holding the encoded value at the
+    same position. values has int64 or float64 dtype if every encoded value is an
+    integer or every encoded value is a non-missing float, otherwise it has object
+    dtype. targets is None if the keys cannot be looked up safely (empty,
+    duplicated after hashing, missing values or booleans), in which case
+    Series.replace is used.
+    """
+    keys = list(encoding.keys())
+    encoded = list(encoding.values())
+    targets = pd.Index(keys) if len(keys) > 0 else None
+    if targets is not None and (not targets.is_unique or targets.hasnans or any(isinstance(i, (bool, np.bool_)) for i in keys)):
+        targets = None
+
+    is_int = lambda x: isinstance(x, (int, np.integer)) and not isinstance(x, (bool, np.bool_))
+    is_float = lambda x: isinstance(x, (float, np.floating))
+    values = None
+    try:
+        if len(encoded) > 0 and all(is_int(i) for i in encoded):
+            values = np.array(encoded, dtype=np.int64)
+        elif len(encoded) > 0 and all(is_float(i) for i in encoded) and not any(np.isnan(encoded)):
+            values = np.array(encoded, dtype=np.float64)
+    except OverflowError:
+        values = None
+
+    if values is None:
+        values = np.empty(len(encoded), dtype=object)
+        values[:] = encoded
+
+    return targets, values
+
+# Number of cells looked up per call of Index.get_indexer, which needs several times the memory
+# of its input. Looking up larger blocks in pieces keeps the extra memory bounded.
+_LOOKUP_CHUNK = 1 << 16
+
+def _lookup_codes(targets, block):
+    # Position in targets of each cell of the 2-D block, -1 for cells not found.
+    cells = block.ravel(order='F')
+    codes = np.empty(len(cells), dtype=np.intp)
+    for start in range(0, len(cells), _LOOKUP_CHUNK):
+        codes[start:start + _LOOKUP_CHUNK] = targets.get_indexer(cells[start:start + _LOOKUP_CHUNK])
+    return codes.reshape(block.shape, order='F')
+
 class Encoder(object):
     name_generator = generate_name("encoder")
 
@@ -38,6 +86,16 @@ class Encoder(object):
         else:
             self.name = name
     
+    def __getstate__(self):
+        # self.target is a view of the encoding keys, which cannot be pickled.
+        state = self.__dict__.copy()
+        del state['target']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.target = self.encoding.keys()
+
     def invert(self):
         encode_item = sorted(self.encoding.items(), key=lambda x:x[1], reverse=True)
         target = [i for i, j in encode_item]
@@ -46,13 +104,8 @@ class Encoder(object):
         
     
     def transform(self, data, *, columns=None, ignore_list=None, return_rule=False, mode='any'):
-        result = data.copy()
-
         if isinstance(data, pd.Series):
-            result.replace(self.encoding, inplace=True)
-            if self.default is not None:
-                result.fillna(self.default, inplace=True)
-            return result
+            return self._encode_frame(data.to_frame()).iloc[:, 0].rename(data.name)
         
         elif isinstance(data, pd.DataFrame):
             encode_rule = pd.Series(index=data.columns, dtype=str)
@@ -60,35 +113,24 @@ class Encoder(object):
             if ignore_list is None:
                 ignore_list = []
 
-            # TODO: Rewrite this section
-            for i in result.columns:
+            # Columns are only selected here, the encoding is done in one pass afterward.
+            for i in data.columns:
                 if i in ignore_list:
                     continue
 
                 if columns is not None:
                     if i in columns:
-                        result[i] = result[i].replace(self.encoding)
-                        if self.default is not None:
-                            result[i] = result[i].fillna(self.default)
                         encode_rule[i] = self.name
 
-                else:
-                    unique_values = result[i].value_counts().index
-                    if mode == "strict":
-                        if len(set(unique_values) ^ set(self.encoding.keys())) == 0:
-                            result[i] = result[i].replace(self.encoding)
-                            if self.default is not None:
-                                result[i] = result[i].fillna(self.default)
-                            encode_rule[i] = self.name
-                    elif mode == "any":
-                        if len(set(unique_values) - set(self.encoding.keys())) == 0:
-                            result[i] = result[i].replace(self.encoding)
-                            if self.default is not None:
-                                result[i] = result[i].fillna(self.default)
-                            encode_rule[i] = self.name
-                    else:
-                        raise ValueError("rule argument can only be strict or any")
-            
+                elif self._match(data[i], mode):
+                    encode_rule[i] = self.name
+
+            selected = encode_rule.dropna().index
+            if len(selected) > 0:
+                result = self._encode_frame(data, columns=selected)
+            else:
+                result = data.copy()
+
             if return_rule:
                 return (result, encode_rule)
 
@@ -97,6 +139,132 @@ class Encoder(object):
         else:
             raise TypeError(f"Expected pandas Series or DataFrame, got {type(data)} instead")
     
+    def _match(self, data, mode='any'):
+        # Whether the values of the Series data are all in the encoding (mode 'any'), or are exactly its keys (mode 'strict').
+        unique_values = data.value_counts().index
+        if mode == "strict":
+            return len(set(unique_values) ^ set(self.encoding.keys())) == 0
+        elif mode == "any":
+            return len(set(unique_values) - set(self.encoding.keys())) == 0
+        else:
+            raise ValueError("rule argument can only be strict or any")
+
+    @property
+    def lookup(self):
+        """
+        Lookup table compiled from the encoding, see _compile_encoding.
+
+        The table is compiled once and recompiled only when self.encoding is replaced,
+        for example by invert(). Mutating the encoding dict in place is not detected.
+        """
+        cached = getattr(self, '_lookup', None)
+        if cached is None or cached[0] is not self.encoding:
+            cached = (self.encoding, *_compile_encoding(self.encoding))
+            self._lookup = cached
+        return cached[1], cached[2]
+
+    def _replace(self, data):
+        # Reference implementation, used for dtypes the lookup table does not handle.
+        result = data.replace(self.encoding)
+        if self.default is not None:
+            result = result.fillna(self.default)
+        return result
+
+    def _encode_frame(self, data, columns=None, *, only_encoded=False):
+        """
+        Encode the given columns of a DataFrame (all columns if None), equivalent to calling
+        replace(self.encoding) followed by fillna(self.default) on each of them, including the
+        resulting dtypes. Other columns are returned unchanged, or left out if only_encoded is
+        True, in which case the input is not copied.
+
+        Columns sharing a dtype are looked up together as one 2-D block.
+        """
+        columns = data.columns if columns is None else columns
+        targets, values = self.lookup
+        if targets is None or not data.columns.is_unique:
+            if only_encoded:
+                return pd.concat([self._replace(data[col]) for col in columns], axis=1, keys=columns)
+
+            result = data.copy()
+            for col in columns:
+                result[col] = self._replace(data[col])
+            return result
+
+        encoded = dict()
+        blocks = dict()
+        for col in columns:
+            dtype = data[col].dtype
+            if dtype == np.dtype(object) or dtype == np.dtype(np.int64) or dtype == np.dtype(np.float64):
+                blocks.setdefault(dtype, []).append(col)
+            else:
+                encoded[col] = self._replace(data[col])
+
+        for dtype, cols in blocks.items():
+            block = data[cols].to_numpy()
+            codes = _lookup_codes(targets, block)
+            if dtype == np.dtype(object):
+                encoded.update(self._encode_object_block(block, codes, cols, data.index))
+            else:
+                encoded.update(self._encode_numeric_block(block, codes, cols, data.index))
+
+        if only_encoded:
+            return pd.DataFrame({col: encoded[col] for col in columns}, index=data.index, columns=columns, copy=False)
+
+        return pd.DataFrame({col: encoded[col] if col in encoded else data[col] for col in data.columns},
+                            index=data.index, columns=data.columns)
+
+    def _fill_numeric(self):
+        return self.default is None or \
+               (isinstance(self.default, (int, float, np.integer, np.floating)) and not isinstance(self.default, (bool, np.bool_)))
+
+    def _encode_numeric_block(self, block, codes, columns, index):
+        targets, values = self.lookup
+        # Series.replace keeps int64 columns as int64 when the encoded values fit, so only
+        # the combinations with a fixed result dtype are handled here.
+        if values.dtype == object or not self._fill_numeric() or (block.dtype.kind == 'i' and values.dtype.kind == 'f'):
+            return {col: self._replace(pd.Series(block[:, j], index=index, name=col)) for j, col in enumerate(columns)}
+
+        mapped = codes >= 0
+        result = block.astype(block.dtype, order='F')
+        result[mapped] = values[codes[mapped]]
+        if self.default is not None and result.dtype.kind == 'f':
+            result[np.isnan(result)] = self.default
+        return {col: result[:, j] for j, col in enumerate(columns)}
+
+    def _encode_object_block(self, block, codes, columns, index):
+        targets, values = self.lookup
+        mapped = codes >= 0
+        # Only the cells without a match need to be checked for missing values.
+        unmatched_row, unmatched_col = np.nonzero(~mapped)
+        is_missing = pd.isna(block[unmatched_row, unmatched_col])
+        has_missing = np.bincount(unmatched_col[is_missing], minlength=block.shape[1]) > 0
+        # Columns with values outside the encoding keep those values and need dtype inference.
+        clean = np.bincount(unmatched_col[~is_missing], minlength=block.shape[1]) == 0
+        if values.dtype == object or not self._fill_numeric():
+            clean[:] = False
+
+        result = dict()
+        float_values = values.astype(np.float64) if values.dtype != object else None
+        object_values = values.astype(object)
+        for j, col in enumerate(columns):
+            if clean[j] and not has_missing[j]:
+                result[col] = values.take(codes[:, j])
+
+            elif clean[j]:
+                encoded = float_values.take(codes[:, j])
+                encoded[~mapped[:, j]] = np.nan if self.default is None else self.default
+                result[col] = encoded
+
+            else:
+                encoded = block[:, j].copy()
+                encoded[mapped[:, j]] = object_values.take(codes[mapped[:, j], j])
+                encoded = pd.Series(encoded, index=index, name=col).infer_objects()
+                if self.default is not None:
+                    encoded = encoded.fillna(self.default)
+                result[col] = encoded
+
+        return result
+
     def count_neutral(self, data, **kwargs):
         if self.neutral is not None:
             if isinstance(data, pd.Series):
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import warnings
+
+class EncodingPlan(object):
+  """
+  Column to encoder assignment compiled for repeated use.
+
+  Columns sharing an encoder are grouped, so each group is encoded as one 2-D block with a
+  single lookup. No value is inspected to decide which encoder to use.
+
+  Parameters
+  ----------
+  rules : dict
+      Mapping from encoder name to Encoder object, as in MultiEncoder.rules.
+  rule_map : dict or pandas.Series
+      Mapping from column name to encoder name (or Encoder object). Columns mapped to a
+      missing value are left unchanged, so the rule returned by MultiEncoder.transform
+      with return_rule=True can be passed directly.
+  """
+  def __init__(self, rules, rule_map):
+    if isinstance(rule_map, pd.Series):
+      rule_map = rule_map.dropna().to_dict()
+    
+    elif not isinstance(rule_map, dict):
+      raise TypeError(f"Expected dict or pandas Series for rule_map, got {type(rule_map)} instead")
+
+    self.encoders = dict()
+    self.rule_map = dict()
+    for col, rule in rule_map.items():
+      if rule is None:
+        continue
+
+      name = getattr(rule, 'name', rule)
+      if name not in rules and not hasattr(rule, 'name'):
+        raise ValueError(f"Unknown encoder {rule} for column {col}")
+      
+      self.encoders[name] = rule if hasattr(rule, 'name') else rules[name]
+      self.rule_map[col] = name
+    
+    self.groups = dict()
+    for col, name in self.rule_map.items():
+      self.groups.setdefault(name, []).append(col)
+
+  @property
+  def columns(self):
+    return list(self.rule_map.keys())
+
+  def rule(self, columns):
+    # Same format as the rule returned by Encoder.transform and MultiEncoder.transform.
+    encode_rule = pd.Series(dtype=str, index=columns)
+    for col, name in self.rule_map.items():
+      if col in encode_rule.index:
+        encode_rule[col] = name
+    return encode_rule
+
+  def _encode_groups(self, data):
+    # Yield (encoder name, columns, encoded DataFrame) for each group of columns in the DataFrame data.
+    missing = [col for col in self.rule_map if col not in data.columns]
+    if len(missing) > 0:
+      raise ValueError(f"Columns {missing} in rule_map are not found in data")
+
+    for name, cols in self.groups.items():
+      yield name, cols, self.encoders[name]._encode_frame(data, cols, only_encoded=True)
+
+  def encode(self, data):
+    """
+    Return only the encoded columns of the DataFrame data, in the order of rule_map.
+    The other columns are neither copied nor returned.
+    """
+    encoded = dict()
+    for name, cols, encoded_df in self._encode_groups(data):
+      for col in cols:
+        encoded[col] = encoded_df[col]
+    return pd.DataFrame(encoded, index=data.index, columns=self.columns, copy=False)
+
+  def tally(self, data):
+    """
+    Count per row the neutral, default filled and missing values of the encoded columns.
+
+    Each group of columns is encoded once and counted with one vectorized comparison,
+    without assembling the encoded DataFrame.
+
+    Returns a DataFrame with columns 'Neutral count', 'Default count' and 'Missing count'.
+    'Neutral count' only includes encoders with neutral specified, and is missing if there
+    is no such encoder (a warning is issued for each encoder without neutral).
+    """
+    if isinstance(data, pd.Series):
+      data = data.to_frame()
+
+    neutral = None
+    default = np.zeros(len(data), dtype=np.int64)
+    missing = np.zeros(len(data), dtype=np.int64)
+    for name, cols, encoded_df in self._encode_groups(data):
+      encoder = self.encoders[name]
+      if encoder.neutral is not None:
+        count = (encoded_df == encoder.neutral).to_numpy().sum(axis=1)
+        neutral = count if neutral is None else neutral + count
+      
+      else:
+        warnings.warn(f"Encoder {name} does not have neutral argument specified, count_neutral will return None")
+      
+      if encoder.default is not None:
+        default += data[cols].isna().to_numpy().sum(axis=1)
+      missing += encoded_df.isna().to_numpy().sum(axis=1)
+    
+    return pd.DataFrame({
+      'Neutral count': neutral if neutral is not None else np.nan,
+      'Default count': default,
+      'Missing count': missing,
+    }, index=data.index)
+
+  def transform(self, data, *, return_rule=False):
+    if isinstance(data, pd.Series):
+      result = data.copy()
+      if data.name in self.rule_map:
+        result = self.encoders[self.rule_map[data.name]].transform(data)
+      encode_rule = self.rule([data.name])
+
+    elif isinstance(data, pd.DataFrame):
+      encoded = dict()
+      for name, cols, encoded_df in self._encode_groups(data):
+        for col in cols:
+          encoded[col] = encoded_df[col]
+
+      if data.columns.is_unique:
+        result = pd.DataFrame({col: encoded[col] if col in encoded else data[col] for col in data.columns},
+                              index=data.index, columns=data.columns)
+      
+      else:
+        result = data.copy()
+        for col, ss in encoded.items():
+          result[col] = ss
+      encode_rule = self.rule(data.columns)
+    
+    else:
+      raise TypeError(f"Expected pandas Series or DataFrame, got {type(data)} instead")
+    
+    if return_rule:
+      return (result, encode_rule)
+    
+    else:
+      return result
@@ -1,17 +1,48 @@
+import numpy as np
 import pandas as pd
 from tickcounter.questionnaire import Label
 from ..util import generate_name
 
 class IntervalLabel(Label):
+    """
+    Label each score with the name of the closed interval [lower, upper] containing it.
+
+    The intervals are compiled once into sorted edges, so that labeling is a single
+    np.searchsorted over the scores, returning a Categorical with the labels ordered as the
+    intervals. Scores falling in a gap between the intervals, or missing, are left missing.
+    Overlapping intervals are rejected.
+    """
+    row_local = True
+
     def __init__(self, label_rule, name=None):
         self.label_rule = label_rule
-        super().__init__(self.generate_label_function(self.label_rule), name)
-    
-    def generate_label_function(self, label_rule):
+        self.lower, self.upper, self.categories = self.compile(label_rule)
+        super().__init__(self.generate_label_function(self.lower, self.upper, self.categories), name)
+
+    @staticmethod
+    def compile(label_rule):
+        """
+        Return the lower and upper edges of the intervals of label_rule, sorted, and their labels.
+        """
+        rules = sorted(label_rule.items(), key=lambda i: tuple(i[1]))
+        lower = np.array([i[1][0] for i in rules], dtype=np.float64)
+        upper = np.array([i[1][1] for i in rules], dtype=np.float64)
+        for label, (low, high) in rules:
+            if not low <= high:
+                raise ValueError(f"Interval {[low, high]} of label {label} is empty")
+        overlap = np.flatnonzero(lower[1:] <= upper[:-1])
+        if len(overlap) > 0:
+            i = overlap[0]
+            raise ValueError(f"Intervals of labels {rules[i][0]} and {rules[i + 1][0]} overlap")
+        return lower, upper, pd.Index([i[0] for i in rules])
+
+    def generate_label_function(self, lower, upper, categories):
         def label(data, score_col):
             # Only support numerical pandas series, will support multiple score_col in the future
-            label_ss = pd.Series(index=data.index, dtype=str)
-            for label, interval in label_rule.items():
-                label_ss[data[score_col].between(*interval)] = label
-            return label_ss
-        return label
\ No newline at end of file
+            score = data[score_col].to_numpy(dtype=np.float64)
+            codes = np.searchsorted(lower, score, side='right') - 1
+            # Missing scores are sorted after every edge, and are not below the last upper edge.
+            inside = (codes >= 0) & (score <= upper[np.maximum(codes, 0)])
+            codes = np.where(inside, codes, -1)
+            return pd.Series(pd.Categorical.from_codes(codes, categories, ordered=True), index=data.index)
+        return label
@@ -1,5 +1,86 @@
+from pathlib import Path
+import json
+import yaml
 import pandas as pd
 
-class JSONEncoder(object):
-  # Encode using JSON, create a MultiEncoder with needed Encoder objects under the hood.
-  pass
\ No newline at end of file
+from tickcounter.questionnaire import Encoder
+from .multiencoder import MultiEncoder
+
+_SPEC_KEYS = {'encoding', 'neutral', 'default'}
+
+class JSONEncoder(MultiEncoder):
+  """
+  MultiEncoder loaded from a {column: {"encoding": {value: code}, "neutral": ..., "default": ...}}
+  spec, as written by generate_json_encoding, given as a dict or a .json, .yaml or .yml file.
+
+  Columns with identical encoding, neutral and default share a single Encoder, and the column
+  to encoder assignment of the spec is compiled once into an EncodingPlan (self.plan). The
+  columns are then encoded by the plan, grouped by encoder, instead of being matched against
+  the encoders by their values. Passing rule_map to transform still overrides the plan.
+
+  Keys of a JSON spec are always strings, so the values to encode must be strings too. With
+  dtype, the codes, neutral and default are converted with it, like the str written by
+  generate_json_encoding by default.
+  """
+  def __init__(self, spec, *, dtype=None, cache=False):
+    if isinstance(spec, (str, Path)):
+      spec = self._read(Path(spec))
+
+    if not isinstance(spec, dict):
+      raise TypeError(f"Expected dict or path of the encoding spec, got {type(spec)} instead")
+
+    if len(spec) == 0:
+      raise ValueError("The encoding spec has no column")
+
+    cast = (lambda x: x) if dtype is None else (lambda x: None if x is None else dtype(x))
+    encoders = dict()
+    rule_map = dict()
+    for col, entry in spec.items():
+      if not isinstance(entry, dict) or not isinstance(entry.get('encoding'), dict) or len(entry['encoding']) == 0:
+        raise ValueError(f"Column {col} needs a non-empty 'encoding' dict in the spec")
+
+      unknown = set(entry.keys()) - _SPEC_KEYS
+      if len(unknown) > 0:
+        raise ValueError(f"Unknown keys {sorted(unknown)} for column {col} in the spec")
+
+      encoding = {value: cast(code) for value, code in entry['encoding'].items()}
+      neutral, default = cast(entry.get('neutral')), cast(entry.get('default'))
+      key = (frozenset(encoding.items()), neutral, default)
+      if key not in encoders:
+        encoders[key] = Encoder(encoding, neutral=neutral, default=default)
+      rule_map[col] = encoders[key].name
+
+    super().__init__(list(encoders.values()), cache=cache)
+    self.plan = self.compile(rule_map)
+
+  @staticmethod
+  def _read(filepath):
+    if filepath.suffix == '.json':
+      with open(filepath, "r") as stream:
+        return json.load(stream)
+
+    elif filepath.suffix == '.yaml' or filepath.suffix == '.yml':
+      with open(filepath, "r") as stream:
+        return yaml.safe_load(stream)
+
+    else:
+      raise ValueError(f"Expected a .json, .yaml or .yml file, got {filepath}")
+
+  def _plan(self, data, rule_map=None, ignore_list=None, mode="any"):
+    # The plan of the spec, restricted to the columns of data and not in ignore_list.
+    if rule_map is not None:
+      return super()._plan(data, rule_map, ignore_list, mode)
+
+    if isinstance(data, pd.DataFrame):
+      columns = data.columns
+    elif isinstance(data, pd.Series):
+      columns = [data.name]
+    else:
+      raise TypeError(f"Expected pandas Series or DataFrame, got {type(data)} instead")
+
+    ignore_list = set() if ignore_list is None else set(ignore_list)
+    present = set(columns)
+    if len(ignore_list) == 0 and all(col in present for col in self.plan.rule_map):
+      return self.plan
+
+    return self.compile({col: self.plan.rule_map[col] for col in columns if col in self.plan.rule_map and col not in ignore_list})
@@ -1,8 +1,12 @@
 import pandas as pd
+import warnings
 from ..util import generate_name
+from .sketch import ValueCountSketch
 
 class Label(object):
   name_generator = generate_name("label")
+  # True if the label of a row only depends on that row, so it can be computed on any subset of rows.
+  row_local = False
 
   def __init__(self, label_function, name=None):
     self.label_function = label_function
@@ -10,5 +14,22 @@ class Label(object):
     if self.name is None:
       self.name = next(Label.name_generator)
   
-  def label(self, data, score_col, **kwargs):
-    return self.label_function(data, score_col, **kwargs)
\ No newline at end of file
+  def label(self, data, score_col, weights=None, **kwargs):
+    # With weights, each row counts as its weight in the population the label is computed from.
+    if weights is not None and not self.row_local:
+      if not self._can_freeze():
+        warnings.warn(f"Label {self.name} cannot be computed from weighted scores, the rows are labeled without their weights")
+      else:
+        sketch = ValueCountSketch().update(data[score_col], weights)
+        return self.freeze(sketch).label(data, score_col, **kwargs)
+    return self.label_function(data, score_col, **kwargs)
+
+  def _can_freeze(self):
+    # Whether freeze can compute the label from a sketch of the scores.
+    return self.row_local or type(self).freeze is not Label.freeze
+
+  def freeze(self, sketch):
+    # Labels that only look at their own row need nothing from the other rows.
+    if self.row_local:
+      return self
+    raise ValueError(f"Label {self.name} depends on the whole population and cannot be computed from a sketch")
\ No newline at end of file
@@ -2,9 +2,10 @@ import pandas as pd
 from ..util import generate_name
 
 from tickcounter.questionnaire import Encoder
+from .encoding_plan import EncodingPlan
 
 class MultiEncoder(object):
-  def __init__(self, encoding_rule):
+  def __init__(self, encoding_rule, *, cache=False):
     if isinstance(encoding_rule, Encoder):
       self.rules = {
         encoding_rule.name: encoding_rule
@@ -22,94 +23,142 @@ class MultiEncoder(object):
     
     else:
       raise ValueError(f"Expected list of encoder or dictionary objects, got {type(encoding_rule)} instead")
+
+    # If cache is True, the detected rules are reused for frames with the same columns and dtypes,
+    # so the values of later frames are not checked again.
+    self.cache = cache
+    self._rule_cache = dict()
+    self._match_index = None
+
+  def _build_match_index(self):
+    """
+    Build an inverted index from each target value to the rules containing it.
+
+    Rules are represented by bits of an integer in the order of self.rules, so matching
+    a column against every rule is a bitwise AND over the column's unique values.
+    """
+    names = list(self.rules.keys())
+    value_mask = dict()
+    size_mask = dict()
+    for bit, name in enumerate(names):
+      target = frozenset(self.rules[name].target)
+      for value in target:
+        value_mask[value] = value_mask.get(value, 0) | (1 << bit)
+      size_mask[len(target)] = size_mask.get(len(target), 0) | (1 << bit)
+    
+    self._match_index = (tuple(names), value_mask, size_mask)
+    return self._match_index
+
+  def _match(self, data, mode):
+    # Return the name of the first rule matching the values of the Series data, or None.
+    if mode not in ("strict", "any"):
+      raise ValueError("rule argument can only be strict or any")
+
+    if self._match_index is None or self._match_index[0] != tuple(self.rules.keys()):
+      self._build_match_index()
+    names, value_mask, size_mask = self._match_index
+
+    unique_values = pd.unique(data)
+    unique_values = unique_values[~pd.isna(unique_values)]
+    mask = (1 << len(names)) - 1
+    for value in unique_values:
+      mask &= value_mask.get(value, 0)
+      if mask == 0:
+        return None
+    
+    if mode == "strict":
+      mask &= size_mask.get(len(set(unique_values)), 0)
+    
+    if mask == 0:
+      return None
+    
+    return names[(mask & -mask).bit_length() - 1]
+
+  def _detect(self, data, ignore_list, mode):
+    # Compile the plan for the DataFrame data by matching each column against the rules.
+    key = None
+    if self.cache:
+      key = (tuple(data.columns), tuple(data.dtypes.astype(str)), mode, frozenset(ignore_list or []))
+      if key in self._rule_cache:
+        return self._rule_cache[key]
+    
+    rule_map = dict()
+    for i in data.columns:
+      if ignore_list is not None and i in ignore_list:
+        continue
+      
+      rule = self._match(data[i], mode)
+      if rule is not None:
+        rule_map[i] = rule
+    
+    plan = EncodingPlan(self.rules, rule_map)
+    if self.cache:
+      self._rule_cache[key] = plan
+    return plan
+
+  def clear_cache(self):
+    self._rule_cache = dict()
+
+  def compile(self, rule_map):
+    """
+    Compile a column to encoder assignment into an EncodingPlan.
+
+    The plan can be reused on any number of frames and skips the value based detection.
+
+    Parameters
+    ----------
+    rule_map : dict or pandas.Series
+        Mapping from column name to the name of an encoder in self.rules (or an Encoder object).
+    """
+    return EncodingPlan(self.rules, rule_map)
     
   def transform(self, data,*, rule_map=None, columns=None, ignore_list=None, return_rule=False, mode="any"):
-    result = data.copy()
-    encode_rule = None
-    if isinstance(data, pd.DataFrame):
-      encode_rule = pd.Series(dtype=str, index=data.columns)
-      if rule_map is None:
-        for i in result.columns:
-          if ignore_list is not None and i in ignore_list:
-            continue
-
-          else:
-            unique_values = result[i].value_counts().index
-            for rule in self.rules.values():
-              if mode == "strict":
-                if len(set(unique_values) ^ set(rule.target)) == 0:
-                  result[i] = rule.transform(result[i])
-                  encode_rule[i] = rule.name
-                  break
-              elif mode == "any":
-                if len(set(unique_values) - set(rule.target)) == 0:
-                  result[i] = rule.transform(result[i])
-                  encode_rule[i] = rule.name
-                  break
-              else:
-                raise ValueError("rule argument can only be strict or any")
-      else:
-        # Check for correct format for rule_map
-        # Transform according to the rules
-        pass
+    plan = self._plan(data, rule_map, ignore_list, mode)
+    return plan.transform(data, return_rule=return_rule)
 
-    elif isinstance(data, pd.Series):
-      encode_rule = pd.Series(dtype=str, index=[data.name])
-      unique_values = result.value_counts().index
-      for rule in self.rules.values():
-        if mode == "strict":
-          if len(set(unique_values) ^ set(rule.target)) == 0:
-            result = rule.transform(result)
-            encode_rule[data.name] = rule.name
-            break
-        elif mode == "any":
-          if len(set(unique_values) - set(rule.target)) == 0:
-            result = rule.transform(result)
-            encode_rule[data.name] = rule.name
-            break
-        else:
-          raise ValueError("rule argument can only be strict or any")
+  def _plan(self, data, rule_map=None, ignore_list=None, mode="any"):
+    # The EncodingPlan transform would use for data.
+    if isinstance(rule_map, EncodingPlan):
+      return rule_map
 
+    elif rule_map is not None:
+      return self.compile(rule_map)
+    
+    elif isinstance(data, pd.DataFrame):
+      return self._detect(data, ignore_list, mode)
+    
+    elif isinstance(data, pd.Series):
+      rule = self._match(data, mode)
+      return self.compile({data.name: rule} if rule is not None else {})
+    
     else: 
       raise TypeError(f"Expected pandas Series or DataFrame, got {type(data)} instead")
-    
+
+  def tally(self, data, *, rule_map=None, ignore_list=None, return_rule=False, mode="any", columns=None):
+    """
+    Count per row the neutral, default filled and missing values of the encoded columns,
+    encoding each column only once. See EncodingPlan.tally.
+    """
+    plan = self._plan(data, rule_map, ignore_list, mode)
+    total = plan.tally(data)
     if return_rule:
-      return (result, encode_rule)
+      return (total, plan.rule(data.columns if isinstance(data, pd.DataFrame) else [data.name]))
     
     else:
-      return result
+      return total
+
+  def count_neutral(self, data, *, rule_map=None, ignore_list=None, return_rule=False, mode="any", columns=None):
+    plan = self._plan(data, rule_map, ignore_list, mode)
+    total = plan.tally(data)['Neutral count']
+    # None will result if there is no neutral specified
+    if all(plan.encoders[name].neutral is None for name in plan.groups):
+      total = None
     
-  def count_neutral(self, data, **kwargs):
-    # Might need to refactor this
-    return_flag = False
-    if 'return_rule' in kwargs.keys() and kwargs['return_rule']:
-        return_flag = True
     else:
-        kwargs['return_rule'] = True
-
-    df_encoded, rule = self.transform(data, **kwargs)
-    total = None
-    if isinstance(data, pd.DataFrame) or isinstance(data, pd.Series):
-      for col, encoder in rule.dropna().iteritems():
-        # Need to rewrite this. We transform the thing twice to get the count of neutral! 
-        ss_tally = self.rules[encoder].count_neutral(data[col] if isinstance(data, pd.DataFrame) else data)
-        # If encoder does not have neutral, it will return None
-        if ss_tally is not None:
-          if total is None:
-            total = pd.DataFrame([ss_tally]).T
-          
-          else:
-            total = pd.concat([total, ss_tally], axis=1)
-        else:
-          continue
-      
-      # None will result if there is no neutral specified
-      if total is not None:
-        total = total.sum(axis=1)
-        total.rename("Neutral count", inplace=True)
+      total = total.astype(int).rename("Neutral count")
     
-    if return_flag:
-      return (total, rule)
+    if return_rule:
+      return (total, plan.rule(data.columns if isinstance(data, pd.DataFrame) else [data.name]))
     
     else:
-      return total
\ No newline at end of file
+      return total
@@ -0,0 +1,229 @@
+import json
+import struct
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from .description import Description
+from .encoder import Encoder
+from .scoring import Scoring
+from .scoring_matrix import ScoringMatrix
+from .interval_label import IntervalLabel
+from .quartile_label import QuartileLabel
+
+_MAGIC = b"TCPIPE\x00\x01"
+# Position of the header and of every array in the file is a multiple of this, so the arrays
+# can be used in place from a memory map.
+_ALIGN = 64
+
+def _aligned(size):
+    return -(-size // _ALIGN) * _ALIGN
+
+def _scalar(x):
+    # Python scalar of a NumPy one, to be written in the JSON header.
+    return x.item() if isinstance(x, np.generic) else x
+
+def _pack(obj):
+    # JSON form of obj keeping the type of the dict keys, each dict being written as its pairs.
+    if isinstance(obj, dict):
+        return {'items': [[_pack(k), _pack(v)] for k, v in obj.items()]}
+    elif isinstance(obj, (list, tuple)):
+        return [_pack(i) for i in obj]
+    return _scalar(obj)
+
+def _unpack(obj):
+    if isinstance(obj, dict):
+        return {tuple(k) if isinstance(k, list) else k: v for k, v in ((_unpack(k), _unpack(v)) for k, v in obj['items'])}
+    elif isinstance(obj, list):
+        return [_unpack(i) for i in obj]
+    return obj
+
+def _compile_encoder(encoder, prefix, arrays):
+    targets, values = encoder.lookup
+    if targets is None or values.dtype == object:
+        raise ValueError(f"Encoder {encoder.name} needs unique, non-missing keys and numeric values to be compiled")
+    keys = [_scalar(i) for i in targets]
+    if not all(isinstance(i, (str, int, float)) for i in keys):
+        raise ValueError(f"Encoder {encoder.name} has keys that are not strings or numbers and cannot be compiled")
+    arrays[f"{prefix} values"] = values
+    return {'name': encoder.name, 'targets': keys, 'default': _scalar(encoder.default), 'neutral': _scalar(encoder.neutral)}
+
+def _compile_label(label, prefix, arrays):
+    if isinstance(label, IntervalLabel):
+        arrays[f"{prefix} lower"], arrays[f"{prefix} upper"] = label.lower, label.upper
+        return {'kind': 'interval', 'name': label.name, 'categories': _pack(list(label.categories))}
+    elif isinstance(label, QuartileLabel):
+        if label.bins is not None:
+            arrays[f"{prefix} bins"] = np.asarray(label.bins, dtype=np.float64)
+        q = label.q if isinstance(label.q, (int, np.integer)) else list(label.q)
+        return {'kind': 'quartile', 'name': label.name, 'q': _pack(q), 'labels': _pack(label.labels), 'error': label.error}
+    raise ValueError(f"Label {label.name} is computed by a function and cannot be compiled")
+
+def _build_label(spec, prefix, arrays):
+    if spec['kind'] == 'interval':
+        lower, upper = arrays[f"{prefix} lower"].tolist(), arrays[f"{prefix} upper"].tolist()
+        categories = [tuple(i) if isinstance(i, list) else i for i in _unpack(spec['categories'])]
+        return IntervalLabel(dict(zip(categories, zip(lower, upper))), name=spec['name'])
+    bins = arrays.get(f"{prefix} bins")
+    return QuartileLabel(_unpack(spec['q']), _unpack(spec['labels']), spec['name'], bins=bins, error=spec['error'])
+
+class CompiledPipeline(object):
+    """
+    Scorings, with their encoders and labels, and a Description, frozen into NumPy arrays and
+    a small JSON header, to be saved into one file (see save) and loaded in place from a
+    memory map (see load).
+
+    The file holds the column to encoder plan, the lookup table of each encoder, the
+    ScoringMatrix of the scorings and the edges of the labels, so loading it builds the objects
+    from their compiled form without deriving any of them again. Only IntervalLabel and
+    QuartileLabel can be compiled, labels computed by a function cannot be saved.
+
+    A CompiledPipeline is pickled as its header and arrays, so it can be sent to worker
+    processes, unlike the label functions it holds.
+    """
+    def __init__(self, scoring, description=None):
+        scoring = scoring if isinstance(scoring, list) else [scoring]
+        arrays = dict()
+        encoders = []
+        position = dict()
+        def encoder_index(encoder):
+            # Encoders shared by several scorings are saved once.
+            if id(encoder) not in position:
+                position[id(encoder)] = len(encoders)
+                encoders.append(_compile_encoder(encoder, f"encoder {len(encoders)}", arrays))
+            return position[id(encoder)]
+
+        scorings = []
+        for s, i in enumerate(scoring):
+            if i.encoding is not None and not isinstance(i.encoding, dict):
+                raise ValueError(f"Scoring {i.name} must have a dict of encoders to be compiled")
+            encoding = None if i.encoding is None else [[encoder_index(encoder), _pack(list(cols))] for encoder, cols in i.encoding.items()]
+            scorings.append({
+                'name': i.name,
+                'columns': _pack(list(i.columns)),
+                'encoding': encoding,
+                'weights': _pack(i.weights),
+                'reverse': _pack(i.reverse),
+                'scale': _pack(i.scale),
+                'method': i.method,
+                'min_answered': _scalar(i.min_answered),
+                'prorate': i.prorate,
+                'labels': [_compile_label(label, f"scoring {s} label {l}", arrays) for l, label in enumerate(i.labeling)],
+            })
+
+        matrix = ScoringMatrix(scoring)
+        arrays['matrix data'] = matrix.matrix.data
+        arrays['matrix indices'] = matrix.matrix.indices
+        arrays['matrix indptr'] = matrix.matrix.indptr
+        arrays['matrix total'] = matrix._total
+        if isinstance(description, Description):
+            description = description.descrip
+        header = {
+            'encoders': encoders,
+            'scorings': scorings,
+            'keys': [[None if encoder is None else encoder_index(encoder), _pack(col)] for encoder, col in matrix.keys],
+            'items': matrix._items,
+            'integral': matrix._integral,
+            'matrix shape': list(matrix.matrix.shape),
+            'description': None if description is None else _pack(description),
+        }
+        self._build(header, arrays)
+
+    def _build(self, header, arrays):
+        self.header = header
+        self.arrays = arrays
+        encoders = []
+        for i, spec in enumerate(header['encoders']):
+            values = arrays[f"encoder {i} values"]
+            encoder = Encoder(dict(zip(spec['targets'], values.tolist())), default=spec['default'], neutral=spec['neutral'], name=spec['name'])
+            # The saved lookup table, instead of compiling it again from the encoding.
+            encoder._lookup = (encoder.encoding, pd.Index(spec['targets']), values)
+            encoders.append(encoder)
+
+        self.scoring = []
+        for s, spec in enumerate(header['scorings']):
+            labels = [_build_label(label, f"scoring {s} label {l}", arrays) for l, label in enumerate(spec['labels'])]
+            encoding = None if spec['encoding'] is None else {encoders[i]: _unpack(cols) for i, cols in spec['encoding']}
+            self.scoring.append(Scoring(labels, encoding, name=spec['name'], columns=_unpack(spec['columns']) if encoding is None else None,
+                                        weights=_unpack(spec['weights']), reverse=_unpack(spec['reverse']), scale=_unpack(spec['scale']),
+                                        method=spec['method'], min_answered=spec['min_answered'], prorate=spec['prorate']))
+
+        self.matrix = ScoringMatrix.__new__(ScoringMatrix)
+        self.matrix.scoring = self.scoring
+        self.matrix.keys = [(None if i is None else encoders[i], _unpack(col)) for i, col in header['keys']]
+        self.matrix.matrix = sparse.csr_matrix((arrays['matrix data'], arrays['matrix indices'], arrays['matrix indptr']),
+                                               shape=tuple(header['matrix shape']))
+        self.matrix._items = header['items']
+        self.matrix._integral = header['integral']
+        self.matrix._total = arrays['matrix total']
+        self.description = None if header['description'] is None else Description(_unpack(header['description']))
+
+    def __getstate__(self):
+        # Arrays read from a memory map are copied into the pickle.
+        return {'header': self.header, 'arrays': {name: np.array(array) for name, array in self.arrays.items()}}
+
+    def __setstate__(self, state):
+        self._build(state['header'], state['arrays'])
+
+    def score(self, data):
+        """
+        Return the scores of data as a DataFrame, one column per scoring.
+        """
+        return self.matrix.score(data)
+
+    def process(self, data):
+        """
+        Return data with the scores and labels of every scoring, as Questionnaire.processed.
+        """
+        scored_data = pd.concat([data, self.score(data)], axis=1)
+        label_ss = [j.label(scored_data, i.score_col).rename(f"{i.name} - Label {j.name}") for i in self.scoring for j in i.labeling]
+        return pd.concat([scored_data, *label_ss], axis=1)
+
+    def save(self, path):
+        """
+        Write the pipeline to path: a magic number, the length of the JSON header, the header
+        with the dtype, shape and offset of each array, and the raw arrays.
+        """
+        arrays = {name: np.ascontiguousarray(array) for name, array in self.arrays.items()}
+        layout = dict()
+        size = 0
+        for name, array in arrays.items():
+            layout[name] = (array.dtype.str, array.shape, size)
+            size += _aligned(array.nbytes)
+        header = json.dumps({**self.header, 'arrays': layout}).encode('utf-8')
+        start = _aligned(len(_MAGIC) + 8 + len(header))
+
+        with open(path, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(start + layout[name][2])
+                f.write(array.tobytes())
+            f.truncate(start + size)
+
+    @staticmethod
+    def load(path, mmap=True):
+        """
+        Load the pipeline saved to path. With mmap, the arrays are read in place from a
+        read-only memory map of the file, so only the header is read when loading.
+        """
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not a compiled pipeline")
+            length, = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(length).decode('utf-8'))
+            start = _aligned(len(_MAGIC) + 8 + length)
+            if mmap:
+                buffer = np.memmap(path, dtype=np.uint8, mode='r')
+            else:
+                f.seek(0)
+                buffer = f.read()
+
+        layout = header.pop('arrays')
+        arrays = {name: np.ndarray(shape, dtype=dtype, buffer=buffer, offset=start + offset)
+                  for name, (dtype, shape, offset) in layout.items()}
+        pipeline = CompiledPipeline.__new__(CompiledPipeline)
+        pipeline._build(header, arrays)
+        return pipeline
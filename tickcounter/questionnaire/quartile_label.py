@@ -1,15 +1,48 @@
+import numpy as np
 import pandas as pd
 from tickcounter.questionnaire import Label
 from ..util import generate_name
+from .sketch import ValueCountSketch, KLLSketch
 
 class QuartileLabel(Label):
-    def __init__(self, q, labels, name=None):
+    """
+    Label each score with its quantile group among all the scores, as pd.qcut.
+
+    With error, the cut points are approximate quantiles taken from a KLLSketch of the scores
+    (within error in rank), built in one pass instead of sorting them. The sketches of chunks
+    or partitions of the data can be merged, and freeze fixes the cut points of any sketch:
+    the frozen label is then computed row by row, with a binary search of the cut points.
+    """
+    def __init__(self, q, labels, name=None, *, bins=None, error=None):
         self.q = q
         self.labels = labels
-        super().__init__(self.generate_label_function(self.q, self.labels), name)
+        # Cut points fixed in advance by freeze, the label then no longer depends on the other rows.
+        self.bins = bins
+        self.error = error
+        self.row_local = bins is not None
+        super().__init__(self.generate_label_function(self.q, self.labels, self.bins, self.error), name)
     
-    def generate_label_function(self, q, labels):
+    def generate_label_function(self, q, labels, bins=None, error=None):
         def label(data, score_col):
-            label_ss = pd.qcut(data[score_col], q=q, labels=labels)
+            if bins is None and error is not None:
+                return self.freeze(self.sketch().update(data[score_col])).label(data, score_col)
+            elif bins is None:
+                label_ss = pd.qcut(data[score_col], q=q, labels=labels)
+            else:
+                # Same binning as qcut, with the quantiles computed beforehand.
+                label_ss = pd.cut(data[score_col], bins, labels=labels, include_lowest=True)
             return label_ss
-        return label
\ No newline at end of file
+        return label
+    
+    def quantiles(self):
+        return np.linspace(0, 1, self.q + 1) if isinstance(self.q, (int, np.integer)) else np.asarray(self.q)
+    
+    def sketch(self):
+        # Empty sketch of the scores, exact unless the label has an error.
+        return ValueCountSketch() if self.error is None else KLLSketch(self.error)
+
+    def freeze(self, sketch):
+        """
+        Return a copy of this label with the cut points taken from the sketch of all the scores.
+        """
+        return QuartileLabel(self.q, self.labels, self.name, bins=sketch.quantile(self.quantiles()), error=self.error)
\ No newline at end of file
@@ -3,90 +3,224 @@ from scipy.stats import ttest_ind, chisquare
 from ..util import generate_name
 import seaborn as sns
 
+import copy
 import itertools
 
+from .cache import DependencyCache
+from .scoring_matrix import ScoringMatrix
+from ..util import parallel_map
 from tickcounter import plot, statistics
 from tickcounter.config import *
 
+def _concat_columns(frames, index):
+    # Put DataFrames side by side without copying. Each column is passed as its own Series, as
+    # pd.concat would otherwise consolidate the columns of the same dtype into a new copy.
+    columns = [ss for df in frames for _, ss in df.items()]
+    if len(columns) == 0:
+        return pd.DataFrame(index=index)
+    return pd.concat(columns, axis=1, copy=False)
+
+def _score_encoded(encoded, scoring):
+    # Same as scoring.score, from the encoded items.
+    return ScoringMatrix(scoring).score_encoded(encoded)[scoring.score_col]
+
+def _transform_and_score(data, scoring):
+    # Run by the workers of Questionnaire._compute_scorings.
+    encoded = scoring.encode(data)
+    return encoded, _score_encoded(encoded, scoring)
+
 class Questionnaire(object):
-    def __init__(self, data, scoring, descrip=None):
-        self.data = data.copy() # Original data
+    """
+    Responses of a questionnaire, scored and labeled with one or more Scoring objects.
+
+    With copy=False the DataFrame data is borrowed instead of copied. The transforms only
+    produce the encoded item columns and the processed views are assembled from the data and
+    the derived columns without copying, so the peak memory stays near the size of the data
+    plus the size of the derived columns (transformed items, scores and labels).
+
+    With n_jobs other than 1, the scorings are transformed and scored in parallel on n_jobs
+    workers (-1 for all the cores), which are threads or processes depending on backend.
+    Process workers receive the data once each instead of once per scoring.
+
+    With weight_col, each row counts as its weight (frequency weights) in the labels computed
+    from the whole population and in the statistics, as if it were repeated.
+    """
+    def __init__(self, data, scoring, descrip=None, *, copy=True, n_jobs=1, backend='thread', weight_col=None):
+        # Original data. With copy=False the caller's DataFrame is borrowed instead of copied,
+        # and must not be modified in place while the questionnaire is used.
+        self.data = data.copy() if copy else data
         self.descrip = descrip # Used for plotting and analysis, takes a Description object
-        self._cached = {
-            "transform": None, # Will only contain transformed columns
-            "score": None,
-            "label": None,
-            "data": self.data,
-            "processed_transformed": None,
-        }
+        # Each scoring's transform, score and labels are cached separately, see _scoring_key and _label_key.
+        self._cache = DependencyCache()
         self.scoring = scoring if isinstance(scoring, list) else [scoring] # Used for calculating score
+        self.n_jobs = n_jobs
+        self.backend = backend
+        self.weight_col = weight_col
     
-    def transform(self):
-        if self._cached['transform'] is not None:
-            return self._cached['transform']
+    # Keys of the cache entries. The per-scoring entries depend on _scoring_key, the combined
+    # views depend on _STRUCTURE as well, which is invalidated whenever scorings or labels are
+    # added or removed, or rows are dropped.
+    _STRUCTURE = ('structure',)
+    # The views are assembled without copying the data or the derived columns, so the peak memory
+    # stays near the size of the data plus the size of the derived columns. They share memory with
+    # self.data and the cache, and should not be modified in place.
+    _VIEWS = ('transformed', 'scored', 'labeled', 'scored_data', 'processed', 'processed_transformed')
 
-        else:
-            data = None
-            # TODO: Will change this to support MultiEncoder in the future.
-            for i in self.scoring:
-                cur_data = i.transform(self.data[i.columns])
-                if data is None:
-                    data = cur_data
-                else:
-                    data = pd.concat([data, cur_data], axis=1)
-            self._cached['transform'] = data
-            return data
+    def _scoring_key(self, scoring):
+        return ('scoring', scoring.name)
+    
+    def _label_key(self, scoring, label):
+        return ('label rule', scoring.name, label.name)
 
-    def score(self):
-        if self._cached['score'] is not None:
-            return self._cached['score']
+    def _transform_scoring(self, scoring):
+        return self._cache.get(('transform', scoring.name), 
+                               lambda: scoring.encode(self.data), 
+                               [self._scoring_key(scoring)])
+    
+    def _score_scoring(self, scoring):
+        # From the cached transform instead of encoding the items again.
+        return self._cache.get(('score', scoring.name), 
+                               lambda: _score_encoded(self._transform_scoring(scoring), scoring), 
+                               [self._scoring_key(scoring)])
+
+    def _compute_scorings(self, transform=True):
+        # Transform and score the scorings missing from the cache on the worker pool. Without
+        # it, the scores are computed from the transforms when those are needed anyway, and
+        # otherwise together by a ScoringMatrix, encoding each item once without keeping the
+        # transformed items.
+        missing = [i for i in self.scoring if ('transform', i.name) not in self._cache]
+        if self.n_jobs == 1 or len(missing) <= 1:
+            if transform:
+                for scoring in missing:
+                    self._transform_scoring(scoring)
+            missing = [i for i in self.scoring if ('score', i.name) not in self._cache and ('transform', i.name) not in self._cache]
+            if len(missing) > 1:
+                scores = ScoringMatrix(missing).score(self.data)
+                for scoring in missing:
+                    self._cache.set(('score', scoring.name), scores[scoring.score_col], [self._scoring_key(scoring)])
+            return
+
+        tasks = missing
+        if self.backend == 'process':
+            # Labels are not needed to score, and hold functions that cannot be pickled.
+            tasks = [copy.copy(i) for i in missing]
+            for i in tasks:
+                i.labeling = []
+
+        results = parallel_map(_transform_and_score, tasks, shared=self.data, n_jobs=self.n_jobs, backend=self.backend)
+        for scoring, (encoded, score) in zip(missing, results):
+            self._cache.set(('transform', scoring.name), encoded, [self._scoring_key(scoring)])
+            self._cache.set(('score', scoring.name), score, [self._scoring_key(scoring)])
+    
+    def _label_scoring(self, scoring, label):
+        # The label function gets the original data with all the scores, as Scoring.label would.
+        def compute():
+            data = self._view('scored_data')
+            weights = None if self.weight_col is None else data[self.weight_col]
+            label_ss = label.label(data, scoring.score_col, weights=weights)
+            return label_ss.rename(f"{scoring.name} - Label {label.name}")
+        
+        return self._cache.get(('label', scoring.name, label.name),
+                               compute,
+                               [('score', scoring.name), self._label_key(scoring, label)])
+
+    def _view(self, name):
+        # Combined DataFrames, assembled from the per-scoring entries.
+        if (name,) not in self._cache:
+            self._compute_scorings(transform=name in ('transformed', 'processed_transformed'))
+
+        if name == 'transformed':
+            depends_on = [('transform', i.name) for i in self.scoring]
+            compute = lambda: _concat_columns([self._transform_scoring(i) for i in self.scoring], self.data.index) if len(self.scoring) > 0 else None
+        
+        elif name == 'scored':
+            depends_on = [('score', i.name) for i in self.scoring]
+            compute = lambda: _concat_columns([self._score_scoring(i).to_frame() for i in self.scoring], self.data.index)
+        
+        elif name == 'labeled':
+            depends_on = [('label', i.name, j.name) for i in self.scoring for j in i.labeling]
+            compute = lambda: _concat_columns([self._label_scoring(i, j).to_frame() for i in self.scoring for j in i.labeling], self.data.index)
+        
+        elif name == 'scored_data':
+            depends_on = [('scored',)]
+            compute = lambda: _concat_columns([self.data, self._view('scored')], self.data.index)
+        
+        elif name == 'processed':
+            depends_on = [('scored',), ('labeled',)]
+            compute = lambda: _concat_columns([self.data, self._view('scored'), self._view('labeled')], self.data.index)
+        
+        elif name == 'processed_transformed':
+            depends_on = [('processed',), ('transformed',)]
+            def compute():
+                # Columns of processed, with the items replaced by their transformed values.
+                processed, transformed = self._view('processed'), self._view('transformed')
+                columns = [transformed[i] if i in transformed.columns else processed[i] for i in processed.columns]
+                return pd.concat(columns, axis=1, copy=False)
         
         else:
-            result_df = None
-            for i in self.scoring:
-                score_ss = i.score(self.data)
-                
-                if result_df is None:
-                    result_df = pd.DataFrame([score_ss]).T
-                
-                else:
-                    result_df = pd.concat([result_df, score_ss], axis=1)
-            
-            self._cached['score'] = result_df
-            self._cached['data'] = pd.concat([self._cached['data'], self._cached['score']], axis=1)
-            return result_df
+            raise ValueError(f"Unknown view {name}")
+        
+        return self._cache.get((name,), compute, [Questionnaire._STRUCTURE, *depends_on])
+
+    def transform(self):
+        return self._view('transformed')
+
+    def score(self):
+        return self._view('scored')
 
     def label(self):
-        if self._cached['label'] is not None:
-            return self._cached['label']
+        return self._view('labeled')
+
+    def _get_scoring(self, name):
+        for i in self.scoring:
+            if i.name == name:
+                return i
+        raise KeyError(f"No scoring named {name}")
+
+    def add_scoring(self, scoring):
+        """
+        Add a Scoring. Only the new scoring is computed, cached results of the others are kept.
+        """
+        if scoring.name in [i.name for i in self.scoring]:
+            raise ValueError(f"Scoring {scoring.name} already exists")
+        self.scoring.append(scoring)
+        self._cache.invalidate(self._scoring_key(scoring))
+        self._cache.invalidate(Questionnaire._STRUCTURE)
+
+    def remove_scoring(self, name):
+        scoring = self._get_scoring(name)
+        self.scoring.remove(scoring)
+        self._cache.invalidate(self._scoring_key(scoring))
+        self._cache.invalidate(Questionnaire._STRUCTURE)
 
+    def set_label(self, scoring_name, label):
+        """
+        Replace the Label with the same name in the Scoring scoring_name, or add it if there is
+        none. Only this label is computed again.
+        """
+        scoring = self._get_scoring(scoring_name)
+        names = [i.name for i in scoring.labeling]
+        if label.name in names:
+            scoring.labeling[names.index(label.name)] = label
         else:
-            data = None
-            if self._cached['score'] is not None:
-                data = self._cached['data']
-            
-            else:
-                self.score()
-                data = self._cached['data']
+            scoring.labeling.append(label)
+        self._cache.invalidate(self._label_key(scoring, label))
+        self._cache.invalidate(Questionnaire._STRUCTURE)
 
-            label_df = None
-            for scoring in self.scoring:
-                cur_label_df = scoring.label(data, scoring.score_col)
-                
-                if label_df is None:
-                    label_df = cur_label_df 
-                
-                else:
-                    label_df = pd.concat([label_df, cur_label_df], axis=1)
-            self._cached['label'] = label_df
-            self._cached['data'] = pd.concat([self._cached['data'], label_df], axis=1)
-            return label_df
+    def remove_label(self, scoring_name, label_name):
+        scoring = self._get_scoring(scoring_name)
+        label = [i for i in scoring.labeling if i.name == label_name][0]
+        scoring.labeling.remove(label)
+        self._cache.invalidate(self._label_key(scoring, label))
+        self._cache.invalidate(Questionnaire._STRUCTURE)
 
     def _plot(self, columns, kind, transformed, **kwargs):
         df = self.processed_transformed if transformed else self.processed
         plot.plot_each_col(df, col_list = columns, plot_type=kind, **kwargs)
     
-    def auto_detect(self, group_col, num_col=None, cohen_es=COHEN_ES, eta=ETA, phi_es=PHI_ES, p_value=P_VALUE, min_sample=MIN_SAMPLE):
+    def auto_detect(self, group_col, num_col=None, cohen_es=COHEN_ES, eta=ETA, phi_es=PHI_ES, p_value=P_VALUE, min_sample=MIN_SAMPLE, *,
+                    n_jobs=None, backend=None, checkpoint=None, correction=None, method=None, seed=None):
+        # The workers default to the ones used for scoring.
         group_col = [group_col] if type(group_col) == str else group_col
         group_col.extend(self.label_col)
         if num_col is not None:
@@ -96,15 +230,31 @@ class Questionnaire(object):
             num_col = self.score_col
         df = self.processed
         ignore_list = set(itertools.product(self.score_col, self.label_col))
-        return statistics._auto_detect(data=df, 
-                                       num_col=num_col,
-                                       cat_col=group_col, 
-                                       cohen_es=cohen_es, 
-                                       eta=eta, 
-                                       phi_es=phi_es, 
-                                       p_value=p_value, 
-                                       min_sample=min_sample,
-                                       ignore_list=ignore_list)
+        findings_list = statistics._auto_detect(data=df, 
+                                                num_col=num_col,
+                                                cat_col=group_col, 
+                                                cohen_es=cohen_es, 
+                                                eta=eta, 
+                                                phi_es=phi_es, 
+                                                p_value=p_value, 
+                                                min_sample=min_sample,
+                                                ignore_list=ignore_list,
+                                                n_jobs=self.n_jobs if n_jobs is None else n_jobs,
+                                                backend=self.backend if backend is None else backend,
+                                                checkpoint=checkpoint,
+                                                correction=correction,
+                                                weight_col=self.weight_col,
+                                                method=method,
+                                                seed=seed)
+        # The findings only keep a weak reference to the data, to illustrate them while the
+        # processed data is cached. It is not pickled.
+        return findings_list.attach(df)
+
+    def stats_cube(self, group_col, num_col=None):
+        # Sufficient statistics of the scores (and num_col) by group_col and the labels, see statistics.StatsCube.
+        group_col = ([group_col] if type(group_col) == str else list(group_col)) + list(self.label_col)
+        num_col = ([] if num_col is None else [num_col] if type(num_col) == str else list(num_col)) + list(self.score_col)
+        return statistics.StatsCube(self.processed, num_col, group_col, weight_col=self.weight_col)
 
     def hist_label(self, *, transformed=True, separated=False, **kwargs):
         self._plot(columns = self.label_col, kind='hist', transformed=transformed, **kwargs)
@@ -124,32 +274,34 @@ class Questionnaire(object):
     def count_label(self, *, transformed=True, separated=False, **kwargs):
         self._plot(columns = self.label_col, kind='count', transformed=transformed, **kwargs)
     
-    def locate_outlier(self, columns, method='iqr', return_rule=False, zscore_threshold=3):
-        if method == 'iqr':
-            outlier, outlier_range =  statistics._locate_outlier_iqr(data=self.processed, columns=columns)
-        elif method == 'zscore':
-            outlier, outlier_range = statistics._locate_outlier_zscore(data=self.processed, columns=columns, zscore_threshold=zscore_threshold)
-        else:
-            raise ValueError("method argument can only be either 'iqr" or 'zscore')
+    def locate_outlier(self, columns, method='iqr', return_rule=False, zscore_threshold=3, *, iqr_multiplier=1.5, mad_threshold=3.5):
+        # method can be 'iqr', 'zscore' or 'mad', see statistics._outlier_mask.
+        outlier, outlier_range = statistics._locate_outlier(data=self.processed,
+                                                            columns=columns,
+                                                            method=method,
+                                                            iqr_multiplier=iqr_multiplier,
+                                                            zscore_threshold=zscore_threshold,
+                                                            mad_threshold=mad_threshold)
 
         if return_rule:
             return outlier, outlier_range
         else:
             return outlier
 
+    def _item_frame(self, col, transformed=True):
+        # col next to the items, without copying them.
+        if not transformed:
+            return self.processed
+        df = self.data if col in self.data.columns else self.processed
+        return _concat_columns([df[[col]], self.transform()], df.index)
+
     def diff_item(self, col, transformed=True):
-        df = self.data
-        if col not in df.columns:
-            df = self.processed
-        
-        if transformed:
-            df = df.copy()
-            df[self.item_col] = self.transform()
-        
-        else:
-            df = self._cached['data']
+        return statistics._diff_group(self._item_frame(col, transformed), group_col=col, num_col=self.item_col)
 
-        return statistics._diff_group(df, group_col=col, num_col=self.item_col)
+    def pairwise_item(self, col, method='tukey', transformed=True, **kwargs):
+        # Every item compared between every pair of groups of col, see GroupStats.pairwise.
+        group_stats = statistics.GroupStats(self._item_frame(col, transformed), col, self.item_col)
+        return group_stats.pairwise(method=method, **kwargs)
     
     def corr_item(self, columns=None, transformed=True):
         col = self.item_col.copy()
@@ -178,11 +330,10 @@ class Questionnaire(object):
         else:
             return plot.compare_dist(self.processed, feat_1, feat_2, descrip=self.descrip, **kwargs)
     
-    def t_test_group(self, item, info_col, **kwargs):
-        df = self.data
-        if info_col not in self._cached['data'].columns:
-            df = self.processed
-        return statistics._t_test_group(data=df, group_col=info_col, num_col=item, **kwargs)
+    def t_test_group(self, item, info_col, *, equal_var=True, method='t-test'):
+        # The transformed items compared between every pair of groups of info_col, see statistics._t_test_group.
+        return statistics._t_test_group(data=self._item_frame(info_col), group_col=info_col, num_col=item,
+                                        equal_var=equal_var, method=method)
     
     def t_test(self, num_col, group_col, group_1=None, group_2=None, **kwargs):
         return statistics._t_test(self.processed, num_col, group_col, group_1, group_2, **kwargs)
@@ -201,78 +352,127 @@ class Questionnaire(object):
         pass
 
     def drop(self, idx):
-        self.data.drop(idx, inplace=True)
-        self.reset_cache()
-
-    def reset_cache(self):
-        self._cached = {
-            "transform": None,
-            "score": None,
-            "label": None,
-            "data": self.data,
-            "processed_transformed": None
-        }
+        """
+        Drop rows from the data. Cached transforms, scores and row-local labels are updated by
+        dropping the same rows, labels depending on the whole population are computed again.
+        """
+        # Not in place, the data may be borrowed from the caller.
+        self.data = self.data.drop(idx)
+        labels = {self._label_key(i, j): j for i in self.scoring for j in i.labeling}
+        for key in self._cache.keys():
+            if key not in self._cache:
+                continue
+
+            if key[0] in ('transform', 'score'):
+                self._cache.update(key, self._cache[key].drop(idx))
+            
+            elif key[0] == 'label':
+                label = labels.get(('label rule', *key[1:]))
+                if label is not None and label.row_local:
+                    self._cache.update(key, self._cache[key].drop(idx))
+                else:
+                    self._cache.invalidate(key)
+        
+        self._cache.invalidate(Questionnaire._STRUCTURE)
+
+    def append(self, new_rows):
+        """
+        Append new responses to the data.
+
+        Only the new rows are transformed, scored and labeled, and the results are added to the
+        cached ones. Labels depending on the whole population (those with row_local set to False,
+        like QuartileLabel) are computed again for all rows on next access.
+
+        Parameters
+        ----------
+        new_rows : pandas.DataFrame
+            New responses with the same columns as the data. Their index must not overlap the
+            index of the existing data.
+        """
+        overlap = self.data.index.intersection(new_rows.index)
+        if len(overlap) > 0:
+            raise ValueError(f"Index of new_rows overlaps the existing data: {list(overlap[:5])}")
+        
+        self.data = pd.concat([self.data, new_rows])
+        new_scores = dict()
+        for scoring in self.scoring:
+            key = ('transform', scoring.name)
+            if key in self._cache:
+                self._cache.update(key, pd.concat([self._cache[key], scoring.transform(new_rows[scoring.columns])]))
+            
+            key = ('score', scoring.name)
+            if key in self._cache:
+                new_scores[scoring.name] = scoring.score(new_rows[scoring.columns])
+                self._cache.update(key, pd.concat([self._cache[key], new_scores[scoring.name]]))
+        
+        new_data = None
+        for scoring in self.scoring:
+            for label in scoring.labeling:
+                key = ('label', scoring.name, label.name)
+                if key not in self._cache:
+                    continue
+                
+                if label.row_local and scoring.name in new_scores:
+                    if new_data is None:
+                        new_data = pd.concat([new_rows, *new_scores.values()], axis=1)
+                    label_ss = label.label(new_data, scoring.score_col).rename(self._cache[key].name)
+                    self._cache.update(key, pd.concat([self._cache[key], label_ss]))
+                
+                else:
+                    self._cache.invalidate(key)
+
+        self._cache.invalidate(Questionnaire._STRUCTURE)
+
+    def reset_cache(self, scoring=None, label=None):
+        """
+        Clear cached results. If scoring is given, only the results of the Scoring with that
+        name are cleared, and if label is also given, only the results of that Label.
+        Use this after modifying a Scoring or Label object in place.
+        """
+        if scoring is None:
+            self._cache.clear()
+        
+        elif label is None:
+            self._cache.invalidate(('scoring', scoring))
+        
+        else:
+            self._cache.invalidate(('label rule', scoring, label))
+        self._cache.invalidate(Questionnaire._STRUCTURE)
     
     @property
     def score_col(self):
-        if self._cached['score'] is not None:
-            return self._cached['score'].columns
-        
-        else:
-            self.score()
-            return self._cached['score'].columns
+        return self.scored.columns
     
     @property
     def label_col(self):
-        if self._cached['label'] is not None:
-            return self._cached['label'].columns
-        
-        else:
-            self.label()
-            return self._cached['label'].columns
+        return self.labeled.columns
     
     @property
     def item_col(self):
-        if self._cached['transform'] is not None:
-            return self._cached['transform'].columns
-        
-        else:
-            self.transform()
-            return self._cached['transform'].columns
+        return self.transformed.columns
     
     @property
     def transformed(self):
-        self.transform()
-        return self._cached['transform']
+        return self._view('transformed')
     
     @property
     def scored(self):
-        self.score()
-        return self._cached['score']
+        return self._view('scored')
     
     @property
     def labeled(self):
-        self.label()
-        return self._cached['label']
+        return self._view('labeled')
     
     @property
     def processed(self):
-        self.label()
-        return self._cached['data']
+        return self._view('processed')
     
     @property
     def processed_transformed(self):
-        if self._cached['processed_transformed'] is None:
-            df = self.processed.copy()
-            df[self.item_col] = self._cached['transform']
-            self._cached['processed_transformed'] = df
-        
-        return self._cached['processed_transformed']
+        return self._view('processed_transformed')
     
     def __getitem__(self, col):
-        try:
-            return self._cached['data'][col]
+        if col in self.data.columns:
+            return self.data[col]
 
-        except KeyError:
-            self.label()
-            return self._cached['data'][col]
\ No newline at end of file
+        return self.processed[col]
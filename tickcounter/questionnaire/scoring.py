@@ -1,13 +1,36 @@
 import pandas as pd
 import warnings
 from ..util import generate_name
+from .multiencoder import MultiEncoder
+from .scoring_matrix import ScoringMatrix
 
 class Scoring(object):
+    """
+    Score of a scale, computed from its items after encoding them.
+
+    By default the score is the sum of the answered items. Items can be given weights (a dict
+    from column to weight), and reverse-keyed items count as low + high minus their value,
+    scale being the (low, high) range of the encoded items. With method 'mean' the score is
+    the weighted mean of the answered items instead, and with prorate the sum is scaled up as
+    if the missing items had been answered like the others. With min_answered, a number of
+    items or a fraction of them, the score is missing for rows with fewer answered items.
+    """
     name_generator = generate_name("scoring")
-    def __init__(self, labeling, encoding=None,*, name=None, columns=None):
+    def __init__(self, labeling, encoding=None,*, name=None, columns=None, weights=None, reverse=None, scale=None, method='sum',
+                 min_answered=None, prorate=False):
         self.encoding = encoding
         self.name = name
         self.labeling = labeling if isinstance(labeling, list) else [labeling] # Used for categorization
+        self.weights = weights
+        self.reverse = reverse
+        self.scale = scale
+        self.method = method
+        self.min_answered = min_answered
+        self.prorate = prorate
+        if method not in ('sum', 'mean'):
+            raise ValueError(f"method argument can only be either 'sum' or 'mean', got {method}")
+        if reverse is not None and scale is None:
+            raise ValueError("Reverse-keyed items need the (low, high) scale of the items.")
 
         if self.encoding is not None:
             self.columns = []
@@ -27,16 +50,37 @@ class Scoring(object):
         if self.name is None:
             self.name = next(Scoring.name_generator)
 
+    def encode(self, data):
+        """
+        Return only the encoded item columns of data. Unlike transform, the other columns of
+        data are not copied.
+        """
+        if isinstance(self.encoding, dict):
+            encoded = dict()
+            for encoder, columns in self.encoding.items():
+                # As in Encoder.transform, columns with values outside the encoding are left unchanged.
+                selected = [i for i in columns if encoder._match(data[i])]
+                encoded.update(encoder._encode_frame(data, selected, only_encoded=True).items())
+            return pd.DataFrame({col: encoded[col] if col in encoded else data[col] for col in self.columns},
+                                index=data.index, columns=self.columns, copy=False)
+
+        else:
+            return self.transform(data)[self.columns]
+
     def transform(self, data, **kwargs):
         if self.encoding is not None:
-            df = data.copy()
             if isinstance(self.encoding, dict):
-                for encoder, columns in self.encoding.items():
-                    df[columns] = encoder.transform(df[columns])
-                
-                return df
+                encoded = self.encode(data)
+                if not data.columns.is_unique:
+                    df = data.copy()
+                    df[self.columns] = encoded
+                    return df
+
+                return pd.DataFrame({col: encoded[col] if col in encoded else data[col] for col in data.columns},
+                                    index=data.index, columns=data.columns)
             
             elif isinstance(self.encoding, MultiEncoder):
+                df = data.copy()
                 if 'return_rule' in kwargs and kwargs['return_rule']:
                     df, rule = self.encoding.transform(df, **kwargs)
                     return df, rule
@@ -52,29 +96,19 @@ class Scoring(object):
             return data
 
     def score(self, data):
-        df = self.transform(data)
-        score_ss = df[self.columns].sum(axis=1)
-        score_ss.rename(f"{self.name} score", inplace=True)
-        return score_ss
+        return ScoringMatrix(self).score(data)[self.score_col]
 
-    def label(self, data, score_col=None):
-        label_df = None
+    def label(self, data, score_col=None, weight_col=None):
         if score_col is None:
-            data = data.copy()
             data = pd.concat([data, self.score(data)], axis=1)
             score_col = self.score_col
         
-        for i in self.labeling:
-            label_ss = i.label(data, score_col)
-            label_ss.rename(f"{self.name} - Label {i.name}", inplace=True)
-        
-            if label_df is None:
-                label_df = pd.DataFrame([label_ss]).T
-        
-            else:
-                label_df = pd.concat([label_df, label_ss], axis=1)
+        weights = None if weight_col is None else data[weight_col]
+        label_ss = [i.label(data, score_col, weights=weights).rename(f"{self.name} - Label {i.name}") for i in self.labeling]
+        if len(label_ss) == 0:
+            return None
 
-        return label_df
+        return pd.concat(label_ss, axis=1)
     
     @property
     def score_col(self):
@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+import warnings
+from scipy import sparse
+
+# Number of rows encoded and scored together.
+_CHUNK_ROWS = 2 ** 12
+
+def _numeric(values, known=()):
+    # Float values of an item, whether it is an integer, and its values that are not numbers
+    # nor in known.
+    # Items with values outside their encoding are left unencoded: their values that are not
+    # numbers count as missing, so that a fully unencoded item is left out of the sum as it was
+    # by DataFrame.sum.
+    if values.dtype.kind in 'iufb':
+        return values.to_numpy(dtype=np.float64), values.dtype.kind in 'iub', []
+    numeric = pd.to_numeric(values, errors='coerce')
+    invalid = numeric.isna() & values.notna() & ~values.isin(list(known))
+    return numeric.to_numpy(dtype=np.float64), bool(numeric.isna().all()), list(pd.unique(values[invalid]))
+
+def _warn_unencoded(unencoded):
+    if len(unencoded) > 0:
+        columns = ', '.join(f"{col} ({values[:5]})" for col, values in unencoded.items())
+        warnings.warn(f"Items with values outside their encoding, counted as missing: {columns}")
+
+def _item_keys(scoring):
+    # (encoder, column) of each item of scoring, in the order of scoring.columns.
+    if scoring.encoding is None:
+        return [(None, col) for col in scoring.columns]
+    return [(encoder, col) for encoder, columns in scoring.encoding.items() for col in columns]
+
+class ScoringMatrix(object):
+    """
+    Scorings compiled into a single sparse matrix, to compute all their scores at once.
+
+    The items of all the scorings are encoded once each (an item shared by several scorings
+    with the same encoder is encoded once) into a float block, with a second block marking
+    the answered items. A sparse matrix maps both blocks to three columns per scoring: the
+    weighted sum of the answered items (reverse-keyed items counting as low + high minus their
+    value), the weight of the answered items and their number. A single product then gives
+    every score, including the mean scores, the prorated sums and the minimum number of
+    answered items (see Scoring).
+
+    Scores are integers when the items and weights are, and no missing item handling applies,
+    as the sum of the items would be.
+    """
+    def __init__(self, scoring):
+        self.scoring = scoring if isinstance(scoring, list) else [scoring]
+        self.keys = list(dict.fromkeys(i for scoring in self.scoring for i in _item_keys(scoring)))
+        position = {key: i for i, key in enumerate(self.keys)}
+        n_items, n_scorings = len(self.keys), len(self.scoring)
+
+        rows, cols, values = [], [], []
+        # Position of the items of each scoring, and whether its weights and offsets are integers.
+        self._items = [[position[i] for i in _item_keys(scoring)] for scoring in self.scoring]
+        self._integral = []
+        for s, scoring in enumerate(self.scoring):
+            integral = True
+            for encoder, col in _item_keys(scoring):
+                i = position[(encoder, col)]
+                weight = scoring.weights.get(col, 1) if scoring.weights is not None else 1
+                reverse = scoring.reverse is not None and col in scoring.reverse
+                # Weighted value, its offset when reversed, answered weight and answered count.
+                rows.extend([i, n_items + i, n_items + i, n_items + i])
+                cols.extend([s, s, n_scorings + s, 2 * n_scorings + s])
+                values.extend([-weight if reverse else weight, weight * sum(scoring.scale) if reverse else 0, abs(weight), 1])
+                integral &= float(weight) == int(weight) and (not reverse or float(sum(scoring.scale)) == int(sum(scoring.scale)))
+            self._integral.append(integral)
+        self.matrix = sparse.csr_matrix((values, (rows, cols)), shape=(2 * n_items, 3 * n_scorings))
+        # Weight of all the items of each scoring, to prorate the sums.
+        self._total = np.asarray(self.matrix[n_items:, n_scorings:2 * n_scorings].sum(axis=0)).ravel()
+
+    def _encoders(self, data):
+        # Items grouped by encoder, with the columns each encoder encodes, matched on the whole
+        # data as in Scoring.encode.
+        by_encoder = dict()
+        for i, (encoder, col) in enumerate(self.keys):
+            by_encoder.setdefault(encoder, []).append((i, col))
+
+        encoders = []
+        for encoder, items in by_encoder.items():
+            if encoder is None:
+                encoders.append((None, items, None))
+            else:
+                # Columns with values outside the encoding are left unchanged.
+                columns = dict.fromkeys(col for i, col in items)
+                encoders.append((encoder, items, [col for col in columns if encoder._match(data[col])]))
+        return encoders
+
+    def _encode(self, data, encoders, rows=slice(None)):
+        # Float block of the items of the rows of data, whether each encoded item is an integer,
+        # and the values that could not be encoded, by column. Only the item columns of the
+        # rows are taken, without copying the other columns.
+        chunk = pd.DataFrame({col: data[col].iloc[rows] for col in dict.fromkeys(col for encoder, col in self.keys)}, copy=False)
+        block = np.empty((len(chunk), len(self.keys)), order='F')
+        integer = np.zeros(len(self.keys), dtype=bool)
+        unencoded = dict()
+        for encoder, items, selected in encoders:
+            if encoder is None:
+                encoded = chunk
+            else:
+                encoded = encoder._encode_frame(chunk, selected, only_encoded=True)
+            for i, col in items:
+                values = encoded[col] if col in encoded.columns else chunk[col]
+                block[:, i], integer[i], invalid = _numeric(values, () if encoder is None else encoder.encoding)
+                if len(invalid) > 0:
+                    unencoded[col] = invalid
+        return block, integer, unencoded
+
+    def encode(self, data):
+        """
+        Return the items of data as a float block, one column per item in the order of keys.
+        """
+        block, integer, unencoded = self._encode(data, self._encoders(data))
+        _warn_unencoded(unencoded)
+        return block
+
+    def _product(self, block):
+        # Sums, answered weights and answered counts of every scoring, a chunk of rows at a time
+        # to bound the memory of the answered block.
+        result = np.empty((len(block), self.matrix.shape[1]))
+        for start in range(0, len(block), _CHUNK_ROWS):
+            chunk = block[start:start + _CHUNK_ROWS]
+            answered = ~np.isnan(chunk)
+            result[start:start + _CHUNK_ROWS] = np.hstack([np.where(answered, chunk, 0), answered]) @ self.matrix
+        return result
+
+    def score_block(self, block, index=None, integer=None):
+        """
+        Return the scores of the items in block (see encode) as a DataFrame, one column per
+        scoring. integer tells which items are integers, if known.
+        """
+        return self._scores(self._product(block), index, integer)
+
+    def _scores(self, result, index, integer):
+        n_scorings = len(self.scoring)
+        total, weight, count = result[:, :n_scorings], result[:, n_scorings:2 * n_scorings], result[:, 2 * n_scorings:]
+
+        scores = dict()
+        integer = np.zeros(len(self.keys), dtype=bool) if integer is None else np.asarray(integer)
+        for s, scoring in enumerate(self.scoring):
+            score = total[:, s]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                if scoring.method == 'mean':
+                    score = score / weight[:, s]
+                elif scoring.prorate:
+                    score = score * self._total[s] / weight[:, s]
+            if scoring.min_answered is not None:
+                n_items = len(scoring.columns)
+                minimum = scoring.min_answered if isinstance(scoring.min_answered, (int, np.integer)) else np.ceil(scoring.min_answered * n_items)
+                score = np.where(count[:, s] >= minimum, score, np.nan)
+            elif self._integral[s] and integer[self._items[s]].all() and scoring.method == 'sum' and not scoring.prorate:
+                score = score.astype(np.int64)
+            scores[scoring.score_col] = score
+        return pd.DataFrame(scores, index=index, columns=[i.score_col for i in self.scoring])
+
+    def score(self, data):
+        """
+        Return the scores of data as a DataFrame, one column per scoring. The items are encoded
+        and scored a chunk of rows at a time, so that the block of items is never whole.
+        """
+        encoders = self._encoders(data)
+        result = np.empty((len(data), self.matrix.shape[1]))
+        integer = np.ones(len(self.keys), dtype=bool)
+        unencoded = dict()
+        for start in range(0, len(data), _CHUNK_ROWS):
+            block, chunk_integer, chunk_unencoded = self._encode(data, encoders, slice(start, start + _CHUNK_ROWS))
+            result[start:start + len(block)] = self._product(block)
+            integer &= chunk_integer
+            for col, values in chunk_unencoded.items():
+                unencoded[col] = list(dict.fromkeys(unencoded.get(col, []) + values))
+        _warn_unencoded(unencoded)
+        return self._scores(result, data.index, integer)
+
+    def score_encoded(self, encoded):
+        # Scores from the encoded items of a single scoring, like the cached transforms of Questionnaire.
+        block = np.empty(encoded.shape, order='F')
+        integer = np.zeros(encoded.shape[1], dtype=bool)
+        unencoded = dict()
+        for i, (col, values) in enumerate(encoded.items()):
+            block[:, i], integer[i], invalid = _numeric(values)
+            if len(invalid) > 0:
+                unencoded[col] = invalid
+        _warn_unencoded(unencoded)
+        return self.score_block(block, encoded.index, integer)
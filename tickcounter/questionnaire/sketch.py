@@ -0,0 +1,199 @@
+import copy
+import warnings
+
+import numpy as np
+import pandas as pd
+
+def _lerp(a, b, t):
+    # Same formula as numpy's linear quantile interpolation, so the results match np.quantile exactly.
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+class ValueCountSketch(object):
+    """
+    Exact, mergeable summary of the distribution of a numeric column.
+
+    Stores the count of each distinct value, which is compact for scores taking few distinct
+    values (like sums of Likert items). Quantiles are computed exactly with linear
+    interpolation, as in numpy.quantile and pandas.qcut.
+
+    Its size grows with the number of distinct values. With max_values, a warning is given once
+    when there are more distinct values than that, for which KLLSketch is better suited.
+    """
+    def __init__(self, max_values=None):
+        self.counts = pd.Series(dtype=np.float64)
+        self.max_values = max_values
+        self._warned = False
+
+    def _check_size(self):
+        if self.max_values is not None and not self._warned and len(self.counts) > self.max_values:
+            self._warned = True
+            warnings.warn(f"ValueCountSketch holds {len(self.counts)} distinct values, more than max_values={self.max_values}. "
+                          "Use a KLLSketch (error) to bound its size.")
+
+    def update(self, values, weights=None):
+        values = pd.Series(np.asarray(values, dtype=np.float64))
+        if weights is None:
+            counts = values.value_counts(dropna=True)
+        else:
+            counts = pd.Series(np.asarray(weights, dtype=np.float64)).groupby(values).sum()
+        self.counts = self.counts.add(counts, fill_value=0)
+        self._check_size()
+        return self
+
+    def merge(self, other):
+        result = ValueCountSketch(self.max_values)
+        result.counts = self.counts.add(other.counts, fill_value=0)
+        result._warned = self._warned or other._warned
+        result._check_size()
+        return result
+
+    @property
+    def count(self):
+        return self.counts.sum()
+
+    @property
+    def mean(self):
+        return (self.counts.index.to_numpy(dtype=np.float64) * self.counts.to_numpy()).sum() / self.count
+
+    @property
+    def std(self):
+        # Sample standard deviation (ddof=1), as in pandas.
+        deviation = self.counts.index.to_numpy(dtype=np.float64) - self.mean
+        return np.sqrt((deviation ** 2 * self.counts.to_numpy()).sum() / (self.count - 1))
+
+    def describe(self):
+        quantiles = self.quantile([0, 0.25, 0.5, 0.75, 1])
+        return pd.Series([self.count, self.mean, self.std, *quantiles],
+                         index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
+
+    def quantile(self, q):
+        """
+        Return the quantiles q (scalar or array in [0, 1]) of the values seen so far.
+        """
+        counts = self.counts.sort_index()
+        values = counts.index.to_numpy(dtype=np.float64)
+        cumulative = np.cumsum(counts.to_numpy())
+        if len(values) == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) > 0 else np.nan
+
+        position = np.asarray(q, dtype=np.float64) * (cumulative[-1] - 1)
+        lower = np.floor(position)
+        # Value at rank k (0-based) is the first value whose cumulative count exceeds k.
+        a = values[np.minimum(np.searchsorted(cumulative, lower, side='right'), len(values) - 1)]
+        b = values[np.minimum(np.searchsorted(cumulative, lower + 1, side='right'), len(values) - 1)]
+        result = _lerp(a, b, position - lower)
+        return result if np.ndim(q) > 0 else float(result)
+
+class KLLSketch(object):
+    """
+    Approximate, mergeable summary of the distribution of a numeric column (KLL sketch), of
+    bounded size whatever the number of values seen.
+
+    The values are kept in levels, a value of level h standing for 2 ** h values. When a level
+    holds more values than its capacity, it is sorted and every other value (starting from a
+    random one) is promoted to the next level. The rank of a value, and so the quantiles, are
+    then known up to epsilon times the number of values with high probability, the sketch
+    keeping about 3 * k values. k can be given directly instead of epsilon. The smallest and
+    largest values are kept exactly, as the quantiles 0 and 1.
+
+    Weights must be whole numbers, a value of weight w being added to the levels of the bits
+    of w.
+    """
+    # Ratio between the capacities of consecutive levels, from the top level down.
+    _decay = 2 / 3
+
+    def __init__(self, epsilon=0.01, *, k=None, seed=None):
+        # Normalized rank error of the quantiles of a KLL sketch as a function of k, as fitted
+        # for the Apache DataSketches implementation.
+        self.k = int(np.ceil((2.296 / epsilon) ** (1 / 0.9723))) if k is None else int(k)
+        self.levels = [np.empty(0)]
+        self.min, self.max = np.nan, np.nan
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def epsilon(self):
+        return 2.296 / self.k ** 0.9723
+
+    def _capacity(self, level):
+        return max(2, int(np.ceil(self.k * self._decay ** (len(self.levels) - 1 - level))))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                values = np.sort(values)
+                # An even number of values is halved, the largest one is kept if the number is odd.
+                even = len(values) - len(values) % 2
+                promoted = values[self._rng.integers(2):even:2]
+                self.levels[level] = values[even:]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                # A new level lowers the capacities of the levels below it, start over.
+                level = 0
+                continue
+            level += 1
+
+    def update(self, values, weights=None):
+        values = np.asarray(values, dtype=np.float64)
+        if weights is None:
+            weights = np.ones(len(values), dtype=np.int64)
+        else:
+            weights = np.asarray(weights, dtype=np.float64)
+            if (weights < 0).any() or (weights != np.round(weights)).any():
+                raise ValueError("KLLSketch only supports whole, non-negative weights")
+            weights = weights.astype(np.int64)
+        keep = ~np.isnan(values) & (weights > 0)
+        values, weights = values[keep], weights[keep]
+        if len(values) > 0:
+            self.min, self.max = np.fmin(self.min, values.min()), np.fmax(self.max, values.max())
+        for level in range(int(weights.max()).bit_length() if len(weights) > 0 else 0):
+            while level >= len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], values[(weights >> level) & 1 == 1]])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        result = KLLSketch(k=min(self.k, other.k))
+        result._rng = copy.deepcopy(self._rng)
+        result.min, result.max = np.fmin(self.min, other.min), np.fmax(self.max, other.max)
+        n_levels = max(len(self.levels), len(other.levels))
+        result.levels = [np.concatenate([i.levels[level] for i in (self, other) if level < len(i.levels)]) for level in range(n_levels)]
+        result._compress()
+        return result
+
+    def _value_counts(self):
+        # Exact summary of the values kept, each counting as the values it stands for.
+        sketch = ValueCountSketch()
+        for level, values in enumerate(self.levels):
+            sketch.update(values, np.full(len(values), 2.0 ** level))
+        return sketch
+
+    @property
+    def count(self):
+        # Exact, the weight of the values kept adds up to the number of values seen.
+        return sum(len(values) * 2 ** level for level, values in enumerate(self.levels))
+
+    @property
+    def mean(self):
+        return self._value_counts().mean
+
+    @property
+    def std(self):
+        return self._value_counts().std
+
+    def describe(self):
+        quantiles = self.quantile([0, 0.25, 0.5, 0.75, 1])
+        return pd.Series([self.count, self.mean, self.std, *quantiles],
+                         index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
+
+    def quantile(self, q):
+        """
+        Return the approximate quantiles q (scalar or array in [0, 1]) of the values seen so far.
+        """
+        result = self._value_counts().quantile(q)
+        result = np.where(np.asarray(q) == 0, self.min, np.where(np.asarray(q) == 1, self.max, result))
+        return result if np.ndim(q) > 0 else float(result)
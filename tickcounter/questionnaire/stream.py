@@ -0,0 +1,91 @@
+import pandas as pd
+
+from .sketch import ValueCountSketch, KLLSketch
+from .scoring_matrix import ScoringMatrix
+
+class ScoreStream(object):
+    """
+    Score responses that do not fit in memory, one chunk at a time.
+
+    The chunks can be any iterable of DataFrames, like pd.read_csv(path, chunksize=...). The
+    first pass (transform) scores each chunk with its row-local labels and accumulates a sketch
+    of each score. Labels depending on the whole population, like QuartileLabel, are computed
+    in a second pass (label) from the cut points frozen from the sketches.
+
+    With weight_col, each row counts as its weight in the sketches. By default the sketches are
+    exact ValueCountSketch, whose size grows with the number of distinct scores: a warning is
+    given when a score has more than max_values distinct values. With error, the sketches are
+    KLLSketch of that error instead, whose size is bounded whatever the number of values.
+    """
+    def __init__(self, scoring, *, keep_data=True, weight_col=None, error=None, max_values=10000):
+        self.scoring = scoring if isinstance(scoring, list) else [scoring]
+        for i in self.scoring:
+            for j in i.labeling:
+                if not j._can_freeze():
+                    raise ValueError(f"Label {j.name} of scoring {i.name} depends on the whole population and cannot be streamed")
+        self.keep_data = keep_data # Whether the output chunks contain the original columns
+        self.weight_col = weight_col
+        # Compiled once, every chunk is scored with a single product.
+        self._matrix = ScoringMatrix(self.scoring)
+        self.sketches = {i.name: ValueCountSketch(max_values) if error is None else KLLSketch(error) for i in self.scoring}
+        self._frozen = None
+
+    def _process(self, chunk, labels):
+        if len(self.scoring) == 0:
+            return chunk
+        scores = self._matrix.score(chunk)
+        scores = [scores[i.score_col] for i in self.scoring]
+
+        scored_data = pd.concat([chunk, *scores], axis=1)
+        label_ss = []
+        for i in self.scoring:
+            for j in i.labeling:
+                label = labels(i, j)
+                if label is not None:
+                    label_ss.append(label.label(scored_data, i.score_col).rename(f"{i.name} - Label {j.name}"))
+
+        return pd.concat([chunk] * self.keep_data + scores + label_ss, axis=1)
+
+    def transform(self, chunks):
+        """
+        First pass, yield each chunk with its scores and row-local labels.
+        """
+        for chunk in chunks:
+            result = self._process(chunk, lambda scoring, label: label if label.row_local else None)
+            weights = None if self.weight_col is None else chunk[self.weight_col]
+            for i in self.scoring:
+                self.sketches[i.name].update(result[i.score_col], weights)
+            yield result
+
+    def freeze(self):
+        # Population labels are replaced by row-local ones computed from the sketches.
+        self._frozen = {(i.name, j.name): j.freeze(self.sketches[i.name]) for i in self.scoring for j in i.labeling}
+
+    def label(self, chunks):
+        """
+        Second pass, yield each chunk with its scores and all the labels. The sketches are not updated.
+        """
+        if self._frozen is None:
+            self.freeze()
+
+        for chunk in chunks:
+            yield self._process(chunk, lambda scoring, label: self._frozen[(scoring.name, label.name)])
+
+    def merge(self, other):
+        # Combine the sketches of a stream run over another part of the data.
+        for i in self.scoring:
+            self.sketches[i.name] = self.sketches[i.name].merge(other.sketches[i.name])
+        self._frozen = None
+
+    def describe(self):
+        return pd.DataFrame({i.score_col: self.sketches[i.name].describe() for i in self.scoring}).T
+
+    def to_csv(self, chunks, path, **kwargs):
+        """
+        Write the chunks to a single csv file and return the number of rows written.
+        """
+        n_rows = 0
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), **kwargs)
+            n_rows += len(chunk)
+        return n_rows
@@ -1,3 +1,7 @@
+from .crosstab import ContingencyTables
+from .cube import StatsCube
+from .kernel import GroupStats
+from .resampling import Resampler
 from .statistics import _compare_group, \
                         _compare_mean,\
                         _anova,\
@@ -9,12 +13,18 @@ from .statistics import _compare_group, \
                         _filter_sparse_group,\
                         _t_test,\
                         _auto_detect,\
+                        _adjust_pvalues,\
                         _diff,\
                         _t_test_group,\
                         _diff_group,\
                         _locate_outlier_zscore, \
-                        _locate_outlier_iqr
+                        _locate_outlier_iqr,\
+                        _locate_outlier
 __all__ = [
+    "ContingencyTables",
+    "StatsCube",
+    "GroupStats",
+    "Resampler",
     "_compare_group", 
     "_compare_mean",
     "_anova",
@@ -26,9 +36,11 @@ __all__ = [
     "_filter_sparse_group",
     "_t_test",
     "_auto_detect",
+    "_adjust_pvalues",
     "_diff",
     "_t_test_group",
     "_diff_group",
     "_locate_outlier_zscore",
-    "_locate_outlier_iqr"
+    "_locate_outlier_iqr",
+    "_locate_outlier"
 ]
\ No newline at end of file
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+
+from scipy import stats
+from ..findings import TestResult
+from .kernel import _merge_size, _weighted_value_counts
+
+class ContingencyTables(object):
+    """
+    Contingency tables of pairs of categorical columns.
+
+    Each column is encoded once into integer codes, numbered in the order of
+    data[col].value_counts() with -1 for missing values. The table of a pair is then a single
+    np.bincount of the combined codes, and the chi-squared test of independence of many pairs
+    is computed on the stacked tables at once.
+
+    With weight_col, each row counts as its weight in the tables.
+
+    The tables of some pairs can instead be stored (see store_tables), to be merged with the
+    tables of other partitions of the data.
+    """
+    # Number of pairs whose tables are stacked together by chi_squared.
+    batch_size = 256
+
+    def __init__(self, data, columns, weight_col=None):
+        self.columns = list(columns)
+        self.size = dict()
+        self.codes = dict()
+        self.tables = dict()
+        self.weights = None if weight_col is None else data[weight_col].to_numpy(dtype=np.float64)
+        for col in self.columns:
+            if weight_col is None:
+                self.size[col] = data[col].value_counts()
+                self.codes[col] = self.size[col].index.get_indexer(data[col])
+            else:
+                self.size[col], self.codes[col] = _weighted_value_counts(data[col], self.weights)
+
+    def filter_sparse_group(self, col, min_sample):
+        # Same as _filter_sparse_group, without counting the groups again.
+        size = self.size[col]
+        ignored = size[size < min_sample]
+        return size.drop(ignored.index).index, ignored.index
+
+    def table(self, col_1, col_2):
+        """
+        Return the counts of every combination of groups of col_1 (rows) and col_2 (columns).
+        Rows with a missing value in either column are not counted.
+        """
+        if (col_1, col_2) in self.tables:
+            return self.tables[(col_1, col_2)]
+        elif (col_2, col_1) in self.tables:
+            return self.tables[(col_2, col_1)].T
+        codes_1, codes_2 = self.codes[col_1], self.codes[col_2]
+        n_1, n_2 = len(self.size[col_1]), len(self.size[col_2])
+        valid = (codes_1 >= 0) & (codes_2 >= 0)
+        weights = None if self.weights is None else self.weights[valid]
+        table = np.bincount(codes_1[valid] * n_2 + codes_2[valid], weights, minlength=n_1 * n_2).reshape(n_1, n_2)
+        return pd.DataFrame(table, index=self.size[col_1].index, columns=self.size[col_2].index)
+
+    def store_tables(self, pairs):
+        """
+        Compute the tables of pairs once and keep them, dropping the codes of the rows: the
+        tables of other pairs can no longer be computed. Returns self.
+        """
+        self.tables = {pair: self.table(*pair) for pair in pairs}
+        self.codes = dict()
+        self.weights = None
+        return self
+
+    def merge(self, other):
+        """
+        Return the ContingencyTables of the rows of both self and other, with the tables stored
+        by both (see store_tables) added up.
+        """
+        if set(self.columns) != set(other.columns):
+            raise ValueError("Can only merge the ContingencyTables of the same columns")
+        result = ContingencyTables.__new__(ContingencyTables)
+        result.columns = self.columns
+        result.size = {col: _merge_size(self.size[col], other.size[col]) for col in self.columns}
+        result.codes = dict()
+        result.weights = None
+        result.tables = dict()
+        for col_1, col_2 in self.tables:
+            index, columns = result.size[col_1].index, result.size[col_2].index
+            table_1 = self.table(col_1, col_2).reindex(index=index, columns=columns, fill_value=0)
+            table_2 = other.table(col_1, col_2).reindex(index=index, columns=columns, fill_value=0)
+            result.tables[(col_1, col_2)] = table_1 + table_2
+        return result
+
+    def chi_squared(self, pairs, min_sample=0, groups=None):
+        """
+        Chi-squared test of independence of each pair of columns, as in
+        scipy.stats.chi2_contingency (with Yates' correction when dof is 1), on the table
+        restricted to the groups with at least min_sample rows in each column.
+
+        groups can map a column to the groups to keep instead, for any of the columns.
+
+        Returns a DataFrame indexed by pair, with columns 'statistic', 'pvalue', 'dof', 'phi'
+        (the effect size computed from the number n of rows in the restricted table) and 'n'.
+        The results are missing for pairs with fewer than 2 groups left in a column, or with an
+        empty group left in the restricted table.
+        """
+        pairs = list(pairs)
+        groups = dict() if groups is None else groups
+        keep = {col: self._keep(col, min_sample, groups.get(col)) for pair in pairs for col in pair}
+        result = [self._chi_squared(pairs[i:i + self.batch_size], keep) for i in range(0, len(pairs), self.batch_size)]
+        if len(result) == 0:
+            return pd.DataFrame(columns=['statistic', 'pvalue', 'dof', 'phi', 'n'], dtype=np.float64)
+        return pd.concat(result)
+
+    def _keep(self, col, min_sample, groups=None):
+        # Boolean mask over the groups of col.
+        if groups is not None:
+            return self.size[col].index.isin(groups)
+        return (self.size[col] >= min_sample).to_numpy()
+
+    def _chi_squared(self, pairs, keep):
+        n_rows = max(len(self.size[col_1]) for col_1, col_2 in pairs)
+        n_cols = max(len(self.size[col_2]) for col_1, col_2 in pairs)
+        observed = np.zeros((len(pairs), n_rows, n_cols))
+        mask = np.zeros((len(pairs), n_rows, n_cols), dtype=bool)
+        for i, (col_1, col_2) in enumerate(pairs):
+            table = self.table(col_1, col_2).to_numpy()
+            keep_1, keep_2 = keep[col_1], keep[col_2]
+            observed[i, :table.shape[0], :table.shape[1]] = table * np.outer(keep_1, keep_2)
+            mask[i, :table.shape[0], :table.shape[1]] = np.outer(keep_1, keep_2)
+
+        n = observed.sum(axis=(1, 2))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            expected = observed.sum(axis=2)[:, :, None] * observed.sum(axis=1)[:, None, :] / n[:, None, None]
+            n_groups_1 = mask.any(axis=2).sum(axis=1)
+            n_groups_2 = mask.any(axis=1).sum(axis=1)
+            dof = (n_groups_1 - 1) * (n_groups_2 - 1)
+
+            # Yates' correction, moving each observed count by at most 0.5 toward its expected count.
+            diff = expected - observed
+            corrected = observed + np.sign(diff) * np.minimum(0.5, np.abs(diff))
+            observed = np.where((dof == 1)[:, None, None], corrected, observed)
+
+            terms = np.where(mask, (observed - expected) ** 2 / expected, 0)
+            statistic = terms.sum(axis=(1, 2))
+            invalid = (n_groups_1 < 2) | (n_groups_2 < 2) | (mask & (expected == 0)).any(axis=(1, 2))
+            statistic[invalid] = np.nan
+            pvalue = stats.chi2.sf(statistic, dof)
+            phi = np.sqrt(statistic / n)
+
+        return pd.DataFrame({'statistic': statistic, 'pvalue': pvalue, 'dof': dof, 'phi': phi, 'n': n},
+                            index=pd.MultiIndex.from_tuples(pairs))
+
+    def test_result(self, col_1, col_2, groups_1, groups_2):
+        """
+        Return the TestResult of the chi-squared test of independence on the table restricted
+        to groups_1 and groups_2, including the expected counts.
+        """
+        result = self.chi_squared([(col_1, col_2)], groups={col_1: groups_1, col_2: groups_2}).iloc[0]
+        table = self.table(col_1, col_2)
+        observed = table.loc[table.index.isin(groups_1), table.columns.isin(groups_2)].to_numpy()
+        expected = np.outer(observed.sum(axis=1), observed.sum(axis=0)) / observed.sum()
+        return TestResult(name='chi2 contigency',
+                          statistic=result['statistic'],
+                          pvalue=result['pvalue'],
+                          dof=int(result['dof']),
+                          expected=expected,
+                         ), result['phi']
@@ -0,0 +1,68 @@
+import itertools
+
+from .kernel import GroupStats
+from .crosstab import ContingencyTables
+from .statistics import _compare_mean, _compare_group, _chi_squared_dependence, _auto_detect
+
+class StatsCube(object):
+    """
+    Sufficient statistics of a survey, to answer the tests between its columns without going
+    through the data again.
+
+    Holds the GroupStats of every numeric column for each categorical column (count, sum and
+    sum of squared deviations of each group), and the contingency table of every pair of
+    categorical columns. The cubes built from partitions of the data (e.g. one per day) can be
+    combined with merge, and pickled in between.
+
+    With weight_col, each row counts as its weight in the statistics.
+    """
+    def __init__(self, data, num_col, cat_col, weight_col=None):
+        self.num_col = list(num_col)
+        self.cat_col = list(cat_col)
+        self.group_stats = {col: GroupStats(data, col, self.num_col, weight_col=weight_col) for col in self.cat_col}
+        self.tables = ContingencyTables(data, self.cat_col, weight_col=weight_col).store_tables(itertools.combinations(self.cat_col, 2))
+
+    def merge(self, other):
+        """
+        Return the cube of the rows of both self and other, which must have the same columns.
+        """
+        if self.num_col != other.num_col or self.cat_col != other.cat_col:
+            raise ValueError("Can only merge the StatsCube of the same num_col and cat_col")
+        result = StatsCube.__new__(StatsCube)
+        result.num_col = self.num_col
+        result.cat_col = self.cat_col
+        result.group_stats = {col: self.group_stats[col].merge(other.group_stats[col]) for col in self.cat_col}
+        result.tables = self.tables.merge(other.tables)
+        return result
+
+    def summary(self, num_col, group_col):
+        # Count and mean of num_col in each group of group_col.
+        return self.group_stats[group_col].summary(num_col)
+
+    def crosstab(self, index, col):
+        # Same as pd.crosstab(data[index], data[col]).
+        table = self.tables.table(index, col)
+        table = table.loc[table.sum(axis=1) > 0, table.sum(axis=0) > 0].sort_index().sort_index(axis=1)
+        table.index.name, table.columns.name = index, col
+        return table
+
+    def t_test(self, num_col, group_col, group_1, group_2, equal_var=True):
+        return self.group_stats[group_col].t_test(num_col, group_1, group_2, equal_var=equal_var)
+
+    def anova(self, num_col, group_col, groups=None):
+        group_stats = self.group_stats[group_col]
+        return group_stats.anova(num_col, group_stats.size.index if groups is None else groups)
+
+    def chi_squared_dependence(self, col_1, col_2, groups_1=None, groups_2=None, min_sample=0):
+        return _chi_squared_dependence(None, col_1, col_2, groups_1, groups_2, min_sample, tables=self.tables)
+
+    def compare_mean(self, num_col, group_col, *, cohen_es=0.2, eta=0.06, p_value=0.05, min_sample=20):
+        return _compare_mean(None, num_col, group_col, cohen_es=cohen_es, eta=eta, p_value=p_value, min_sample=min_sample,
+                             group_stats=self.group_stats[group_col])
+
+    def compare_group(self, col_1, col_2, p_value=0.05, phi_es=0.2, min_sample=20):
+        return _compare_group(None, col_1, col_2, p_value=p_value, phi_es=phi_es, min_sample=min_sample, tables=self.tables)
+
+    def auto_detect(self, cohen_es=0.2, eta=0.06, phi_es=0.2, p_value=0.05, min_sample=20, ignore_list=None, correction=None):
+        return _auto_detect(None, self.num_col, self.cat_col, cohen_es=cohen_es, eta=eta, phi_es=phi_es, p_value=p_value,
+                            min_sample=min_sample, ignore_list=ignore_list, correction=correction, cube=self)
@@ -0,0 +1,300 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from scipy import stats
+from scipy.interpolate import CubicSpline
+from ..findings import TestResult
+
+try:
+    from scipy.stats import studentized_range
+except ImportError:
+    # Added in scipy 1.7, only needed by the post-hoc tests.
+    studentized_range = None
+
+# Above this number of values of q sharing the same k and dof, studentized_range.sf (a numerical
+# integration taking about 10ms per value) is evaluated on this many points and interpolated.
+_SF_GRID = 128
+_SF_MIN = 1e-12
+
+def _studentized_range_sf(q, k, dof):
+    """
+    Survival function of the studentized range distribution, vectorized over q, k and dof.
+
+    The values sharing the same k and dof are interpolated by a cubic spline of log sf when
+    there are more than _SF_GRID of them, with a relative error below 1e-5 down to _SF_MIN.
+    """
+    if studentized_range is None:
+        raise ImportError("The post-hoc tests require scipy >= 1.7 for scipy.stats.studentized_range")
+    q, k, dof = np.broadcast_arrays(*[np.asarray(i, dtype=np.float64) for i in [q, k, dof]])
+    result = np.full(q.shape, np.nan)
+    valid = ~(np.isnan(q) | np.isnan(k) | np.isnan(dof))
+    keys = pd.DataFrame({'k': k[valid], 'dof': dof[valid]})
+    for (k_i, dof_i), index in keys.groupby(['k', 'dof']).indices.items():
+        index = np.flatnonzero(valid)[index]
+        values = q.flat[index]
+        if len(np.unique(values)) <= _SF_GRID:
+            result.flat[index] = studentized_range.sf(values, k_i, dof_i)
+        else:
+            grid = np.linspace(0, values.max(), _SF_GRID)
+            sf = studentized_range.sf(grid, k_i, dof_i)
+            if sf[-1] < _SF_MIN:
+                # The integration is not accurate this far in the tail, the grid is moved to end
+                # where sf falls below _SF_MIN, and larger values of q get the last value as an upper bound.
+                grid = np.linspace(0, grid[np.argmax(sf < _SF_MIN)], _SF_GRID)
+                sf = studentized_range.sf(grid, k_i, dof_i)
+                grid, sf = grid[sf >= _SF_MIN], sf[sf >= _SF_MIN]
+            spline = CubicSpline(grid, np.log(sf))
+            result.flat[index] = np.where(values > grid[-1], sf[-1], np.exp(spline(np.minimum(values, grid[-1]))))
+    return result
+
+def _merge_size(size_1, size_2):
+    # Group sizes of two partitions added up, ordered by size as value_counts (ties by group).
+    size = size_1.add(size_2, fill_value=0).astype(np.result_type(size_1.dtype, size_2.dtype))
+    return size.sort_values(ascending=False, kind='mergesort')
+
+def _weighted_value_counts(column, weights):
+    """
+    Weighted column.value_counts(): the total weight of each value, largest first. Also returns
+    the position of the value of each row in it, -1 for missing values.
+    """
+    codes, uniques = pd.factorize(column)
+    weights = np.asarray(weights, dtype=np.float64)
+    valid = codes >= 0
+    size = np.bincount(codes[valid], weights[valid], minlength=len(uniques))
+    order = np.argsort(-size, kind='stable')
+    position = np.empty(len(order), dtype=np.intp)
+    position[order] = np.arange(len(order))
+    codes[valid] = position[codes[valid]]
+    return pd.Series(size[order], index=uniques[order], name=column.name), codes
+
+class GroupStats(object):
+    """
+    Sufficient statistics of numeric columns for each group of a categorical column.
+
+    The count, sum and sum of squared deviations from the group mean of every numeric column
+    are computed with a single groupby. The t-test, ANOVA and effect sizes of any numeric
+    column and set of groups are then derived from them without going through the data again.
+
+    Groups are ordered as in data[group_col].value_counts(). A group with a missing value in
+    a numeric column gives missing results for that column, as scipy does by default.
+
+    With weight_col, each row counts as many times as its weight (frequency weights): the
+    results are the same as on the data with each row repeated, without repeating them.
+
+    The GroupStats of partitions of the data can be combined with merge.
+    """
+    def __init__(self, data, group_col, num_col, weight_col=None):
+        self.group_col = group_col
+        self.num_col = [num_col] if isinstance(num_col, str) else list(num_col)
+        if weight_col is not None:
+            self._weighted(data, weight_col)
+        else:
+            self.size = data[group_col].value_counts()
+            grouped = data[self.num_col].groupby(data[group_col], sort=False)
+            order = self.size.index
+            self.count = grouped.count().reindex(order)
+            self.sum = grouped.sum().reindex(order)
+            # Squared deviations are summed around the group mean, which is more accurate than the raw sum of squares.
+            self.ss = (grouped.var(ddof=0) * self.count).reindex(order)
+
+        # Sums skipping the missing values, for the group means reported in the findings.
+        self.nansum = self.sum
+        # Groups with missing values propagate them to every result.
+        incomplete = self.count.lt(self.size, axis=0)
+        self.sum = self.sum.mask(incomplete)
+        self.ss = self.ss.mask(incomplete)
+
+    def _weighted(self, data, weight_col):
+        # Same statistics with np.bincount, each row weighted by weight_col.
+        self.size, codes = _weighted_value_counts(data[self.group_col], data[weight_col])
+        valid = codes >= 0
+        codes = codes[valid]
+        weights = data[weight_col].to_numpy(dtype=np.float64)[valid]
+        count, total, ss = dict(), dict(), dict()
+        for col in self.num_col:
+            values = data[col].to_numpy(dtype=np.float64)[valid]
+            missing = np.isnan(values)
+            w, x = np.where(missing, 0, weights), np.where(missing, 0, values)
+            count[col] = np.bincount(codes, w, minlength=len(self.size))
+            total[col] = np.bincount(codes, w * x, minlength=len(self.size))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean = total[col] / count[col]
+            ss[col] = np.bincount(codes, w * (x - mean[codes]) ** 2, minlength=len(self.size))
+        self.count = pd.DataFrame(count, index=self.size.index, columns=self.num_col)
+        self.sum = pd.DataFrame(total, index=self.size.index, columns=self.num_col)
+        self.ss = pd.DataFrame(ss, index=self.size.index, columns=self.num_col)
+
+    def merge(self, other):
+        """
+        Return the GroupStats of the rows of both self and other, as if computed on the
+        concatenated data. Groups are ordered by their total size.
+        """
+        if self.group_col != other.group_col or self.num_col != other.num_col:
+            raise ValueError("Can only merge the GroupStats of the same group_col and num_col")
+        result = GroupStats.__new__(GroupStats)
+        result.group_col = self.group_col
+        result.num_col = self.num_col
+        result.size = _merge_size(self.size, other.size)
+        order = result.size.index
+        n_1, n_2 = self.count.reindex(order, fill_value=0), other.count.reindex(order, fill_value=0)
+        nansum_1, nansum_2 = self.nansum.reindex(order, fill_value=0), other.nansum.reindex(order, fill_value=0)
+        result.count = n_1 + n_2
+        result.sum = self.sum.reindex(order, fill_value=0) + other.sum.reindex(order, fill_value=0)
+        result.nansum = nansum_1 + nansum_2
+        # Squared deviations from the merged mean (Chan et al.), the correction is 0 if a side is empty.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correction = (nansum_2 * n_1 - nansum_1 * n_2) ** 2 / (n_1 * n_2 * result.count)
+        correction = correction.where((n_1 > 0) & (n_2 > 0), 0)
+        result.ss = self.ss.reindex(order, fill_value=0) + other.ss.reindex(order, fill_value=0) + correction
+        return result
+
+    @property
+    def mean(self):
+        return self.sum / self.count
+
+    @property
+    def nanmean(self):
+        # Group means skipping missing values, as data.groupby(group_col)[num_col].mean().
+        return self.nansum / self.count
+
+    @property
+    def sumsq(self):
+        return self.ss + self.sum ** 2 / self.count
+
+    def var(self, ddof=1):
+        return self.ss / (self.count - ddof)
+
+    def summary(self, num_col):
+        # Count and mean of num_col in every group skipping missing values, as data.groupby(group_col)[num_col].
+        return pd.DataFrame({'count': self.count[num_col], 'mean': self.nanmean[num_col]}).sort_index()
+
+    def filter_sparse_group(self, min_sample):
+        # Same as _filter_sparse_group, without counting the groups again.
+        ignored = self.size[self.size < min_sample]
+        return self.size.drop(ignored.index).index, ignored.index
+
+    def _get(self, num_col, groups):
+        return (self.count.loc[groups, num_col].to_numpy(dtype=np.float64),
+                self.mean.loc[groups, num_col].to_numpy(dtype=np.float64),
+                self.ss.loc[groups, num_col].to_numpy(dtype=np.float64))
+
+    def cohen_d(self, num_col, group_1, group_2):
+        # Effect size of t_test alone, cheap enough to screen pairs before testing them.
+        (n_1, n_2), (mean_1, mean_2), (ss_1, ss_2) = self._get(num_col, [group_1, group_2])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return abs(mean_1 - mean_2) / np.sqrt(ss_1 / (n_1 - 1))
+
+    def eta_squared(self, num_col, groups):
+        # Effect size of anova alone, cheap enough to screen pairs before testing them.
+        n, mean, ss = self._get(num_col, list(groups))
+        total = n.sum()
+        grand_mean = (n * mean).sum() / total
+        ss_between = (n * (mean - grand_mean) ** 2).sum()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Variance of the group means over the variance of all the values, both with ddof 0.
+            return mean.var() / ((ss.sum() + ss_between) / total)
+
+    def t_test(self, num_col, group_1, group_2, equal_var=True):
+        """
+        Independent two sample t-test of num_col between group_1 and group_2, as in
+        scipy.stats.ttest_ind. Returns the TestResult and Cohen's d effect size, using the
+        standard deviation of group_1 as in _compute_cohen_es.
+        """
+        (n_1, n_2), (mean_1, mean_2), (ss_1, ss_2) = self._get(num_col, [group_1, group_2])
+        var_1, var_2 = ss_1 / (n_1 - 1), ss_2 / (n_2 - 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if equal_var:
+                dof = n_1 + n_2 - 2
+                denom = np.sqrt(((n_1 - 1) * var_1 + (n_2 - 1) * var_2) / dof * (1 / n_1 + 1 / n_2))
+            else:
+                vn_1, vn_2 = var_1 / n_1, var_2 / n_2
+                dof = (vn_1 + vn_2) ** 2 / (vn_1 ** 2 / (n_1 - 1) + vn_2 ** 2 / (n_2 - 1))
+                denom = np.sqrt(vn_1 + vn_2)
+            statistic = (mean_1 - mean_2) / denom
+        effect_size = self.cohen_d(num_col, group_1, group_2)
+        pvalue = 2 * stats.t.sf(np.abs(statistic), dof)
+        test_result = TestResult(name='t-test', statistic=statistic, pvalue=pvalue, dof=dof)
+        return test_result, effect_size
+
+    def anova(self, num_col, groups):
+        """
+        One-way ANOVA of num_col between the groups, as in scipy.stats.f_oneway. Returns the
+        TestResult and eta squared effect size, computed as in _compute_eta_squared.
+        """
+        n, mean, ss = self._get(num_col, list(groups))
+        total = n.sum()
+        grand_mean = (n * mean).sum() / total
+        ss_between = (n * (mean - grand_mean) ** 2).sum()
+        ss_within = ss.sum()
+        dof_between, dof_within = len(n) - 1, total - len(n)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            statistic = (ss_between / dof_between) / (ss_within / dof_within)
+        effect_size = self.eta_squared(num_col, groups)
+        pvalue = stats.f.sf(statistic, dof_between, dof_within)
+        test_result = TestResult(name='anova', statistic=statistic, pvalue=pvalue, dof=(dof_between, dof_within))
+        return test_result, effect_size
+
+    def pairwise(self, num_col=None, groups=None, method='t-test', equal_var=True):
+        """
+        Compare every pair of groups (in the order of groups, all the groups by default) for
+        each num_col (all of them by default) at once.
+
+        method is one of
+        't-test': independent two sample t-test of each pair, as in scipy.stats.ttest_ind, with
+        Welch's t-test if equal_var is False.
+        'tukey': Tukey's HSD test, using the variance pooled over all the groups.
+        'games-howell': Games-Howell test, which does not assume equal variances.
+
+        Returns a DataFrame indexed by num_col, group_1 and group_2, with columns 'diff' (the mean
+        of group_1 minus the mean of group_2, skipping missing values), 'std_err', 'statistic'
+        (t, or the studentized range q for the post-hoc tests), 'dof' and 'pvalue'.
+        """
+        if method not in ['t-test', 'tukey', 'games-howell']:
+            raise ValueError("method argument can only be either 't-test', 'tukey' or 'games-howell'")
+        num_col = self.num_col if num_col is None else [num_col] if isinstance(num_col, str) else list(num_col)
+        groups = self.size.index if groups is None else pd.Index(groups)
+        pairs = np.array(list(itertools.combinations(range(len(groups)), 2)), dtype=int).reshape(-1, 2)
+        i, j = pairs[:, 0], pairs[:, 1]
+
+        # Arrays of shape (groups, num_col), then (pairs, num_col).
+        n = self.count.loc[groups, num_col].to_numpy(dtype=np.float64)
+        ss = self.ss.loc[groups, num_col].to_numpy(dtype=np.float64)
+        var = ss / (n - 1)
+        diff = self.nanmean.loc[groups, num_col].to_numpy(dtype=np.float64)
+        diff = diff[i] - diff[j]
+        mean_diff = self.mean.loc[groups, num_col].to_numpy(dtype=np.float64)
+        mean_diff = mean_diff[i] - mean_diff[j]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vn_i, vn_j = var[i] / n[i], var[j] / n[j]
+            welch_dof = (vn_i + vn_j) ** 2 / (vn_i ** 2 / (n[i] - 1) + vn_j ** 2 / (n[j] - 1))
+            if method == 't-test' and equal_var:
+                dof = n[i] + n[j] - 2
+                std_err = np.sqrt(((n[i] - 1) * var[i] + (n[j] - 1) * var[j]) / dof * (1 / n[i] + 1 / n[j]))
+            elif method == 't-test':
+                dof = welch_dof
+                std_err = np.sqrt(vn_i + vn_j)
+            elif method == 'tukey':
+                dof = np.broadcast_to(n.sum(axis=0) - len(groups), diff.shape)
+                mse = ss.sum(axis=0) / dof
+                std_err = np.sqrt(mse / 2 * (1 / n[i] + 1 / n[j]))
+            else:
+                dof = welch_dof
+                std_err = np.sqrt((vn_i + vn_j) / 2)
+            statistic = mean_diff / std_err
+
+        if method == 't-test':
+            pvalue = 2 * stats.t.sf(np.abs(statistic), dof)
+        else:
+            statistic = np.abs(statistic)
+            pvalue = _studentized_range_sf(statistic, len(groups), dof)
+
+        index = pd.MultiIndex.from_arrays([np.repeat(num_col, len(pairs)),
+                                           np.tile(groups[i], len(num_col)),
+                                           np.tile(groups[j], len(num_col))],
+                                          names=['num_col', 'group_1', 'group_2'])
+        # Transposed so that the rows are ordered by num_col, then by pair.
+        columns = {'diff': diff, 'std_err': std_err, 'statistic': statistic, 'dof': dof, 'pvalue': pvalue}
+        return pd.DataFrame({key: np.asarray(value, dtype=np.float64).T.reshape(-1) for key, value in columns.items()}, index=index)
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+# Scale of the median absolute deviation of a normal distribution, for the modified z-score.
+_MAD_SCALE = 0.6745
+
+def _outlier_mask(data, columns, method='iqr', *, iqr_multiplier=1.5, zscore_threshold=3, mad_threshold=3.5):
+    """
+    Return a boolean array with one row per row of data and one column per column, True where
+    the value is an outlier, and a DataFrame with the bounds of the non-outlier values of each
+    column.
+
+    method is one of
+    'iqr': values below Q1 or above Q3 by more than iqr_multiplier IQR.
+    'zscore': values whose z-score (standard deviation with ddof 0) exceeds zscore_threshold
+    in absolute value.
+    'mad': values whose modified z-score, 0.6745 (x - median) / MAD, exceeds mad_threshold in
+    absolute value (Iglewicz and Hoaglin).
+
+    Missing values are skipped when computing the bounds, and are never outliers.
+    """
+    if method not in ['iqr', 'zscore', 'mad']:
+        raise ValueError("method argument can only be either 'iqr', 'zscore' or 'mad'")
+    columns = list(columns)
+    mask = np.zeros((len(data), len(columns)), dtype=bool)
+    lower_bound = np.empty(len(columns))
+    upper_bound = np.empty(len(columns))
+    # One column at a time, to avoid copying all the columns into a single float array.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for i, col in enumerate(columns):
+            values = data[col].to_numpy(dtype=np.float64)
+            if method == 'iqr':
+                q1, q3 = np.nanquantile(values, [0.25, 0.75])
+                out_iqr = iqr_multiplier * (q3 - q1)
+                lower_bound[i], upper_bound[i] = q1 - out_iqr, q3 + out_iqr
+                mask[:, i] = (values > upper_bound[i]) | (values < lower_bound[i])
+                continue
+            elif method == 'zscore':
+                center, scale, threshold = np.nanmean(values), np.nanstd(values), zscore_threshold
+            else:
+                center = np.nanmedian(values)
+                scale, threshold = np.nanmedian(np.abs(values - center)) / _MAD_SCALE, mad_threshold
+            lower_bound[i], upper_bound[i] = center - threshold * scale, center + threshold * scale
+            mask[:, i] = np.abs(values - center) / scale > threshold
+
+    names = ["Lower bound", "Upper bound"] if method == 'iqr' else ["Lower_bound", "Upper_bound"]
+    outlier_range = pd.DataFrame({names[0]: lower_bound, names[1]: upper_bound}, index=columns)
+    return mask, outlier_range
+
+def _outlier_field(mask, columns):
+    """
+    Return the names of the columns where mask is True, concatenated for each row of mask.
+    """
+    labels = np.full(len(mask), '', dtype=object)
+    # One vectorized append per column, only touching the cells that are outliers.
+    for i, col in enumerate(columns):
+        labels[mask[:, i]] += str(col)
+    return labels
+
+def _locate_outlier(data, columns, method='iqr', *, iqr_multiplier=1.5, zscore_threshold=3, mad_threshold=3.5,
+                    any=True, exclude=False):
+    """
+    Locate outliers from numerical columns with _outlier_mask.
+
+    A row is an outlier if one of its values is (any=True), or if all of them are (any=False).
+    Returns the outlier rows with an 'Outlier_field' column naming the columns where they are
+    outliers, and the bounds of each column.
+
+    If exclude is True, the non-outlier rows are returned instead, any then applying to the
+    non-outlier values: the rows with one value that is not an outlier (any=True), or the rows
+    with no outlier value at all (any=False).
+    """
+    mask, outlier_range = _outlier_mask(data, columns, method, iqr_multiplier=iqr_multiplier,
+                                        zscore_threshold=zscore_threshold, mad_threshold=mad_threshold)
+    if exclude:
+        return data[~mask.all(axis=1) if any else ~mask.any(axis=1)], outlier_range
+
+    rows = mask.any(axis=1) if any else mask.all(axis=1)
+
+    rows = np.flatnonzero(rows)
+    outliers = data.iloc[rows]
+    outlier_field = pd.Series(_outlier_field(mask[rows], columns), index=outliers.index, name="Outlier_field")
+    return pd.concat([outliers, outlier_field], axis=1), outlier_range
@@ -0,0 +1,191 @@
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from ..findings import TestResult
+from ..util import parallel_map
+
+# Number of values drawn per batch by default, the batch being a matrix of resamples by rows.
+_BATCH_ELEMENTS = 2 ** 20
+# Relative tolerance when comparing resampled statistics to the observed one, so that
+# resamples equal to the data up to rounding count as at least as extreme.
+_EPS = 1e-9
+
+def _ss_between(sums, n):
+    # Sum of squares between the groups of each resample, from the group sums of the values.
+    return (sums ** 2 / n).sum(axis=1) - sums.sum(axis=1) ** 2 / n.sum()
+
+def _f_statistic(sums, sumsq, n):
+    # ANOVA F of each resample, the square of the t-test statistic with 2 groups.
+    ss_within = (sumsq - sums ** 2 / n).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (_ss_between(sums, n) / (len(n) - 1)) / (ss_within / (n.sum() - len(n)))
+
+def _effect_size(sums, sumsq, n):
+    # Cohen's d with 2 groups and eta squared otherwise, computed as in GroupStats.
+    mean = sums / n
+    ss = sumsq - sums ** 2 / n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if len(n) == 2:
+            return np.abs(mean[:, 0] - mean[:, 1]) / np.sqrt(ss[:, 0] / (n[0] - 1))
+        return mean.var(axis=1) / ((ss.sum(axis=1) + _ss_between(sums, n)) / n.sum())
+
+def _chi2_statistic(tables):
+    # Pearson chi-squared statistic of each table, without Yates' correction.
+    n = tables.sum(axis=(1, 2))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = tables.sum(axis=2)[:, :, None] * tables.sum(axis=1)[:, None, :] / n[:, None, None]
+        terms = np.where(expected > 0, (tables - expected) ** 2 / expected, 0)
+    return terms.sum(axis=(1, 2))
+
+def _tables(codes_1, codes_2, shape):
+    # Contingency table of each row of the code matrices, with a single np.bincount.
+    size = codes_1.shape[0]
+    cells = shape[0] * shape[1]
+    flat = (np.arange(size)[:, None] * cells + codes_1 * shape[1] + codes_2).ravel()
+    return np.bincount(flat, minlength=size * cells).reshape(size, *shape)
+
+def _resample(arrays, unit):
+    # Statistics of one batch of resamples. Run by the workers, arrays are the ones of the test.
+    kind, size, seed = unit
+    rng = np.random.default_rng(seed)
+    if kind.startswith('chi'):
+        codes_1, codes_2 = arrays['codes_1'], arrays['codes_2']
+        if kind == 'chi permutation':
+            resampled_1 = np.broadcast_to(codes_1, (size, len(codes_1)))
+            resampled_2 = rng.permuted(np.tile(codes_2, (size, 1)), axis=1)
+        else:
+            # Both columns drawn independently from their own distribution.
+            resampled_1 = codes_1[rng.integers(0, len(codes_1), (size, len(codes_1)))]
+            resampled_2 = codes_2[rng.integers(0, len(codes_2), (size, len(codes_2)))]
+        return _chi2_statistic(_tables(resampled_1, resampled_2, arrays['shape']))
+
+    x, codes, n = arrays['x'], arrays['codes'], arrays['n']
+    onehot = np.eye(len(n))[codes]
+    if kind == 'permutation':
+        resampled = rng.permuted(np.tile(x, (size, 1)), axis=1)
+        return _ss_between(resampled @ onehot, n)
+    elif kind == 'bootstrap':
+        # Every group drawn from the pooled values.
+        resampled = x[rng.integers(0, len(x), (size, len(x)))]
+        return _f_statistic(resampled @ onehot, resampled ** 2 @ onehot, n)
+    else:
+        # Every group drawn from its own values, x being sorted by group.
+        count = n.astype(np.intp)
+        start = np.cumsum(count) - count
+        draw = start[codes] + (rng.random((size, len(x))) * count[codes]).astype(np.intp)
+        resampled = x[draw]
+        return _effect_size(resampled @ onehot, resampled ** 2 @ onehot, n)
+
+class Resampler(object):
+    """
+    Permutation and bootstrap versions of the tests of _compare_mean and _compare_group, for
+    data far from the assumptions of the parametric tests, like skewed Likert scores.
+
+    With method 'permutation', the values are shuffled between the groups (for a pair of
+    categorical columns, the values of the second column are shuffled). With 'bootstrap',
+    every group is drawn with replacement from the pooled values (for a pair of columns, each
+    column is drawn independently). The pvalue is (hits + 1) / (n_resamples + 1), hits being
+    the number of resamples at least as extreme as the data.
+
+    The mean tests also get a percentile bootstrap confidence interval of their effect size
+    (Cohen's d or eta squared) at the given confidence, drawing each group from its own values.
+
+    The resamples are drawn as matrices of batch_size resamples, whose group statistics are
+    computed at once with matrix products and np.bincount, and the batches are run on n_jobs
+    workers. Each batch has its own generator spawned from seed and the columns tested, so the
+    results do not depend on n_jobs nor on the order of the tests.
+    """
+    def __init__(self, method='permutation', n_resamples=9999, *, confidence=0.95, batch_size=None, seed=None, n_jobs=1, backend='thread'):
+        if method not in ('permutation', 'bootstrap'):
+            raise ValueError(f"Unknown resampling method {method}, expected 'permutation' or 'bootstrap'")
+        self.method = method
+        self.n_resamples = n_resamples
+        self.confidence = confidence
+        self.batch_size = batch_size
+        # Fixed once, so that the same Resampler gives the same results when seed is None.
+        self.entropy = np.random.SeedSequence(seed).entropy
+        self.n_jobs = n_jobs
+        self.backend = backend
+
+    def _statistics(self, arrays, kind, key, n_values):
+        # Statistics of the n_resamples resamples of kind, drawn in batches.
+        batch_size = self.batch_size or max(1, _BATCH_ELEMENTS // max(n_values, 1))
+        sizes = [batch_size] * (self.n_resamples // batch_size)
+        if self.n_resamples % batch_size > 0:
+            sizes.append(self.n_resamples % batch_size)
+        seed = np.random.SeedSequence(self.entropy, spawn_key=(zlib.crc32(f"{kind}\0{key}".encode()),))
+        units = [(kind, size, i) for size, i in zip(sizes, seed.spawn(len(sizes)))]
+        results = parallel_map(_resample, units, shared=arrays, n_jobs=self.n_jobs, backend=self.backend)
+        return np.concatenate(results) if len(results) > 0 else np.empty(0)
+
+    def _pvalue(self, resampled, observed):
+        hits = (resampled >= observed - _EPS * abs(observed)).sum()
+        return (hits + 1) / (len(resampled) + 1)
+
+    def mean_test(self, data, num_col, group_col, groups, test_result=None):
+        """
+        Resampling test of the difference of the means of num_col between the groups, the
+        first group being the reference of Cohen's d as in _compute_cohen_es. Returns a
+        TestResult keeping the statistic and dof of test_result (the parametric test) if given,
+        with the resampled pvalue and the confidence interval of the effect size.
+        """
+        groups = pd.Index(groups)
+        rows = data[group_col].isin(groups) & data[num_col].notna()
+        codes = groups.get_indexer(data.loc[rows, group_col])
+        order = np.argsort(codes, kind='stable')
+        x = data.loc[rows, num_col].to_numpy(dtype=np.float64)[order]
+        # Centered, so that the sums of squares computed from the group sums keep their precision.
+        x = x - x.mean() if len(x) > 0 else x
+        codes = codes[order]
+        n = np.bincount(codes, minlength=len(groups)).astype(np.float64)
+        arrays = {'x': x, 'codes': codes, 'n': n}
+        key = f"{num_col}\0{group_col}\0{list(groups)}"
+
+        onehot = np.eye(len(n))[codes]
+        sums, sumsq = (x @ onehot)[None], (x ** 2 @ onehot)[None]
+        statistic = _f_statistic(sums, sumsq, n)[0]
+        # The between sum of squares orders the permutations as F does, all the group sizes being fixed.
+        observed = _ss_between(sums, n)[0] if self.method == 'permutation' else statistic
+        pvalue = self._pvalue(self._statistics(arrays, self.method, key, len(x)), observed)
+
+        effect_size = self._statistics(arrays, 'interval', key, len(x))
+        alpha = (1 - self.confidence) / 2
+        interval = tuple(np.nanquantile(effect_size, [alpha, 1 - alpha])) if np.isfinite(effect_size).any() else (np.nan, np.nan)
+
+        # Without the parametric test, the statistic is the F of the ANOVA.
+        return TestResult(name=f"{'anova' if test_result is None else test_result.name} ({self.method})",
+                          statistic=statistic if test_result is None else test_result.statistic,
+                          pvalue=pvalue,
+                          dof=None if test_result is None else test_result.dof,
+                          confidence_interval=interval)
+
+    def chi_squared_test(self, data, col_1, col_2, groups_1, groups_2, test_result=None):
+        """
+        Resampling test of the independence of col_1 and col_2, on the rows in groups_1 and
+        groups_2. Returns a TestResult keeping the statistic, dof and expected counts of
+        test_result (the parametric test) if given, with the resampled pvalue.
+        """
+        groups_1, groups_2 = pd.Index(groups_1), pd.Index(groups_2)
+        rows = data[col_1].isin(groups_1) & data[col_2].isin(groups_2)
+        codes_1 = groups_1.get_indexer(data.loc[rows, col_1])
+        codes_2 = groups_2.get_indexer(data.loc[rows, col_2])
+        arrays = {'codes_1': codes_1, 'codes_2': codes_2, 'shape': (len(groups_1), len(groups_2))}
+        key = f"{col_1}\0{col_2}\0{list(groups_1)}\0{list(groups_2)}"
+
+        observed = _chi2_statistic(_tables(codes_1[None], codes_2[None], arrays['shape']))[0]
+        pvalue = self._pvalue(self._statistics(arrays, f"chi {self.method}", key, len(codes_1)), observed)
+        return TestResult(name=f"{'chi2 contigency' if test_result is None else test_result.name} ({self.method})",
+                          statistic=observed if test_result is None else test_result.statistic,
+                          pvalue=pvalue,
+                          dof=None if test_result is None else test_result.dof,
+                          expected=None if test_result is None else test_result.expected)
+
+def _get_resampler(method, n_jobs=1, backend='thread', seed=None):
+    # method of the tests: None or 'parametric', 'permutation', 'bootstrap' or a Resampler, which keeps its own seed.
+    if method is None or method == 'parametric':
+        return None
+    elif isinstance(method, Resampler):
+        return method
+    return Resampler(method, seed=seed, n_jobs=n_jobs, backend=backend)
@@ -4,11 +4,21 @@ import pandas as pd
 from scipy.stats import ttest_ind, chisquare, f_oneway, contingency
 from scipy import stats
 from ..findings import TTestFindings, DependenceFindings, ChiSquaredFindings, TestResult, FindingsList, AnovaFindings
+from .kernel import GroupStats, _weighted_value_counts
+from .crosstab import ContingencyTables
+from .sweep import _sweep
+from .outlier import _locate_outlier
+from .resampling import Resampler, _get_resampler
 
 import math
 import itertools
 
-def _anova(data, num_col, group_col, groups):
+def _anova(data, num_col, group_col, groups=None, weight_col=None):
+    # With weight_col, each row counts as its weight (frequency weights). groups defaults to every group.
+    if groups is None:
+        groups = data[group_col].value_counts().index
+    if weight_col is not None:
+        return GroupStats(data, group_col, [num_col], weight_col=weight_col).anova(num_col, list(groups))
     group_samples = []
     for i in groups:
         group_samples.append(data[data[group_col] == i][num_col])
@@ -16,16 +26,31 @@ def _anova(data, num_col, group_col, groups):
     effect_size = _compute_eta_squared(*group_samples)
     return test_result, effect_size
 
-def _compute_eta_squared(*args):
-    # args refer to the samples for each 
+def _weighted_mean_var(sample, weights=None, ddof=0):
+    # Mean and variance of sample, each value counting as its weight.
+    sample = np.asarray(sample, dtype=np.float64)
+    weights = np.ones(len(sample)) if weights is None else np.asarray(weights, dtype=np.float64)
+    total = weights.sum()
+    mean = (weights * sample).sum() / total
+    return mean, (weights * (sample - mean) ** 2).sum() / (total - ddof)
+
+def _compute_eta_squared(*args, weights=None):
+    # args refer to the samples for each group, weights to their weights if any
+    if weights is not None:
+        group_mean = np.array([_weighted_mean_var(i, w)[0] for i, w in zip(args, weights)])
+        all_var = _weighted_mean_var(list(itertools.chain(*args)), list(itertools.chain(*weights)))[1]
+        return group_mean.var() / all_var
     all_data = np.asarray(list(itertools.chain(*args)))
     group_mean = [i.mean() for i in args]
     group_mean = np.array(group_mean)
     return group_mean.var() / all_data.var()
 
-def _t_test(data, num_col, group_col, group_1=None, group_2=None, **kwargs):
+def _t_test(data, num_col, group_col, group_1=None, group_2=None, weight_col=None, **kwargs):
     if group_1 is None and group_2 is None:
-        groups = data[group_col].value_counts()
+        if weight_col is not None:
+            groups = _weighted_value_counts(data[group_col], data[weight_col])[0]
+        else:
+            groups = data[group_col].value_counts()
         if len(groups) != 2:
             raise ValueError(f"Column {group_col} has more than 2 groups")
         else:
@@ -34,6 +59,9 @@ def _t_test(data, num_col, group_col, group_1=None, group_2=None, **kwargs):
     elif not (group_1 is not None and group_2 is not None):
         raise ValueError("Please specify both group_1 and group_2")
 
+    if weight_col is not None:
+        group_stats = GroupStats(data, group_col, [num_col], weight_col=weight_col)
+        return group_stats.t_test(num_col, group_1, group_2, **kwargs)
     first_sample = data[data[group_col] == group_1][num_col]
     second_sample = data[data[group_col] == group_2][num_col]
     test_result = ttest_ind(a = first_sample,
@@ -42,56 +70,69 @@ def _t_test(data, num_col, group_col, group_1=None, group_2=None, **kwargs):
     effect_size = _compute_cohen_es(first_sample, second_sample)
     return test_result, effect_size
 
-def _compute_cohen_es(sample_1, sample_2):
+def _compute_cohen_es(sample_1, sample_2, weights_1=None, weights_2=None):
+    if weights_1 is not None or weights_2 is not None:
+        mean_1, var_1 = _weighted_mean_var(sample_1, weights_1, ddof=1)
+        mean_2, var_2 = _weighted_mean_var(sample_2, weights_2)
+        return abs(mean_1 - mean_2) / np.sqrt(var_1)
     cohen_es = abs(sample_1.mean() - sample_2.mean()) / sample_1.std()
     return cohen_es
 
 def _compute_phi_es(chi2, n):
     return math.sqrt(chi2 / n)
 
-def _chi_squared(data, col_1, expected=None):
+def _chi_squared(data, col_1, expected=None, weight_col=None):
     # If expected is None, assuming it is about testing for equality.
-    obs = data[col_1].value_counts().values
+    if weight_col is not None:
+        obs = _weighted_value_counts(data[col_1], data[weight_col])[0].values
+        n = data[weight_col].sum()
+    else:
+        obs = data[col_1].value_counts().values
+        n = len(data[col_1])
     test_result = chisquare(obs, expected)
-    effect_size = _compute_phi_es(test_result.chisq, len(data[col_1]))
+    effect_size = _compute_phi_es(test_result.statistic, n)
     return test_result, effect_size
 
-def _chi_squared_dependence(data, col_1, col_2, groups_1, groups_2, min_sample):
+def _check_resampling(data, resampler, weight_col):
+    if resampler is not None and data is None:
+        raise ValueError("Resampling tests need the data, they cannot be computed from a StatsCube")
+    if resampler is not None and weight_col is not None:
+        raise ValueError("Resampling tests do not support weight_col")
+
+def _chi_squared_dependence(data, col_1, col_2, groups_1, groups_2, min_sample, tables=None, weight_col=None, method=None, seed=None):
+    # Only the rows in groups_1 and groups_2 are counted, by default the groups with at least min_sample rows.
+    # method 'permutation', 'bootstrap' or a Resampler replaces the pvalue by a resampled one.
+    resampler = _get_resampler(method, seed=seed)
+    _check_resampling(data, resampler, weight_col)
+    tables = ContingencyTables(data, [col_1, col_2], weight_col=weight_col) if tables is None else tables
     if groups_1 is None:
-        filtered, ignored = _filter_sparse_group(data, col_1, min_sample)
+        filtered, ignored = tables.filter_sparse_group(col_1, min_sample)
         if len(filtered) < 2:
             raise ValueError(f"Only one group for {col_1}")
         groups_1 = filtered
     if groups_2 is None:
-        filtered, ignored = _filter_sparse_group(data, col_2, min_sample)
+        filtered, ignored = tables.filter_sparse_group(col_2, min_sample)
         if len(filtered) < 2:
             raise ValueError(f"Only one group for {col_2}")
         groups_2 = filtered
-    group_1 = data[col_1]
-    group_1 = group_1[group_1.isin([groups_1]).index]
-    group_2 = data[col_2]
-    group_2 = group_2[group_2.isin([groups_2]).index]
-    vals, count = contingency.crosstab(group_1.values, group_2.values)
-    test_result = contingency.chi2_contingency(count)
-    test_result = TestResult(name='chi2 contigency', 
-                             statistic=test_result[0],
-                             pvalue=test_result[1],
-                             dof=test_result[2],
-                             expected=test_result[3],
-                            )
-    effect_size = _compute_phi_es(test_result.statistic, len(data[col_1]))
+    test_result, effect_size = tables.test_result(col_1, col_2, groups_1, groups_2)
+    if resampler is not None:
+        test_result = resampler.chi_squared_test(data, col_1, col_2, groups_1, groups_2, test_result)
     return test_result, effect_size
 
-def _compare_group(data, col_1, col_2, p_value=0.05, phi_es=0.2, min_sample=20):
-    groups_1, ignored_1 = _filter_sparse_group(data, col_1, min_sample)
-    groups_2, ignored_2 = _filter_sparse_group(data, col_2, min_sample)
+def _compare_group(data, col_1, col_2, p_value=0.05, phi_es=0.2, min_sample=20, tables=None, weight_col=None, method=None, seed=None):
+    # The ContingencyTables of the columns can be shared between pairs of columns.
+    tables = ContingencyTables(data, [col_1, col_2], weight_col=weight_col) if tables is None else tables
+    groups_1, ignored_1 = tables.filter_sparse_group(col_1, min_sample)
+    groups_2, ignored_2 = tables.filter_sparse_group(col_2, min_sample)
     if len(groups_1) <= 1 or len(groups_2) <= 1:
         pass
     
     else:
-        test_result, effect_size = _chi_squared_dependence(data, col_1, col_2, groups_1, groups_2, min_sample)
+        test_result, effect_size = _chi_squared_dependence(data, col_1, col_2, groups_1, groups_2, min_sample, tables=tables,
+                                                           weight_col=weight_col, method=method, seed=seed)
         if test_result.pvalue <= p_value and effect_size >= phi_es:
-            return DependenceFindings(data=data,
+            return DependenceFindings(data=None,
                                       col_1=col_1,
                                       col_2=col_2,
                                       groups_1=groups_1,
@@ -100,38 +141,96 @@ def _compare_group(data, col_1, col_2, p_value=0.05, phi_es=0.2, min_sample=20):
                                      )
     return None
 
-def _compare_mean(data, num_col, group_col, *, cohen_es=0.2, eta=0.06, p_value=0.05, min_sample=20):
-    groups, ignored = _filter_sparse_group(data, group_col, min_sample)
+def _mean_test(num_col, group_col, group_stats, *, cohen_es=0.2, eta=0.06, min_sample=20):
+    # Returns None when there is nothing to test, else the groups, the TestResult and the effect size.
+    # The TestResult is None when the effect size is below cohen_es or eta, as the test could not pass anyway.
+    groups, ignored = group_stats.filter_sparse_group(min_sample)
     if not ignored.empty:
         print(f"Ignoring groups {list(ignored)} when comparing {num_col} and {group_col}")
 
     if len(groups) == 1:
         print(f"Skipping comparing {num_col} and {group_col}, only one group available")
-    
+        return None
+
     elif len(groups) == 2:
-        group_1 = groups[0]
-        group_2 = groups[1]
-        test_result, effect_size = _t_test(data, num_col, group_col, group_1, group_2)
-        if test_result.pvalue <= p_value and effect_size >= cohen_es:
-            return TTestFindings(data=data,
-                                group_col=group_col,
-                                num_col=num_col,
-                                group_1=group_1,
-                                group_2=group_2,
-                                test_result=test_result)
+        effect_size = group_stats.cohen_d(num_col, groups[0], groups[1])
+        if not effect_size >= cohen_es:
+            return groups, None, effect_size
+        test_result, effect_size = group_stats.t_test(num_col, groups[0], groups[1])
+
+    elif len(groups) > 2:
+        effect_size = group_stats.eta_squared(num_col, groups)
+        if not effect_size >= eta:
+            return groups, None, effect_size
+        test_result, effect_size = group_stats.anova(num_col, groups)
 
     else:
-        test_result, effect_size = _anova(data, num_col, group_col, groups)
-        if test_result.pvalue <= p_value and effect_size >= eta:
-            return AnovaFindings(data=data,
-                                 group_col=group_col,
-                                 groups=groups,
-                                 num_col=num_col,
-                                 test_result=test_result
-                                 )
-    
+        return None
+    return groups, test_result, effect_size
+
+def _mean_findings(num_col, group_col, groups, test_result, group_stats):
+    # The findings only keep the group means from group_stats, not the data.
+    if len(groups) == 2:
+        return TTestFindings(data=None,
+                            group_col=group_col,
+                            num_col=num_col,
+                            group_1=groups[0],
+                            group_2=groups[1],
+                            test_result=test_result,
+                            summary=group_stats.summary(num_col))
+    return AnovaFindings(data=None,
+                         group_col=group_col,
+                         groups=groups,
+                         num_col=num_col,
+                         test_result=test_result,
+                         summary=group_stats.summary(num_col)
+                         )
+
+def _compare_mean(data, num_col, group_col, *, cohen_es=0.2, eta=0.06, p_value=0.05, min_sample=20, group_stats=None, weight_col=None,
+                  method=None, seed=None):
+    # The tests are computed from the GroupStats of group_col, which can be shared by every num_col.
+    # method 'permutation', 'bootstrap' or a Resampler replaces the pvalue by a resampled one.
+    resampler = _get_resampler(method, seed=seed)
+    _check_resampling(data, resampler, weight_col)
+    if group_stats is None:
+        group_stats = GroupStats(data, group_col, [num_col], weight_col=weight_col)
+    result = _mean_test(num_col, group_col, group_stats, cohen_es=cohen_es, eta=eta, min_sample=min_sample)
+    if result is not None:
+        groups, test_result, effect_size = result
+        if test_result is not None and resampler is not None:
+            test_result = resampler.mean_test(data, num_col, group_col, groups, test_result)
+        if test_result is not None and test_result.pvalue <= p_value:
+            return _mean_findings(num_col, group_col, groups, test_result, group_stats)
     return None
 
+def _adjust_pvalues(pvalues, method=None):
+    """
+    Correct the pvalues of a family of tests for multiple testing, with method 'bonferroni',
+    'holm' (Holm-Bonferroni) or 'fdr_bh' (Benjamini-Hochberg false discovery rate), as in
+    statsmodels.stats.multitest.multipletests. None returns the pvalues unchanged.
+
+    Missing pvalues are counted as tests with a pvalue of 1.
+    """
+    pvalues = np.asarray(pvalues, dtype=np.float64)
+    pvalues = np.where(np.isnan(pvalues), 1.0, pvalues)
+    m = len(pvalues)
+    if method is None or m == 0:
+        return pvalues
+    elif method == 'bonferroni':
+        return np.minimum(pvalues * m, 1)
+
+    order = np.argsort(pvalues, kind='mergesort')
+    ranked = pvalues[order]
+    if method == 'holm':
+        adjusted = np.maximum.accumulate(ranked * np.arange(m, 0, -1))
+    elif method == 'fdr_bh':
+        adjusted = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    else:
+        raise ValueError(f"Unknown correction {method}, expected 'bonferroni', 'holm' or 'fdr_bh'")
+    result = np.empty(m)
+    result[order] = np.minimum(adjusted, 1)
+    return result
+
 def _filter_sparse_group(data, group_col, min_sample):
     group_count = data[group_col].value_counts()
     ignored = group_count[(group_count < min_sample)]
@@ -146,51 +245,154 @@ def _auto_detect(data,
                  phi_es=0.2, 
                  p_value=0.05, 
                  min_sample=20, 
-                 ignore_list=None):
+                 ignore_list=None,
+                 n_jobs=1,
+                 backend='thread',
+                 checkpoint=None,
+                 correction=None,
+                 cube=None,
+                 weight_col=None,
+                 method=None,
+                 seed=None):
+    """
+    Look for numeric columns whose mean differs between the groups of a categorical column,
+    and for dependent pairs of categorical columns.
+
+    With correction 'bonferroni', 'holm' or 'fdr_bh', the pvalues of all the tests of the
+    sweep are corrected for multiple testing (see _adjust_pvalues) before being compared to
+    p_value. Pairs whose effect size, computed from the group statistics, is below cohen_es,
+    eta or phi_es cannot become findings: they are not tested and count as a pvalue of 1.
+
+    With method 'permutation' or 'bootstrap', or a Resampler, the pvalues of the tests passing
+    the effect sizes are computed by resampling the data (see Resampler), on n_jobs workers.
+    seed fixes the resamples of a method given by name, so that the FindingsList is the same
+    from one call to the next.
+
+    With n_jobs other than 1, the statistics of each categorical column and of the pairs of
+    categorical columns are computed on n_jobs workers (-1 for all the cores), threads or
+    processes depending on backend. Processes receive the data through shared memory. If
+    checkpoint is the path of a file, the completed work is saved to it, so that running the
+    same sweep again after an interruption continues where it stopped. The FindingsList is the
+    same in every case.
+
+    If cube is a StatsCube of the columns, the tests are computed from it and data is not used.
+
+    With weight_col, each row counts as its weight (frequency weights), including in the
+    group sizes compared to min_sample: the findings are those of the data with each row
+    repeated, without repeating them.
+    """
     findings_list = []
     ignore_list = [] if ignore_list is None else ignore_list
+    resampler = _get_resampler(method, n_jobs=n_jobs, backend=backend, seed=seed)
+    _check_resampling(None if cube is not None else data, resampler, weight_col)
+    # One groupby for each cat_col, covering all its num_col.
+    group_stats = dict()
+    result = None
+    tables = None
+    if cube is not None:
+        group_stats = cube.group_stats
+        tables = cube.tables
+    elif n_jobs != 1 or checkpoint is not None:
+        group_stats, result = _sweep(data, num_col, cat_col, ignore_list, min_sample, n_jobs=n_jobs, backend=backend, checkpoint=checkpoint, weight_col=weight_col)
+
     # Compare mean
+    mean_tests = []
     for n_col, c_col in itertools.product(num_col, cat_col):
         # TODO: Check if this is inefficient.
         if ((n_col, c_col) in ignore_list) or ((c_col, n_col) in ignore_list):
             continue
         else:
-            findings = _compare_mean(data, n_col, c_col, cohen_es=cohen_es, eta=eta, p_value=p_value, min_sample=min_sample)
-            if findings is not None:
-                findings_list.append(findings)
+            if c_col not in group_stats:
+                columns = [i for i in num_col if ((i, c_col) not in ignore_list) and ((c_col, i) not in ignore_list)]
+                group_stats[c_col] = GroupStats(data, c_col, columns, weight_col=weight_col)
+            tested = _mean_test(n_col, c_col, group_stats[c_col], cohen_es=cohen_es, eta=eta, min_sample=min_sample)
+            if tested is not None:
+                groups, test_result = tested[:2]
+                if test_result is not None and resampler is not None:
+                    test_result = resampler.mean_test(data, n_col, c_col, groups, test_result)
+                mean_tests.append((n_col, c_col, groups, test_result))
 
-    # Compare dependency of two cat_col
-    for col_1, col_2 in itertools.combinations(cat_col, r=2):
-        # TODO: Check if this is inefficient.
-        if ((col_1, col_2) in ignore_list) or ((col_2, col_1) in ignore_list):
-            continue
+    # Compare dependency of two cat_col. Every pair is tested at once, the findings are only
+    # built for the pairs passing the thresholds.
+    if result is None:
+        pairs = [(col_1, col_2) for col_1, col_2 in itertools.combinations(cat_col, r=2)
+                 if ((col_1, col_2) not in ignore_list) and ((col_2, col_1) not in ignore_list)]
+        if tables is None:
+            tables = ContingencyTables(data, list(dict.fromkeys(itertools.chain(*pairs))), weight_col=weight_col)
+        result = tables.chi_squared(pairs, min_sample=min_sample)
+    # Pairs with less than 2 groups left in a column are not tested.
+    result = result[result['dof'] > 0]
+    resampled = dict()
+    if resampler is not None:
+        # The findings of the pairs passing phi_es, with their resampled pvalue.
+        candidates = result.index[(result['phi'] >= phi_es).to_numpy()]
+        if tables is None:
+            tables = ContingencyTables(data, list(dict.fromkeys(itertools.chain(*candidates))))
+        for col_1, col_2 in candidates:
+            resampled[(col_1, col_2)] = _compare_group(data, col_1, col_2, p_value=1, phi_es=phi_es, min_sample=min_sample,
+                                                       tables=tables, method=resampler)
+        result = result.assign(pvalue=[resampled[i].test_result.pvalue if resampled.get(i) is not None else 1.0 for i in result.index])
+
+    pvalues = [1.0 if test_result is None else test_result.pvalue for n_col, c_col, groups, test_result in mean_tests]
+    pvalues.extend(result['pvalue'].where(result['phi'] >= phi_es, 1.0))
+    adjusted = _adjust_pvalues(pvalues, correction)
+    mean_adjusted, chi_adjusted = adjusted[:len(mean_tests)], adjusted[len(mean_tests):]
+
+    for (n_col, c_col, groups, test_result), pvalue in zip(mean_tests, mean_adjusted):
+        if test_result is not None and pvalue <= p_value:
+            if correction is not None:
+                test_result.adjusted_pvalue = pvalue
+            findings_list.append(_mean_findings(n_col, c_col, groups, test_result, group_stats[c_col]))
+
+    passed = (chi_adjusted <= p_value) & (result['phi'] >= phi_es).to_numpy()
+    if tables is None:
+        tables = ContingencyTables(data, list(dict.fromkeys(itertools.chain(*result.index[passed]))), weight_col=weight_col)
+    for (col_1, col_2), pvalue in zip(result.index[passed], chi_adjusted[passed]):
+        if resampler is not None:
+            findings = resampled[(col_1, col_2)]
         else:
-            findings = _compare_group(data, col_1, col_2, p_value=p_value, phi_es=phi_es, min_sample=min_sample)
-            if findings is not None:
-                findings_list.append(findings)
+            findings = _compare_group(data, col_1, col_2, p_value=p_value, phi_es=phi_es, min_sample=min_sample, tables=tables)
+        if findings is not None:
+            if correction is not None:
+                findings.test_result.adjusted_pvalue = pvalue
+            findings_list.append(findings)
     
     return FindingsList(findings_list)
 
-def _diff_group(data, group_col, num_col):
-    df_group = data.groupby(group_col)[num_col].mean().T
-    result = pd.DataFrame(index=df_group.index)
-    for i in itertools.combinations(df_group.columns, 2):
-        result[f"{i[0]} - {i[1]}"] = df_group[i[0]] - df_group[i[1]]
-    return result
+def _pair_labels(pairs, sep):
+    return [f"{i} {sep} {j}" for i, j in pairs]
+
+def _diff_group(data, group_col, num_col, group_stats=None):
+    # Mean of each num_col (rows) for every pair of groups (columns), groups in sorted order.
+    group_stats = GroupStats(data, group_col, num_col) if group_stats is None else group_stats
+    groups = group_stats.size.index.sort_values()
+    diff = group_stats.pairwise(num_col, groups)['diff']
+    pairs = list(itertools.combinations(groups, 2))
+    num_col = [num_col] if isinstance(num_col, str) else list(num_col)
+    return pd.DataFrame(diff.to_numpy().reshape(len(num_col), len(pairs)), index=num_col, columns=_pair_labels(pairs, '-'))
 
 def _diff(data, *args):
-    # TODO: Check the len of each args sample.
-    result = pd.DataFrame(index=pd.RangeIndex(len(args[0])))
-    for i in itertools.combinations(df_group.columns, 2):
-        result[f"{i[0]} - {i[1]}"] = df_group[i[0]] - df_group[i[1]]
-    return result
+    # Difference between every pair of the columns args, row by row.
+    values = data[list(args)].to_numpy()
+    pairs = np.array(list(itertools.combinations(range(len(args)), 2)), dtype=int).reshape(-1, 2)
+    result = values[:, pairs[:, 0]] - values[:, pairs[:, 1]]
+    return pd.DataFrame(result, index=data.index, columns=_pair_labels(itertools.combinations(args, 2), '-'))
 
-def _t_test_group(data, group_col, num_col, **kwargs):
+def _t_test_group(data, group_col, num_col, equal_var=True, method='t-test'):
+    """
+    Compare num_col (a column or a list of columns) between every pair of groups of group_col,
+    with a t-test or a post-hoc test (method 'tukey' or 'games-howell', see GroupStats.pairwise).
+    Returns a dict mapping "group_1 vs group_2" to the TestResult, whose statistic and pvalue
+    are arrays if num_col is a list.
+    """
+    group_stats = GroupStats(data, group_col, num_col)
+    result = group_stats.pairwise(num_col, method=method, equal_var=equal_var)
+    pairs = list(itertools.combinations(group_stats.size.index, 2))
+    shape = (-1, len(pairs)) if not isinstance(num_col, str) else (len(pairs),)
+    columns = {i: result[i].to_numpy().reshape(shape) for i in ['statistic', 'pvalue', 'dof']}
     test_result = dict()
-    for i in itertools.combinations(data[group_col].value_counts().index, r=2):
-        test_result[f"{i[0]} vs {i[1]}"] = ttest_ind(a = df[df[group_col] == i[0]][num_col],
-                                                     b = df[df[group_col] == i[1]][num_col],
-                                                     **kwargs)
+    for k, label in enumerate(_pair_labels(pairs, 'vs')):
+        test_result[label] = TestResult(name=method, **{i: j[..., k] for i, j in columns.items()})
     return test_result
 
 def _locate_outlier_zscore(data, columns, zscore_threshold, any=True, exclude=False):
@@ -205,48 +407,17 @@ def _locate_outlier_zscore(data, columns, zscore_threshold, any=True, exclude=Fa
 
   Returns pandas DataFrame.
   '''
-  mean = data[columns].mean(axis=0)
-  std = data[columns].std(axis=0)
-  lower_bound = (std * zscore_threshold - mean).rename("Lower_bound")
-  upper_bound = (std * zscore_threshold + mean).rename("Upper_bound")
-  outlier_range = pd.concat([lower_bound, upper_bound], axis=1)
-  # TODO: Make this more efficient
-  # The above workflow is equivalent to below, at 3 decimal points
-  mask_include = np.abs(stats.zscore(data[columns])) > zscore_threshold
-  mask_exclude = np.abs(stats.zscore(data[columns])) < zscore_threshold
-
-  if any:
-    if exclude:
-      return data[mask_exclude.any(axis=1)]
-    else:
-      data = data[mask_include.any(axis=1)]
-      outlier_field = pd.DataFrame(mask_include, columns=columns)
-      outlier_field = outlier_field.apply(lambda x: x.replace(True, x.name).replace(False, ""))
-      outlier_field = outlier_field.apply(lambda x: x.str.cat(sep=''), axis=1)
-      outlier_field = outlier_field.replace("", np.nan).dropna()
-      outlier_field.rename("Outlier_field", inplace=True)
-      assert data.index.equals(outlier_field.index)
-      return (pd.concat([data, outlier_field], axis=1), outlier_range)
-  
-  else:
-    if exclude:
-      return data[mask_exclude.all(axis=1)]
+  result, outlier_range = _locate_outlier(data, columns, 'zscore', zscore_threshold=zscore_threshold, any=any, exclude=exclude)
+  if exclude:
+    return result
+  return (result, outlier_range)
 
-    else:
-      data = data[mask_include.all(axis=1)]
-      outlier_field = pd.DataFrame(mask_include, columns=columns)
-      outlier_field = outlier_field.apply(lambda x: x.replace(True, x.name).replace(False, ""))
-      outlier_field = outlier_field.apply(lambda x: x.str.cat(sep=''), axis=1)
-      outlier_field = outlier_field.replace("", np.nan).dropna()
-      outlier_field.rename("Outlier_field", inplace=True)
-      assert data.index.equals(outlier_field.index)
-      return (pd.concat([data, outlier_field], axis=1), outlier_range)
-
-def _locate_outlier_iqr(data, columns):
+def _locate_outlier_iqr(data, columns, iqr_multiplier=1.5):
   """
   Return all rows that are outliers in at least 1 feature.
 
-  Values exceed Q3 or below Q1 by more than 1.5 IQR will be classified as outliers. 
+  Values exceed Q3 or below Q1 by more than iqr_multiplier (1.5 by default) IQR will be
+  classified as outliers. 
 
   Parameters
   ----------
@@ -261,19 +432,4 @@ def _locate_outlier_iqr(data, columns):
   outlier_range: pandas.DataFrame.
       Contains the interval non-outliers values.
   """
-
-  q1 = data[columns].quantile(0.25)
-  q3 = data[columns].quantile(0.75)
-  out_iqr = 1.5 * (q3 - q1)
-  lower_bound = (q1 - out_iqr).rename("Lower bound")
-  upper_bound = (q3 + out_iqr).rename("Upper bound")
-  outlier_range = pd.concat([lower_bound, upper_bound], axis=1)
-
-  mask = (data[columns] > out_iqr + q3) | (data[columns] < q1 - out_iqr)
-  outlier_field = pd.DataFrame(mask, columns=columns)
-  outlier_field = outlier_field.apply(lambda x: x.replace(True, x.name).replace(False, ""))
-  outlier_field = outlier_field.apply(lambda x: x.str.cat(sep=''), axis=1)
-  outlier_field = outlier_field.replace("", np.nan).dropna()
-  outlier_field.rename("Outlier_field", inplace=True)
-  outliers = data[mask.any(axis=1)]
-  return (pd.concat([outliers, outlier_field], axis=1), outlier_range)
\ No newline at end of file
+  return _locate_outlier(data, columns, 'iqr', iqr_multiplier=iqr_multiplier)
@@ -0,0 +1,141 @@
+import os
+import pickle
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from ..util import parallel_imap, SharedArrays
+from .kernel import GroupStats, _weighted_value_counts
+from .crosstab import ContingencyTables
+
+def _encode(data, num_col, cat_col, weight_col=None):
+    # Numeric columns as float64, categorical columns as their position in value_counts (missing as NaN).
+    arrays = dict()
+    labels = dict()
+    for i, col in enumerate(num_col):
+        arrays[f"num {i}"] = data[col].to_numpy(dtype=np.float64)
+    if weight_col is not None:
+        arrays["weight"] = data[weight_col].to_numpy(dtype=np.float64)
+    for i, col in enumerate(cat_col):
+        if weight_col is None:
+            labels[col] = data[col].value_counts().index
+            codes = labels[col].get_indexer(data[col]).astype(np.float64)
+        else:
+            size, codes = _weighted_value_counts(data[col], arrays["weight"])
+            labels[col] = size.index
+            codes = codes.astype(np.float64)
+        codes[codes < 0] = np.nan
+        arrays[f"cat {i}"] = codes
+    return arrays, labels
+
+def _run_unit(arrays, unit):
+    # Run by the workers, arrays is the dict or SharedArrays returned by _encode.
+    kind, columns, min_sample, weight_col = unit
+    weight = [] if weight_col is None else [weight_col]
+    if kind == 'mean':
+        group_col, num_col = columns
+        data = pd.DataFrame({i: arrays[i] for i in [group_col, *num_col, *weight]}, copy=False)
+        return GroupStats(data, group_col, num_col, weight_col=weight_col)
+
+    else:
+        cat_col = list(dict.fromkeys(itertools.chain(*columns)))
+        data = pd.DataFrame({i: arrays[i] for i in [*cat_col, *weight]}, copy=False)
+        return ContingencyTables(data, cat_col, weight_col=weight_col).chi_squared(columns, min_sample=min_sample)
+
+def _relabel(group_stats, group_col, labels, num_col):
+    # Replace the codes and keys used by the workers by the original groups and column names.
+    index = labels.take(group_stats.size.index.to_numpy().astype(int))
+    group_stats.group_col = group_col
+    group_stats.num_col = num_col
+    group_stats.size.index = index
+    for i in ['count', 'sum', 'nansum', 'ss']:
+        df = getattr(group_stats, i)
+        df.index = index
+        df.columns = num_col
+    return group_stats
+
+def _load_checkpoint(path, fingerprint):
+    # Return the results saved in the checkpoint file, after checking it belongs to the same sweep.
+    done = dict()
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            pickle.dump(fingerprint, f)
+        return done
+
+    with open(path, 'rb') as f:
+        if pickle.load(f) != fingerprint:
+            raise ValueError(f"Checkpoint {path} was saved by a different sweep, delete it to start again")
+        while True:
+            try:
+                key, result = pickle.load(f)
+            except (EOFError, pickle.UnpicklingError):
+                # The last record may be incomplete if the sweep was interrupted while writing it.
+                break
+            done[key] = result
+    return done
+
+def _sweep(data, num_col, cat_col, ignore_list, min_sample, n_jobs=1, backend='thread', checkpoint=None, weight_col=None):
+    """
+    Compute the GroupStats of each cat_col and the chi-squared tests of the pairs of cat_col
+    for _auto_detect, sharded across workers.
+
+    Each unit of work (one cat_col with all its num_col, or a batch of pairs of cat_col) is
+    saved to the checkpoint file when done, if given, and skipped when the sweep is run again.
+
+    Returns a dict mapping each cat_col to its GroupStats, and a DataFrame with the chi-squared
+    test of each pair of cat_col, both in the order of the columns.
+
+    With weight_col, each row counts as its weight.
+    """
+    ignored = lambda i, j: ((i, j) in ignore_list) or ((j, i) in ignore_list)
+    num_key = {col: f"num {i}" for i, col in enumerate(num_col)}
+    cat_key = {col: f"cat {i}" for i, col in enumerate(cat_col)}
+    weight_key = None if weight_col is None else "weight"
+
+    units = dict()
+    for c_col in cat_col:
+        columns = [i for i in num_col if not ignored(i, c_col)]
+        if len(columns) > 0:
+            units[('mean', c_col)] = ('mean', (cat_key[c_col], [num_key[i] for i in columns]), min_sample, weight_key)
+    pairs = [(i, j) for i, j in itertools.combinations(cat_col, r=2) if not ignored(i, j)]
+    for i in range(0, len(pairs), ContingencyTables.batch_size):
+        batch = [(cat_key[j], cat_key[k]) for j, k in pairs[i:i + ContingencyTables.batch_size]]
+        units[('pairs', i)] = ('pairs', batch, min_sample, weight_key)
+
+    done = dict()
+    if checkpoint is not None:
+        # The content of the columns swept, so that changed values do not resume from stale results.
+        columns = list(dict.fromkeys([*num_col, *cat_col, *([] if weight_col is None else [weight_col])]))
+        content = int(pd.util.hash_pandas_object(data[columns]).sum())
+        fingerprint = (data.shape, list(data.columns), content, list(num_col), list(cat_col), min_sample, weight_col, list(units.values()))
+        done = _load_checkpoint(checkpoint, fingerprint)
+
+    todo = [i for i in units if i not in done]
+    if len(todo) > 0:
+        arrays, labels = _encode(data, num_col, cat_col, weight_col)
+        shared = SharedArrays(arrays) if backend == 'process' and n_jobs != 1 else arrays
+        try:
+            results = parallel_imap(_run_unit, [units[i] for i in todo], shared=shared, n_jobs=n_jobs, backend=backend)
+            for key, result in zip(todo, results):
+                if key[0] == 'mean':
+                    result = _relabel(result, key[1], labels[key[1]], [i for i in num_col if not ignored(i, key[1])])
+                else:
+                    result.index = pd.MultiIndex.from_tuples(pairs[key[1]:key[1] + ContingencyTables.batch_size])
+                done[key] = result
+                if checkpoint is not None:
+                    with open(checkpoint, 'ab') as f:
+                        pickle.dump((key, result), f)
+                        f.flush()
+                        os.fsync(f.fileno())
+        finally:
+            if isinstance(shared, SharedArrays):
+                shared.close()
+
+    group_stats = {key[1]: done[key] for key in units if key[0] == 'mean'}
+    chi_squared = [done[key] for key in units if key[0] == 'pairs']
+    if len(chi_squared) > 0:
+        chi_squared = pd.concat(chi_squared)
+    else:
+        chi_squared = ContingencyTables(data, []).chi_squared([])
+    return group_stats, chi_squared
@@ -9,13 +9,15 @@ from tickcounter.config import *
 import itertools
 
 class Survey(object):
-    def __init__(self, data, *,num_col=None, cat_col=None, description=None):
+    def __init__(self, data, *,num_col=None, cat_col=None, description=None, weight_col=None):
         self.data = data
         self.num_col = num_col
         self.cat_col = cat_col
         self.descrip = description
+        # Column of frequency weights, each row counting as its weight in the statistics.
+        self.weight_col = weight_col
 
-    def auto_detect(self, cohen_es=COHEN_ES, eta=ETA, phi_es=PHI_ES, p_value=P_VALUE, min_sample=MIN_SAMPLE):
+    def auto_detect(self, cohen_es=COHEN_ES, eta=ETA, phi_es=PHI_ES, p_value=P_VALUE, min_sample=MIN_SAMPLE, *, n_jobs=1, backend='thread', checkpoint=None, correction=None, method=None, seed=None):
         findings_list = statistics._auto_detect(data=self.data, 
                                                 num_col=self.num_col, 
                                                 cat_col=self.cat_col,
@@ -23,33 +25,54 @@ class Survey(object):
                                                 eta=eta,
                                                 phi_es=phi_es,
                                                 p_value=p_value,
-                                                min_sample=min_sample)
+                                                min_sample=min_sample,
+                                                n_jobs=n_jobs,
+                                                backend=backend,
+                                                checkpoint=checkpoint,
+                                                correction=correction,
+                                                weight_col=self.weight_col,
+                                                method=method,
+                                                seed=seed)
         findings_list.set_descrip(self.descrip)
-        return findings_list
+        # The findings only keep a weak reference to the data, to illustrate them while the
+        # survey is alive. It is not pickled.
+        return findings_list.attach(self.data)
     
+    def stats_cube(self):
+        # Sufficient statistics of num_col by cat_col, mergeable across partitions of the data.
+        return statistics.StatsCube(self.data, self.num_col, self.cat_col, weight_col=self.weight_col)
+
     def anova(self, num_col, group_col):
-        return statistics._anova(self.data, num_col, group_col)
+        return statistics._anova(self.data, num_col, group_col, weight_col=self.weight_col)
     
     def compute_eta_squared(self, *args):
         return statistics._compute_eta_squared(self, *args)
     
-    def compare_mean(self, num_col, group_col, *, cohen_es=COHEN_ES, eta=ETA, p_value=P_VALUE, min_sample=MIN_SAMPLE):
+    def compare_mean(self, num_col, group_col, *, cohen_es=COHEN_ES, eta=ETA, p_value=P_VALUE, min_sample=MIN_SAMPLE, method=None, seed=None):
         # TODO: Do we want to expose this method? Because it return None when nothing happens
-        return statistics._compare_mean(self.data, 
-                                        num_col, 
-                                        group_col, 
-                                        cohen_es=cohen_es, 
-                                        eta=eta, 
-                                        p_value=p_value,
-                                        min_sample=min_sample)
+        findings = statistics._compare_mean(self.data, 
+                                           num_col, 
+                                           group_col, 
+                                           cohen_es=cohen_es, 
+                                           eta=eta, 
+                                           p_value=p_value,
+                                           min_sample=min_sample,
+                                           weight_col=self.weight_col,
+                                           method=method,
+                                           seed=seed)
+        return None if findings is None else findings.attach(self.data)
 
-    def compare_group(self, col_1, col_2, p_value=P_VALUE, phi_es=PHI_ES, min_sample=MIN_SAMPLE):
-        return statistics._compare_group(data=self.data,
-                                         col_1=col_1,
-                                         col_2=col_2, 
-                                         p_value=p_value,
-                                         phi_es=phi_es,
-                                         min_sample=min_sample)
+    def compare_group(self, col_1, col_2, p_value=P_VALUE, phi_es=PHI_ES, min_sample=MIN_SAMPLE, *, method=None, seed=None):
+        findings = statistics._compare_group(data=self.data,
+                                            col_1=col_1,
+                                            col_2=col_2, 
+                                            p_value=p_value,
+                                            phi_es=phi_es,
+                                            min_sample=min_sample,
+                                            weight_col=self.weight_col,
+                                            method=method,
+                                            seed=seed)
+        return None if findings is None else findings.attach(self.data)
 
     def t_test(self, num_col, group_col, group_1=None, group_2=None, **kwargs):
         return statistics._t_test(data=self.data,
@@ -57,6 +80,7 @@ class Survey(object):
                                   group_col=group_col,
                                   group_1=group_1,
                                   group_2=group_2,
+                                  weight_col=self.weight_col,
                                   **kwargs)
     
     def compute_cohen_es(self, sample_1, sample_2):
@@ -66,10 +90,10 @@ class Survey(object):
         return statistics._compute_phi_es(chi2, n)
     
     def chi_squared(self, col_1, expected=None):
-        return statistics._chi_squared(self.data, col_1, expected)
+        return statistics._chi_squared(self.data, col_1, expected, weight_col=self.weight_col)
     
     def chi_squared_dependence(self, col_1, col_2, groups_1=None, groups_2=None, min_sample=MIN_SAMPLE):
-        return statistics._chi_squared_dependence(self.data, col_1, col_2, groups_1, groups_2, min_sample)
+        return statistics._chi_squared_dependence(self.data, col_1, col_2, groups_1, groups_2, min_sample, weight_col=self.weight_col)
 
     def hist_num(self, **kwargs):
         return self._plot(columns=self.num_col, kind='hist', **kwargs)
@@ -80,13 +104,14 @@ class Survey(object):
     def count_cat(self, **kwargs):
         return self._plot(columns=self.cat_col, kind='count', **kwargs)
     
-    def locate_outlier(self, columns, method='iqr', return_rule=False, zscore_threshold=3):
-        if method == 'iqr':
-            outlier, outlier_range =  statistics._locate_outlier_iqr(data=self.data, columns=columns)
-        elif method == 'zscore':
-            outlier, outlier_range = statistics._locate_outlier_zscore(data=self.data, columns=columns, zscore_threshold=zscore_threshold)
-        else:
-            raise ValueError("method argument can only be either 'iqr" or 'zscore')
+    def locate_outlier(self, columns, method='iqr', return_rule=False, zscore_threshold=3, *, iqr_multiplier=1.5, mad_threshold=3.5):
+        # method can be 'iqr', 'zscore' or 'mad', see statistics._outlier_mask.
+        outlier, outlier_range = statistics._locate_outlier(data=self.data,
+                                                            columns=columns,
+                                                            method=method,
+                                                            iqr_multiplier=iqr_multiplier,
+                                                            zscore_threshold=zscore_threshold,
+                                                            mad_threshold=mad_threshold)
 
         if return_rule:
             return outlier, outlier_range
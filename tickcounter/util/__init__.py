@@ -1,8 +1,12 @@
 from .util import *
+from .parallel import parallel_map, parallel_imap, SharedArrays
 
 __all__ = [
     "generate_encoding",
     "generate_name",
+    "parallel_map",
+    "parallel_imap",
     "plot_each_col",
     "remove_values",
+    "SharedArrays",
 ]
\ No newline at end of file
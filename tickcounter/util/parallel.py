@@ -0,0 +1,99 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Data shared with the workers of a process pool, set once per worker by _init_worker.
+_shared = None
+
+def _init_worker(shared):
+  global _shared
+  _shared = shared
+
+def _call_shared(args):
+  function, item = args
+  return function(_shared, item)
+
+def parallel_map(function, items, shared=None, n_jobs=1, backend='thread'):
+  '''
+  Return [function(shared, i) for i in items], computed on a pool of workers. The results are
+  in the order of items.
+
+  Arguments:
+  function: Function taking the shared data and an item. Must be defined at module level for the process backend.
+  items: Items to be processed, each one is sent to a worker.
+  shared: Data needed by every item, like a large DataFrame. Threads use it directly, and each
+          worker process receives it once when the pool starts (inherited without pickling
+          when processes are forked), instead of once per item. Use SharedArrays to share
+          NumPy arrays with processes without any copy.
+  n_jobs: Number of workers. 1 runs in the current thread, -1 uses all the cores.
+  backend: Either 'thread' or 'process'.
+  '''
+  return list(parallel_imap(function, items, shared=shared, n_jobs=n_jobs, backend=backend))
+
+def parallel_imap(function, items, shared=None, n_jobs=1, backend='thread'):
+  '''
+  Same as parallel_map, but yield each result as soon as it and the results before it are done.
+  '''
+  items = list(items)
+  if n_jobs is None or n_jobs < 0:
+    n_jobs = os.cpu_count()
+  n_jobs = min(n_jobs, len(items))
+
+  if backend not in ('thread', 'process'):
+    raise ValueError(f"backend argument can only be either 'thread' or 'process', got {backend}")
+
+  if n_jobs <= 1:
+    for i in items:
+      yield function(shared, i)
+    return
+
+  if backend == 'thread':
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+      yield from executor.map(lambda i: function(shared, i), items)
+    return
+
+  with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(shared,)) as executor:
+    yield from executor.map(_call_shared, [(function, i) for i in items])
+
+class SharedArrays(object):
+  '''
+  NumPy arrays stored together in one block of shared memory.
+
+  Pickling a SharedArrays only sends the name of the block and the position of each array, so
+  worker processes read the arrays in place instead of receiving copies. The process creating
+  it must call close once the workers are done, which frees the memory.
+  '''
+  def __init__(self, arrays):
+    self._layout = dict()
+    offset = 0
+    for name, array in arrays.items():
+      array = np.ascontiguousarray(array)
+      self._layout[name] = (array.dtype.str, array.shape, offset)
+      offset += array.nbytes
+    self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    self._owner = True
+    for name, array in arrays.items():
+      self[name][...] = array
+
+  def __getitem__(self, name):
+    dtype, shape, offset = self._layout[name]
+    return np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=offset)
+
+  def keys(self):
+    return self._layout.keys()
+
+  def __getstate__(self):
+    return {'name': self._shm.name, 'layout': self._layout}
+
+  def __setstate__(self, state):
+    self._layout = state['layout']
+    self._shm = shared_memory.SharedMemory(name=state['name'])
+    self._owner = False
+
+  def close(self):
+    # Arrays taken from this object must not be used afterward.
+    self._shm.close()
+    if self._owner:
+      self._shm.unlink()